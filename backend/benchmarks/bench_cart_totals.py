@@ -0,0 +1,64 @@
+"""Compare view_cart-style totals: catalog scan per cart line vs the priced Cart.
+
+    uv run python benchmarks/bench_cart_totals.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cart import Cart
+
+
+def make_catalog(size: int):
+    return [{"id": f"sku_{i:06d}", "name": f"Item {i}", "price": round(0.5 + (i % 400) / 20, 2)} for i in range(size)]
+
+
+def scan_totals(catalog, cart):
+    summary = []
+    total = 0.0
+    for item_id, qty in cart.items():
+        item = next((i for i in catalog if i["id"] == item_id), None)
+        if item:
+            cost = item["price"] * qty
+            total += cost
+            summary.append(f"{qty}x {item['name']} (${cost:.2f})")
+    return f"Cart: {', '.join(summary)}. Total: ${total:.2f}"
+
+
+def cart_totals(cart):
+    summary = [f"{line.quantity}x {line.name} (${line.cost:.2f})" for line in cart]
+    return f"Cart: {', '.join(summary)}. Total: ${cart.total:.2f}"
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'catalog':>8} {'lines':>6} {'scan ms':>10} {'cart ms':>10} {'speedup':>8}")
+    for catalog_size in (1_000, 10_000, 100_000):
+        catalog = make_catalog(catalog_size)
+        for lines in (10, 100, 500):
+            picked = rng.sample(catalog, lines)
+            legacy = {item["id"]: rng.randint(1, 5) for item in picked}
+            cart = Cart()
+            for item in picked:
+                cart.add(item, legacy[item["id"]])
+
+            assert scan_totals(catalog, legacy) == cart_totals(cart)
+            repeat = max(1, 2_000_000 // (catalog_size * lines))
+            scan = _time(lambda catalog=catalog, legacy=legacy: scan_totals(catalog, legacy), repeat)
+            priced = _time(lambda cart=cart: cart_totals(cart), 200)
+            print(f"{catalog_size:>8} {lines:>6} {scan * 1e3:>10.3f} {priced * 1e3:>10.3f} {scan / priced:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Size and serialization cost of get_catalog_items: full json.dumps vs one browser page.
+
+Token counts are estimated at ~4 characters per token.
+
+    uv run python benchmarks/bench_catalog_browse.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalog_browser import CatalogBrowser
+
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), "..", "shared-data", "grocery_catalog.json")
+CATEGORIES = ["Produce", "Bakery", "Dairy", "Pantry", "Snacks", "Frozen", "Beverages", "Household"]
+TAGS = ["organic", "vegan", "snack", "protein", "sweet", "healthy", "dinner", "breakfast"]
+
+
+def make_catalog(size: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"sku_{i:06d}",
+            "name": f"Product {i}",
+            "category": rng.choice(CATEGORIES),
+            "price": round(rng.uniform(0.5, 20), 2),
+            "unit": "each",
+            "tags": rng.sample(TAGS, 2),
+        }
+        for i in range(size)
+    ]
+
+
+def _time(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    with open(CATALOG_FILE) as f:
+        real = json.load(f)
+
+    print(f"{'items':>8} {'full tok':>10} {'page tok':>9} {'full ms':>9} {'page cold ms':>13} {'page hot us':>12}")
+    for name, catalog in [("13", real), ("1000", make_catalog(1_000)), ("10000", make_catalog(10_000)), ("100000", make_catalog(100_000))]:
+        full = json.dumps(catalog)
+        full_time = _time(lambda catalog=catalog: json.dumps(catalog), repeat=5)
+
+        browser = CatalogBrowser(catalog)
+        start = time.perf_counter()
+        page = browser.page()
+        cold = time.perf_counter() - start
+        hot = _time(browser.page, repeat=1000)
+        print(
+            f"{name:>8} {len(full) // 4:>10} {len(page) // 4:>9} {full_time * 1e3:>9.2f} "
+            f"{cold * 1e3:>13.3f} {hot * 1e6:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare CatalogIndex lookups against the linear scans StoreManager used to do.
+
+    uv run python benchmarks/bench_catalog_index.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalog_index import CatalogIndex
+
+WORDS = [
+    "organic", "red", "green", "whole", "wheat", "bread", "milk", "cheese",
+    "apple", "banana", "pasta", "sauce", "chips", "chocolate", "butter",
+    "peanut", "jam", "eggs", "yogurt", "rice", "beans", "coffee", "tea",
+]
+
+
+def make_catalog(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"sku_{i:06d}",
+            "name": " ".join(rng.sample(WORDS, 3)) + f" {i}",
+            "price": round(rng.uniform(0.5, 20), 2),
+        }
+        for i in range(size)
+    ]
+
+
+def linear_get_item_by_name(catalog, name_query):
+    name_query = name_query.lower()
+    for item in catalog:
+        if item["id"] == name_query:
+            return item
+    for item in catalog:
+        if name_query in item["name"].lower():
+            return item
+    return None
+
+
+def make_queries(catalog, count: int = 200, seed: int = 11):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        item = rng.choice(catalog)
+        kind = rng.random()
+        if kind < 0.25:
+            queries.append(item["id"])
+        elif kind < 0.75:
+            queries.append(item["name"].split()[-1])  # unique suffix, deep in the list
+        elif kind < 0.9:
+            queries.append(rng.choice(WORDS))
+        else:
+            queries.append("dragonfruit")  # miss
+    return queries
+
+
+def _time(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    print(f"{'items':>8} {'build ms':>9} {'scan us':>10} {'index us':>10} {'speedup':>8}")
+    for size in (1_000, 10_000, 100_000):
+        catalog = make_catalog(size)
+        start = time.perf_counter()
+        index = CatalogIndex(catalog)
+        build = time.perf_counter() - start
+
+        queries = make_queries(catalog)
+        for q in queries:
+            assert index.get_item_by_name(q) is linear_get_item_by_name(catalog, q), q
+
+        scan = _time(lambda q, catalog=catalog: linear_get_item_by_name(catalog, q), queries)
+        indexed = _time(index.get_item_by_name, queries)
+        print(f"{size:>8} {build * 1e3:>9.1f} {scan * 1e6:>10.1f} {indexed * 1e6:>10.1f} {scan / indexed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
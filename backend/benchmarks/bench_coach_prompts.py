@@ -0,0 +1,90 @@
+"""Coach system prompt size and cacheable prefix across a mode switch.
+
+Compares the old prompt (whole tutor content as indented JSON, rebuilt per
+switch) with the precompiled variants, for the shipped content and for
+larger synthetic libraries. Token counts are estimates (words and
+punctuation); no tokenizer or network is needed. TTFT after a switch is
+logged by the coach at runtime ("Post-switch LLM call").
+
+    uv run python benchmarks/bench_coach_prompts.py --sizes 3 50 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from coach_prompts import (
+    GREETING,
+    MODE_INSTRUCTIONS,
+    PERSONA,
+    PromptCompiler,
+    estimate_tokens,
+)
+from concept_library import ConceptLibrary
+
+CONTENT_PATH = os.path.join(os.path.dirname(__file__), "..", "shared-data", "day4_tutor_content.json")
+
+
+def library(size: int):
+    with open(CONTENT_PATH) as f:
+        content = json.load(f)
+    for i in range(len(content), size):
+        base = content[i % 3]
+        content.append(dict(base, id=f"{base['id']}-{i}", title=f"{base['title']} {i}"))
+    return content[:size]
+
+
+def legacy_instructions(content, mode, concept_id):
+    """The old layout: persona, the whole content as indented JSON, then mode behaviour."""
+    behavior = GREETING if concept_id is None else MODE_INSTRUCTIONS[mode]
+    return f"{PERSONA}\n{json.dumps(content, indent=2)}\n**CURRENT MODE:** {mode.upper()}\n{behavior}"
+
+
+def shared_prefix(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return estimate_tokens(a[:n])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 50, 500])
+    args = parser.parse_args()
+
+    print(f"{'concepts':>8}  {'layout':<11} {'prompt tok':>10}  {'cacheable after switch':>22}  {'build/switch':>12}")
+    for size in args.sizes:
+        content = library(size)
+        first, second = content[0]["id"], content[-1]["id"]
+
+        start = time.perf_counter()
+        before, after = legacy_instructions(content, "learn", first), legacy_instructions(content, "quiz", second)
+        legacy_time = (time.perf_counter() - start) / 2
+
+        prompts = PromptCompiler(ConceptLibrary.from_content(content))
+        start = time.perf_counter()
+        new_before, new_after = prompts.instructions("learn", first), prompts.instructions("quiz", second)
+        compile_time = (time.perf_counter() - start) / 2
+        start = time.perf_counter()
+        prompts.instructions("learn", first), prompts.instructions("quiz", second)
+        lookup_time = (time.perf_counter() - start) / 2
+
+        for label, a, b, cost in (
+            ("legacy", before, after, f"{legacy_time * 1e6:.0f}us"),
+            ("compiled", new_before, new_after, f"{lookup_time * 1e6:.1f}us"),
+        ):
+            print(
+                f"{size:>8}  {label:<11} {estimate_tokens(b):>10}  "
+                f"{shared_prefix(a, b):>10} of {estimate_tokens(b):<9}  {cost:>12}"
+            )
+        print(f"{'':>8}  (first use of a variant compiles it in {compile_time * 1e6:.0f}us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Concept lookups and per-session memory as the tutor library grows: in-memory list vs the SQLite index.
+
+The old coach loaded every concept into each session and validated an id by
+building the list of ids and scanning it. The library keeps the index on
+disk, loads bodies on demand, and resolves spoken names with FuzzyMatcher.
+
+    uv run python benchmarks/bench_concept_library.py --sizes 100 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from concept_library import ConceptLibrary
+from learner_state import ReviewScheduler
+
+TOPICS = ["variables", "loops", "functions", "recursion", "closures", "generators", "decorators", "classes"]
+
+
+def content(size: int):
+    return [
+        {
+            "id": f"{TOPICS[i % len(TOPICS)]}_{i}",
+            "title": f"{TOPICS[i % len(TOPICS)].title()} {i}",
+            "summary": "A concept summary long enough to look like real tutor content. " * 3,
+            "sample_question": "What is it and why is it useful?",
+            "teach_back_prompt": "Explain it, give an example, and mention one common use case.",
+        }
+        for i in range(size)
+    ]
+
+
+def legacy_session(path: str, concept_id: str):
+    with open(path) as f:
+        concepts = json.load(f)
+    valid_ids = [c["id"] for c in concepts]
+    assert concept_id in valid_ids
+    return next(c for c in concepts if c["id"] == concept_id)
+
+
+def library_session(library: ConceptLibrary, concept_id: str):
+    scheduler = ReviewScheduler(library.iter_ids())
+    scheduler.next()
+    return library.resolve(concept_id)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'concepts':>8}  {'legacy session':>22}  {'library session':>22}  {'fuzzy resolve':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            concepts = content(size)
+            path = os.path.join(tmp, f"{size}.json")
+            with open(path, "w") as f:
+                json.dump(concepts, f)
+            library = ConceptLibrary(os.path.join(tmp, f"{size}.db"))
+            library.import_file(path)
+            target = concepts[-1]["id"]
+
+            legacy_time, legacy_mem = measure(legacy_session, path, target)
+            lib_time, lib_mem = measure(library_session, library, target)
+            library.resolve("recurson 7")  # build the fuzzy index once per process
+            start = time.perf_counter()
+            library.resolve("closure 15")
+            fuzzy = time.perf_counter() - start
+            library.close()
+            print(
+                f"{size:>8}  {legacy_time * 1000:>8.1f}ms {legacy_mem / 1e6:>8.1f}MB peak"
+                f"  {lib_time * 1000:>8.2f}ms {lib_mem / 1e6:>8.3f}MB peak  {fuzzy * 1000:>11.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
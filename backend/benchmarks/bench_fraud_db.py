@@ -0,0 +1,142 @@
+"""Calls/sec for fraud case queries from concurrent sessions: per-call connections vs FraudDB.
+
+Each simulated session runs the load_case -> verify_answer -> update_case_status
+sequence a few times against a temporary copy of the fraud_cases schema. The
+"session cache" row is the current tool flow: verify_answer checks the row
+load_case cached in userdata, and the update targets the row id.
+
+    uv run python benchmarks/bench_fraud_db.py --sessions 100
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fraud_db import FraudDB
+
+SCHEMA = """
+CREATE TABLE fraud_cases (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_name TEXT NOT NULL,
+    security_identifier TEXT,
+    card_ending TEXT,
+    amount TEXT,
+    merchant TEXT,
+    timestamp TEXT,
+    category TEXT,
+    source TEXT,
+    verification_question TEXT,
+    verification_answer TEXT,
+    status TEXT,
+    notes TEXT,
+    updated_at TEXT
+)
+"""
+LOAD = "SELECT * FROM fraud_cases WHERE LOWER(user_name)=LOWER(?) LIMIT 1"
+VERIFY = "SELECT verification_answer FROM fraud_cases WHERE LOWER(user_name)=LOWER(?)"
+UPDATE = "UPDATE fraud_cases SET status=?, notes=?, updated_at=? WHERE LOWER(user_name)=LOWER(?)"
+UPDATE_BY_ID = "UPDATE fraud_cases SET status=?, notes=?, updated_at=? WHERE id=?"
+
+
+def seed(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.executemany(
+        "INSERT INTO fraud_cases (user_name, card_ending, amount, merchant, verification_question, "
+        "verification_answer, status) VALUES (?, '1234', '$499.00', 'ACME', 'Pet name?', 'rex', 'pending')",
+        [(f"User {i}",) for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+# --- The previous implementation: a new connection per query, hopped through to_thread ---
+
+def _legacy_read(path, query, params=()):
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    cur.execute(query, params)
+    rows = cur.fetchall()
+    colnames = [c[0] for c in cur.description]
+    conn.close()
+    return [dict(zip(colnames, row)) for row in rows]
+
+
+def _legacy_write(path, query, params=()):
+    conn = sqlite3.connect(path, timeout=30)
+    cur = conn.cursor()
+    cur.execute(query, params)
+    conn.commit()
+    conn.close()
+
+
+async def legacy_session(path: str, name: str, rounds: int):
+    for _ in range(rounds):
+        await asyncio.to_thread(_legacy_read, path, LOAD, (name,))
+        await asyncio.to_thread(_legacy_read, path, VERIFY, (name,))
+        await asyncio.to_thread(_legacy_write, path, UPDATE, ("confirmed_safe", "bench", "now", name))
+
+
+async def pooled_session(db: FraudDB, name: str, rounds: int):
+    for _ in range(rounds):
+        await db.read(LOAD, (name,))
+        await db.read(VERIFY, (name,))
+        await db.write(UPDATE, ("confirmed_safe", "bench", "now", name))
+
+
+async def cached_session(db: FraudDB, name: str, rounds: int):
+    for _ in range(rounds):
+        case = (await db.read(LOAD, (name,)))[0]
+        assert case["verification_answer"] == "rex"
+        await db.write(UPDATE_BY_ID, ("confirmed_safe", "bench", "now", case["id"]))
+
+
+async def run(sessions: int, rounds: int, rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        pooled_path = os.path.join(tmp, "pooled.db")
+        cached_path = os.path.join(tmp, "cached.db")
+        seed(legacy_path, rows)
+        seed(pooled_path, rows)
+        seed(cached_path, rows)
+        calls = sessions * rounds * 3
+
+        start = time.perf_counter()
+        await asyncio.gather(*(legacy_session(legacy_path, f"User {i}", rounds) for i in range(sessions)))
+        legacy = time.perf_counter() - start
+
+        db = FraudDB(pooled_path)
+        start = time.perf_counter()
+        await asyncio.gather(*(pooled_session(db, f"User {i}", rounds) for i in range(sessions)))
+        pooled = time.perf_counter() - start
+        db.close()
+
+        db = FraudDB(cached_path)
+        start = time.perf_counter()
+        await asyncio.gather(*(cached_session(db, f"User {i}", rounds) for i in range(sessions)))
+        cached = time.perf_counter() - start
+        db.close()
+
+    print(f"{sessions} sessions x {rounds} rounds x 3 calls, {rows} cases")
+    print(f"  per-call connect + to_thread: {calls / legacy:>9.0f} calls/s")
+    print(f"  FraudDB (batched, pooled):    {calls / pooled:>9.0f} calls/s  ({legacy / pooled:.1f}x)")
+    print(f"  FraudDB + session cache:      {calls / cached:>9.0f} calls/s  ({legacy / cached:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.rounds, args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Fraud case lookup latency on a large table, before and after the fraud_db migrations.
+
+Seeds a temporary database (1M cases by default), then measures the
+LOWER(user_name) lookup without the index, with it, and the primary-key
+lookup used once a case is loaded.
+
+    uv run python benchmarks/bench_fraud_lookup.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_fraud_db import LOAD, SCHEMA
+
+from fraud_db import migrate
+
+BY_ID = "SELECT * FROM fraud_cases WHERE id=?"
+
+
+def seed(conn: sqlite3.Connection, rows: int):
+    conn.execute(SCHEMA)
+    batch = 50_000
+    for start in range(0, rows, batch):
+        conn.executemany(
+            "INSERT INTO fraud_cases (user_name, card_ending, amount, merchant, verification_question, "
+            "verification_answer, status) VALUES (?, '1234', '$499.00', 'ACME', 'Pet name?', 'rex', 'pending')",
+            [(f"Customer {i}",) for i in range(start, min(start + batch, rows))],
+        )
+    conn.commit()
+
+
+def percentiles(conn: sqlite3.Connection, sql: str, params_list):
+    samples = []
+    for params in params_list:
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1e3)
+    samples.sort()
+
+    def pick(p):
+        return samples[min(len(samples) - 1, int(p * len(samples)))]
+
+    return pick(0.5), pick(0.95), pick(0.99)
+
+
+def report(label: str, stats):
+    p50, p95, p99 = stats
+    print(f"  {label:<30} p50 {p50:>9.3f} ms   p95 {p95:>9.3f} ms   p99 {p99:>9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    names = [(f"customer {rng.randrange(args.rows)}",) for _ in range(args.queries)]
+    ids = [(rng.randrange(1, args.rows + 1),) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "fraud_cases.db"))
+        start = time.perf_counter()
+        seed(conn, args.rows)
+        print(f"Seeded {args.rows} cases in {time.perf_counter() - start:.1f}s")
+
+        # A full scan per query; keep the sample small so the run stays short.
+        report("name lookup, no index", percentiles(conn, LOAD, names[: max(10, args.queries // 10)]))
+
+        start = time.perf_counter()
+        migrate(conn)
+        print(f"Migrated in {time.perf_counter() - start:.1f}s")
+        print("  plan:", conn.execute(f"EXPLAIN QUERY PLAN {LOAD}", names[0]).fetchall()[0][-1])
+        report("name lookup, expression index", percentiles(conn, LOAD, names))
+        report("primary key lookup", percentiles(conn, BY_ID, ids))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Status update throughput under a campaign burst: per-call commits vs the write-behind queue.
+
+Thousands of calls ending at once each write one fraud case status. This
+fires them all concurrently and reports updates/s and how many commits
+SQLite had to make for each strategy.
+
+    uv run python benchmarks/bench_fraud_updates.py --updates 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_fraud_db import UPDATE_BY_ID, seed
+
+from fraud_db import FraudDB
+from fraud_updates import StatusUpdateQueue
+
+
+def _legacy_update(path, case_id):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute(UPDATE_BY_ID, ("confirmed_safe", "bench", "now", case_id))
+    conn.commit()
+    conn.close()
+
+
+async def legacy(path: str, updates: int):
+    await asyncio.gather(*(asyncio.to_thread(_legacy_update, path, i + 1) for i in range(updates)))
+    return updates
+
+
+async def pooled(db: FraudDB, updates: int):
+    await asyncio.gather(*(db.write(UPDATE_BY_ID, ("confirmed_safe", "bench", "now", i + 1)) for i in range(updates)))
+    return db.commits
+
+
+async def write_behind(db: FraudDB, updates: int):
+    queue = StatusUpdateQueue(db)
+    await asyncio.gather(*(queue.submit(i + 1, "confirmed_safe", "bench") for i in range(updates)))
+    return queue.flushed_batches
+
+
+async def run(updates: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for label in ("per-call connect + commit", "FraudDB.write", "write-behind queue"):
+            path = os.path.join(tmp, f"{len(results)}.db")
+            seed(path, updates)
+            db = FraudDB(path)
+            start = time.perf_counter()
+            if label.startswith("per-call"):
+                commits = await legacy(path, updates)
+            elif label == "FraudDB.write":
+                commits = await pooled(db, updates)
+            else:
+                commits = await write_behind(db, updates)
+            elapsed = time.perf_counter() - start
+            db.close()
+            results.append((label, elapsed, commits))
+
+    base = results[0][1]
+    print(f"{updates} concurrent status updates")
+    for label, elapsed, commits in results:
+        print(
+            f"  {label:<26} {updates / elapsed:>9.0f} updates/s  {commits:>6} commits"
+            f"  ({commits / elapsed:>7.0f} commits/s, {base / elapsed:.1f}x)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per-lookup latency of FuzzyMatcher for noisy queries, cold and memoized.
+
+    uv run python benchmarks/bench_fuzzy_match.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_catalog_index import make_catalog
+
+from fuzzy_match import FuzzyMatcher
+
+QUERIES = ["bananna", "whole weat bred", "pb", "choclate milk", "organik red aple", "dragonfruit"]
+
+
+def main():
+    print(f"{'items':>8} {'build ms':>9} {'cold p50 ms':>12} {'cold max ms':>12} {'cached us':>10}")
+    for size in (1_000, 10_000, 100_000):
+        catalog = make_catalog(size)
+        start = time.perf_counter()
+        matcher = FuzzyMatcher(catalog)
+        build = time.perf_counter() - start
+
+        cold = []
+        for q in QUERIES:
+            start = time.perf_counter()
+            matcher.top_k(q)
+            cold.append(time.perf_counter() - start)
+        cold.sort()
+
+        start = time.perf_counter()
+        for _ in range(100):
+            for q in QUERIES:
+                matcher.top_k(q)
+        cached = (time.perf_counter() - start) / (100 * len(QUERIES))
+        print(
+            f"{size:>8} {build * 1e3:>9.1f} {cold[len(cold) // 2] * 1e3:>12.2f} "
+            f"{cold[-1] * 1e3:>12.2f} {cached * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Local teach-back scoring: per-call latency and one-off IDF build time as the library grows.
+
+Also prints the scores the shipped content gives to a full, a partial and an
+off-topic explanation, so changes to the weights can be sanity-checked.
+
+    uv run python benchmarks/bench_teach_back.py --sizes 3 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from concept_library import ConceptLibrary
+from teach_back import TeachBackScorer
+
+CONTENT_PATH = os.path.join(os.path.dirname(__file__), "..", "shared-data", "day4_tutor_content.json")
+EXPLANATIONS = {
+    "full": "Loops let you repeat an action many times until a condition is met. A for loop iterates over a "
+    "sequence, for example each item in a list, while a while loop repeats while a condition is true.",
+    "partial": "A loop repeats some code. For loops go over lists.",
+    "off-topic": "A variable is a named box that stores a value.",
+}
+
+
+def library(size: int) -> ConceptLibrary:
+    with open(CONTENT_PATH) as f:
+        content = json.load(f)
+    for i in range(len(content), size):
+        base = content[i % 3]
+        content.append(dict(base, id=f"{base['id']}-{i}", summary=f"{base['summary']} Variant {i} topic{i % 97}."))
+    return ConceptLibrary.from_content(content[:max(size, 3)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 10_000])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        scorer = TeachBackScorer(library(size))
+        start = time.perf_counter()
+        scorer.idf()
+        idf_time = time.perf_counter() - start
+        start = time.perf_counter()
+        scorer.score("loops", EXPLANATIONS["full"])
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(args.calls):
+            scorer.score("loops", EXPLANATIONS["partial" if i % 2 else "full"])
+        per_call = (time.perf_counter() - start) / args.calls
+        print(
+            f"{size:>6} concepts: idf build {idf_time * 1000:.1f}ms (once per process), "
+            f"first score {first * 1e6:.0f}us, cached {per_call * 1e6:.0f}us/call"
+        )
+
+    scorer = TeachBackScorer(library(3))
+    for label, text in EXPLANATIONS.items():
+        result = scorer.score("loops", text)
+        print(f"  loops / {label:<9} score {result.score:>2}/10  coverage {result.coverage:.2f}  similarity {result.similarity:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""How long TTS waits for its first chunk under each chunking strategy.
+
+Replays typical agent replies word by word, as an LLM streams them, through
+each profile's tokenizer and reports how much text (and, at the given token
+rate, how much time) arrives before the first chunk is handed to TTS.
+
+    uv run python benchmarks/bench_tts_chunking.py --tokens-per-second 40
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import tokenize
+
+from latency_profiles import ClauseTokenizer
+
+REPLIES = [
+    "Hello, this is Alex from SecureBank, and I'm calling about a recent transaction on your card ending 4242. "
+    "Before we continue, could you tell me your favorite color?",
+    "Thank you, that matches our records. We noticed a charge of 3,999 rupees at ABC Industries on February 10th, "
+    "made through alibaba.com. Did you make this transaction?",
+    "Understood, I've marked the transaction as fraudulent; your card has been blocked and a replacement is on its way. "
+    "Is there anything else I can help with?",
+    "Great, I've added two cartons of whole milk to your cart, which brings your total to 7 dollars and 98 cents.",
+]
+
+TOKENIZERS = {
+    "sentence (default, min 20)": lambda: tokenize.basic.SentenceTokenizer(),
+    "sentence (min 2, fraud)": lambda: tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+    "clause (min 12)": lambda: ClauseTokenizer(min_clause_len=12),
+}
+
+
+async def words_until_first_chunk(tokenizer, reply: str) -> int:
+    stream = tokenizer.stream()
+    words = reply.split(" ")
+    for count, word in enumerate(words, start=1):
+        stream.push_text(word + " ")
+        await asyncio.sleep(0)
+        if stream._event_ch.qsize():
+            return count
+    return len(words)
+
+
+async def run(tokens_per_second: float):
+    print(f"Words streamed before the first TTS chunk (LLM at {tokens_per_second:.0f} words/s)")
+    for label, make in TOKENIZERS.items():
+        counts = [await words_until_first_chunk(make(), reply) for reply in REPLIES]
+        mean = sum(counts) / len(counts)
+        print(f"  {label:<28} {mean:>5.1f} words  ~{mean / tokens_per_second * 1000:>5.0f} ms  {counts}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.tokens_per_second))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Time to first audio after a coach mode switch: mutating one TTS vs the voice pool.
+
+Runs offline against a fake TTS. Each fake instance pays `--warmup` seconds
+the first time it synthesizes a voice it has not prewarmed, standing in for
+connection setup and voice warm-up on the provider.
+
+- update_options: one TTS, voice changed through asyncio.to_thread (the old
+  coach code), so every new voice starts cold.
+- pooled: one prewarmed TTS per voice; the switch is PooledTTS.select().
+
+    uv run python benchmarks/bench_voice_switch.py --switches 30 --warmup 0.25
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import tts
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+
+from tts_pool import PooledTTS
+
+VOICES = {"learn": "en-US-matthew", "quiz": "en-US-alicia", "teach_back": "en-US-ken"}
+
+
+class FakeTTS(tts.TTS):
+    def __init__(self, voice: str, warmup: float):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=24000, num_channels=1)
+        self.voice = voice
+        self.warmup = warmup
+        self.warm = set()
+
+    def update_options(self, voice: str):
+        self.voice = voice
+
+    def prewarm(self):
+        self.warm.add(self.voice)
+
+    def synthesize(self, text, *, conn_options=DEFAULT_API_CONNECT_OPTIONS):
+        return FakeStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class FakeStream(tts.ChunkedStream):
+    async def _run(self, output_emitter):
+        fake = self._tts
+        if fake.voice not in fake.warm:
+            await asyncio.sleep(fake.warmup)
+            fake.warm.add(fake.voice)
+        output_emitter.initialize(request_id="fake", sample_rate=24000, num_channels=1, mime_type="audio/pcm")
+        output_emitter.push(b"\0\0" * 2400)
+        output_emitter.flush()
+
+
+async def first_audio(engine: tts.TTS) -> float:
+    started = time.perf_counter()
+    async with engine.synthesize("Mode switched. Let's master this!") as stream:
+        async for _ in stream:
+            return time.perf_counter() - started
+    return time.perf_counter() - started
+
+
+async def run(switches: int, warmup: float):
+    modes = list(VOICES)
+    results = {}
+
+    # Old coach: one TTS per session, voice mutated on every switch.
+    samples = []
+    for _ in range(switches // len(modes)):
+        engine = FakeTTS(VOICES["learn"], warmup)
+        engine.prewarm()
+        for mode in modes[1:] + modes[:1]:
+            started = time.perf_counter()
+            await asyncio.to_thread(engine.update_options, voice=VOICES[mode])
+            samples.append(time.perf_counter() - started + await first_audio(engine))
+    results["update_options"] = samples
+
+    samples = []
+    for _ in range(switches // len(modes)):
+        pool = PooledTTS({mode: FakeTTS(voice, warmup) for mode, voice in VOICES.items()}, active="learn")
+        pool.prewarm()
+        for mode in modes[1:] + modes[:1]:
+            started = time.perf_counter()
+            pool.select(mode)
+            samples.append(time.perf_counter() - started + await first_audio(pool))
+    results["pooled"] = samples
+
+    print(f"time to first audio after a mode switch ({len(samples)} switches, warm-up {warmup * 1000:.0f}ms)")
+    for label, values in results.items():
+        ordered = sorted(values)
+        print(
+            f"  {label:<15} median {statistics.median(values) * 1000:7.1f}ms"
+            f"  p95 {ordered[int(0.95 * (len(ordered) - 1))] * 1000:7.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--switches", type=int, default=30)
+    parser.add_argument("--warmup", type=float, default=0.25)
+    args = parser.parse_args()
+    asyncio.run(run(args.switches, args.warmup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Session-start cost as wellness history grows: JSON array reload vs the SQLite store.
+
+The JSON log is parsed in full to read its last entry; the store reads the
+tail of the rowid index plus at most N daily rollup rows.
+
+    uv run python benchmarks/bench_wellness_history.py --sizes 100 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from wellness_store import WellnessStore
+
+MOODS = ["happy", "low", "stressed", "calm", "okay"]
+ENERGIES = ["high", "low", "drained", "moderate"]
+
+
+def history(size: int):
+    start = datetime.now() - timedelta(hours=size)
+    return [
+        {
+            "timestamp": (start + timedelta(hours=i)).isoformat(),
+            "mood": MOODS[i % len(MOODS)],
+            "energy": ENERGIES[i % len(ENERGIES)],
+            "objectives": ["go for a walk", "finish the report"],
+            "summary": "Take short breaks and drink water.",
+        }
+        for i in range(size)
+    ]
+
+
+def json_session_start(path: str):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)[-1]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'check-ins':>10}  {'json reload':>12}  {'store':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            records = history(size)
+            json_path = os.path.join(tmp, f"{size}.json")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=4)
+            store = WellnessStore(os.path.join(tmp, f"{size}.db"), legacy_path=json_path)
+
+            json_time = timed(lambda json_path=json_path: json_session_start(json_path), args.repeat)
+            store_time = timed(store.session_context, args.repeat)
+            store.close()
+            print(f"{size:>10}  {json_time * 1000:>10.2f}ms  {store_time * 1000:>8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
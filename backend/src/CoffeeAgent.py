@@ -2,6 +2,8 @@ import json
 from livekit.agents import Agent
 import os
 
+from persistence import save_json
+
 class CoffeeAgent(Agent):
     def __init__(self):
         super().__init__(
@@ -81,10 +83,8 @@ class CoffeeAgent(Agent):
         )
         await ctx.send_message(summary)
 
-        os.makedirs("orders",exist_ok=True)
         filename = os.path.join("orders",f"{self.order['name']}_order.json")
-        with open(filename, "w") as f:
-            json.dump(self.order, f, indent=4)
+        await save_json(filename, self.order, indent=4)
         print(f"Order saved to {filename}:")
         print(json.dumps(self.order, indent=4))
         await ctx.send_message("Your order has been saved. Thanks for visiting  techniaa Coffee!")
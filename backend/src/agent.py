@@ -1,9 +1,7 @@
 import logging
-import json
 import os
 import asyncio
-from datetime import datetime
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -13,108 +11,82 @@ from livekit.agents import (
     JobProcess,
     WorkerOptions,
     cli,
-    function_tool,
     RunContext
 )
 from livekit.plugins import murf, deepgram, google, silero
 
+from cart import Cart
+from instrumentation import instrument_session
+from latency_profiles import FirstAudioRecorder, latency_profile
+from tool_timing import function_tool
+from catalog_cache import SharedCatalog, shared_catalog
+from order_store import new_order, open_order_store
+from order_status import status_engine
+from persistence import run_io
+from recipes import recipe_book
+
 load_dotenv(".env.local")
 logger = logging.getLogger("grocery-agent")
 
 # --- 1. CONFIG & DATA ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CATALOG_FILE = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "shared-data", "grocery_catalog.json"))
-ORDERS_FILE = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "shared-data", "orders.json"))
 
-# Simple Recipe Map
-RECIPES = {
-    "sandwich": ["bread", "pb", "jam"],
-    "pasta": ["pasta", "sauce", "cheese"],
-    "breakfast": ["eggs", "bread", "milk", "banana"],
-    "fruit salad": ["apple", "banana"]
-}
+RECIPES_FILE = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "shared-data", "recipes.json"))
 
 # --- 2. Logic Class ---
 class StoreManager:
-    def __init__(self):
-        self.catalog = []
-        self._load_catalog()
-        self._ensure_orders_file()
+    def __init__(self, catalog: Optional[SharedCatalog] = None):
+        # Shared, read-only catalog; loaded in prewarm and reloaded when the file changes
+        self.catalog_source = catalog or shared_catalog(CATALOG_FILE)
+        # Backend (json / journal / sqlite) comes from ORDER_STORE_BACKEND
+        self.orders = open_order_store()
+        self.status = status_engine(self.orders)
+
+    @property
+    def catalog(self):
+        return self.catalog_source.get().items
+
+    @property
+    def index(self):
+        return self.catalog_source.get().index
 
-    def _load_catalog(self):
-        if os.path.exists(CATALOG_FILE):
-            with open(CATALOG_FILE, "r") as f:
-                self.catalog = json.load(f)
+    @property
+    def browser(self):
+        return self.catalog_source.get().browser
 
-    def _ensure_orders_file(self):
-        if not os.path.exists(ORDERS_FILE):
-            with open(ORDERS_FILE, "w") as f:
-                json.dump([], f)
+    @property
+    def matcher(self):
+        return self.catalog_source.get().matcher
+
+    @property
+    def recipes(self):
+        return recipe_book(self.catalog_source.get(), RECIPES_FILE)
 
     def get_item_by_name(self, name_query: str):
-        name_query = name_query.lower()
-        for item in self.catalog:
-            if item["id"] == name_query: return item
-        for item in self.catalog:
-            if name_query in item["name"].lower(): return item
-        return None
-
-    def save_order(self, cart_items: dict, total: float):
-        order_id = f"ORD-{int(datetime.now().timestamp())}"
-        order = {
-            "id": order_id,
-            "timestamp": datetime.now().isoformat(),
-            "items": cart_items,
-            "total": total,
-            "status": "received"
-        }
-        
-        try:
-            with open(ORDERS_FILE, "r") as f:
-                data = json.load(f)
-        except Exception:
-            data = []
-            
-        data.append(order)
-        
-        with open(ORDERS_FILE, "w") as f:
-            json.dump(data, f, indent=2)
-        
-        return order_id
+        # Exact id/substring first, then fall back to fuzzy matching for noisy STT input
+        snapshot = self.catalog_source.get()
+        return snapshot.index.get_item_by_name(name_query) or snapshot.matcher.best(name_query)
 
-    def update_mock_statuses(self):
+    def suggest(self, name_query: str, count: int = 3) -> List[str]:
+        return [m.item["name"] for m in self.matcher.top_k(name_query, count)]
+
+    # Store calls do file/DB I/O, so they run on the I/O pool rather than the event loop.
+    async def save_order(self, items: List[dict], total: float):
+        order = new_order(items, total)
+        await run_io(self.orders.append, order)
+        return order["id"]
+
+    async def recent_orders(self, count: int = 3):
         try:
-            with open(ORDERS_FILE, "r") as f:
-                orders = json.load(f)
-            
-            now = datetime.now()
-            updated = False
-            
-            for order in orders:
-                order_time = datetime.fromisoformat(order["timestamp"])
-                elapsed = (now - order_time).total_seconds()
-                
-                new_status = order["status"]
-                if elapsed > 90: new_status = "delivered"
-                elif elapsed > 60: new_status = "out_for_delivery"
-                elif elapsed > 30: new_status = "being_prepared"
-                
-                if new_status != order["status"]:
-                    order["status"] = new_status
-                    updated = True
-            
-            if updated:
-                with open(ORDERS_FILE, "w") as f:
-                    json.dump(orders, f, indent=2)
-            
-            return orders
+            return await run_io(self.status.recent, count)
         except Exception as e:
             logger.error(f"Error updating statuses: {e}")
             return []
 
 # --- 3. The Agent ---
 class GroceryAgent(Agent):
-    def __init__(self):
+    def __init__(self, catalog: Optional[SharedCatalog] = None):
         super().__init__(
             instructions="""
             You are 'FreshBot', a friendly grocery ordering assistant.
@@ -134,13 +106,21 @@ class GroceryAgent(Agent):
             - Always confirm price when adding items.
             """
         )
-        self.store = StoreManager()
-        self.cart = {}
+        self.store = StoreManager(catalog)
+        self.cart = Cart()
 
     @function_tool
-    async def get_catalog_items(self, ctx: RunContext):
-        """List available items in the store."""
-        return json.dumps(self.store.catalog)
+    async def get_catalog_items(
+        self,
+        ctx: RunContext,
+        category: Annotated[Optional[str], "Only list this category (e.g. Produce, Dairy)"] = None,
+        tag: Annotated[Optional[str], "Only list items with this tag (e.g. vegan, snack)"] = None,
+        page_size: Annotated[int, "Items per page (max 50)"] = 20,
+        cursor: Annotated[Optional[str], "next_cursor from the previous page"] = None,
+    ):
+        """Browse available items as [name, price] rows, one page at a time.
+        The first unfiltered page also lists categories with item counts."""
+        return self.store.browser.page(category, tag, page_size, cursor)
 
     @function_tool
     async def add_to_cart(
@@ -152,10 +132,14 @@ class GroceryAgent(Agent):
         """Add a specific item to the cart."""
         item = self.store.get_item_by_name(item_name)
         if not item:
+            suggestions = self.store.suggest(item_name)
+            if suggestions:
+                return f"Sorry, we don't have '{item_name}'. Closest matches: {', '.join(suggestions)}."
             return f"Sorry, we don't have '{item_name}'."
+        if quantity < 1:
+            return "Quantity must be at least 1. Use remove_from_cart to take items out."
         
-        current_qty = self.cart.get(item["id"], 0)
-        self.cart[item["id"]] = current_qty + quantity
+        self.cart.add(item, quantity)
         return f"Added {quantity}x {item['name']} to cart."
 
     @function_tool
@@ -173,35 +157,30 @@ class GroceryAgent(Agent):
         if item["id"] not in self.cart:
             return f"'{item['name']}' is not in your cart."
             
-        current_qty = self.cart[item["id"]]
-        
-        if quantity <= 0 or quantity >= current_qty:
-            # Remove the item entirely
-            del self.cart[item["id"]]
+        remaining = self.cart.remove(item["id"], quantity)
+        if remaining == 0:
             return f"Removed all {item['name']} from your cart."
-        else:
-            # Decrease quantity
-            self.cart[item["id"]] = current_qty - quantity
-            return f"Removed {quantity}x {item['name']}. You have {self.cart[item['id']]} left."
+        return f"Removed {quantity}x {item['name']}. You have {remaining} left."
 
     @function_tool
     async def add_recipe_ingredients(
         self,
         ctx: RunContext,
-        recipe_name: Annotated[str, "Name of the dish (sandwich, pasta, breakfast)"]
+        recipe_name: Annotated[str, "Name of the dish (sandwich, pasta, breakfast)"],
+        servings: Annotated[Optional[int], "Number of servings, if the user said"] = None,
     ):
         """Intelligently adds all ingredients for a specific recipe/dish."""
-        recipe_key = next((k for k in RECIPES if k in recipe_name.lower()), None)
-        if not recipe_key:
-            return f"I don't have a pre-set bundle for '{recipe_name}'."
+        recipes = self.store.recipes
+        recipe = recipes.find(recipe_name)
+        if not recipe:
+            return f"I don't have a pre-set bundle for '{recipe_name}'. Available: {', '.join(recipes.names)}."
         
         added_items = []
-        for item_id in RECIPES[recipe_key]:
-            self.cart[item_id] = self.cart.get(item_id, 0) + 1
-            item_details = next((i for i in self.store.catalog if i["id"] == item_id), None)
-            if item_details: added_items.append(item_details["name"])
+        for item, qty in recipe.bundle(servings):
+            self.cart.add(item, qty)
+            added_items.append(f"{qty}x {item['name']}")
             
-        return f"Added ingredients for {recipe_name} ({', '.join(added_items)})."
+        return f"Added ingredients for {recipe_name} ({', '.join(added_items)}). Cart total: ${self.cart.total:.2f}."
 
     @function_tool
     async def view_cart(self, ctx: RunContext):
@@ -209,16 +188,8 @@ class GroceryAgent(Agent):
         if not self.cart:
             return "Cart is empty."
         
-        summary = []
-        total = 0.0
-        for item_id, qty in self.cart.items():
-            item = next((i for i in self.store.catalog if i["id"] == item_id), None)
-            if item:
-                cost = item["price"] * qty
-                total += cost
-                summary.append(f"{qty}x {item['name']} (${cost:.2f})")
-        
-        return f"Cart: {', '.join(summary)}. Total: ${total:.2f}"
+        summary = [f"{line.quantity}x {line.name} (${line.cost:.2f})" for line in self.cart]
+        return f"Cart: {', '.join(summary)}. Total: ${self.cart.total:.2f}"
 
     @function_tool
     async def place_order(self, ctx: RunContext):
@@ -226,22 +197,17 @@ class GroceryAgent(Agent):
         if not self.cart:
             return "Cart is empty. Cannot place order."
         
-        total = 0.0
-        for item_id, qty in self.cart.items():
-            item = next((i for i in self.store.catalog if i["id"] == item_id), None)
-            if item: total += item["price"] * qty
-            
-        order_id = self.store.save_order(self.cart, total)
-        self.cart = {}
+        total = self.cart.total
+        order_id = await self.store.save_order(self.cart.order_items(), total)
+        self.cart.clear()
         return f"Order placed! ID: {order_id}. Total: ${total:.2f}. Status: Received."
 
     @function_tool
     async def track_orders(self, ctx: RunContext):
         """Check status of recent orders."""
-        orders = self.store.update_mock_statuses()
-        if not orders: return "No order history found."
+        recent = await self.store.recent_orders(3)
+        if not recent: return "No order history found."
         
-        recent = orders[-3:]
         details = []
         for o in recent:
             details.append(f"Order {o['id']}: {o['status']} (Total ${o['total']})")
@@ -251,24 +217,35 @@ class GroceryAgent(Agent):
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["catalog"] = shared_catalog(CATALOG_FILE)
 
 async def entrypoint(ctx: JobContext):
     try:
         ctx.log_context_fields = {"room": ctx.room.name}
         await ctx.connect()
 
+        profile = latency_profile("grocery")
         session = AgentSession(
             stt=deepgram.STT(model="nova-3"),
             llm=google.LLM(model="gemini-2.5-flash"),
             tts=murf.TTS(
                 voice="en-US-matthew", 
                 style="Conversation",
-                text_pacing=True
+                text_pacing=True,
+                **profile.tts_options(),
             ),
-            vad=ctx.proc.userdata["vad"],
+            **profile.session_options(ctx.proc.userdata["vad"]),
         )
+        FirstAudioRecorder("grocery", profile).attach(session)
+        instrument_session(session, ctx, "grocery")
+
+        agent = GroceryAgent(catalog=ctx.proc.userdata["catalog"])
+
+        async def flush_orders():
+            await run_io(agent.store.orders.flush)
+
+        ctx.add_shutdown_callback(flush_orders)
 
-        agent = GroceryAgent()
         await session.start(agent=agent, room=ctx.room)
         
         # Greet the user automatically
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+def _to_cents(price: float) -> int:
+    return round(price * 100)
+
+
+@dataclass
+class CartLine:
+    """One item in the cart, priced when it was added."""
+    item_id: str
+    name: str
+    unit_price: float
+    quantity: int
+
+    @property
+    def cost(self) -> float:
+        return _to_cents(self.unit_price) * self.quantity / 100
+
+
+class Cart:
+    """Shopping cart with prices resolved at add time and a running subtotal.
+
+    The subtotal is kept in integer cents so adds and removes never drift.
+    """
+
+    def __init__(self):
+        self._lines: Dict[str, CartLine] = {}
+        self._subtotal_cents = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._lines
+
+    def __iter__(self) -> Iterator[CartLine]:
+        return iter(self._lines.values())
+
+    def get(self, item_id: str) -> Optional[CartLine]:
+        return self._lines.get(item_id)
+
+    def add(self, item: Dict, quantity: int = 1) -> CartLine:
+        """Add `quantity` (at least 1) units of a catalog item; use `remove` to take units out."""
+        if quantity < 1:
+            raise ValueError(f"quantity must be at least 1, got {quantity}")
+        line = self._lines.get(item["id"])
+        if line is None:
+            line = self._lines[item["id"]] = CartLine(item["id"], item["name"], item["price"], 0)
+        line.quantity += quantity
+        self._subtotal_cents += _to_cents(line.unit_price) * quantity
+        return line
+
+    def remove(self, item_id: str, quantity: int = 0) -> int:
+        """Remove `quantity` units (all of them if <= 0); returns what is left."""
+        line = self._lines[item_id]
+        if quantity <= 0 or quantity >= line.quantity:
+            quantity = line.quantity
+        line.quantity -= quantity
+        self._subtotal_cents -= _to_cents(line.unit_price) * quantity
+        if line.quantity == 0:
+            del self._lines[item_id]
+        return line.quantity
+
+    @property
+    def total(self) -> float:
+        return self._subtotal_cents / 100
+
+    def order_items(self) -> List[Dict]:
+        """Cart lines in the order schema used by order_store."""
+        return [
+            {"id": line.item_id, "name": line.name, "price": line.unit_price, "quantity": line.quantity}
+            for line in self._lines.values()
+        ]
+
+    def clear(self):
+        self._lines = {}
+        self._subtotal_cents = 0
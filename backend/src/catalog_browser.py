@@ -0,0 +1,84 @@
+import json
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+class CatalogBrowser:
+    """Paginated, compact catalog listings for the LLM.
+
+    Every item is serialized once, at build time, as a `["name", price]` row.
+    Categories and tags index item positions into those rows, so a tag within
+    a category is an intersection of positions and two items with the same
+    name and price stay distinct. A page is a join over a slice of rows, and
+    whole page strings are memoized, so browsing never re-serializes the
+    catalog.
+    """
+
+    def __init__(self, items: Sequence[Mapping], cache_size: int = 256):
+        self._rows: List[str] = []  # item position -> row
+        self._positions: Dict[Optional[str], List[int]] = {None: []}  # category key -> positions
+        self._categories: Dict[str, str] = {}  # lowercase -> display name
+        self._tags: Dict[str, List[int]] = {}
+
+        for position, item in enumerate(items):
+            self._rows.append(json.dumps([item["name"], item["price"]], separators=(",", ":")))
+            category = item.get("category") or "Other"
+            self._categories.setdefault(category.lower(), category)
+            self._positions.setdefault(category.lower(), []).append(position)
+            self._positions[None].append(position)
+            for tag in item.get("tags", ()):
+                self._tags.setdefault(tag.lower(), []).append(position)
+
+        self._overview = json.dumps(
+            [[name, len(self._positions[key])] for key, name in self._categories.items()],
+            separators=(",", ":"),
+        )
+        self._page = lru_cache(maxsize=cache_size)(self._build_page)
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self._categories.values())
+
+    def page(
+        self,
+        category: Optional[str] = None,
+        tag: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> str:
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        try:
+            offset = max(int(cursor), 0) if cursor else 0
+        except ValueError:
+            offset = 0
+        return self._page(
+            category.lower() if category else None,
+            tag.lower() if tag else None,
+            page_size,
+            offset,
+        )
+
+    def _build_page(self, category: Optional[str], tag: Optional[str], page_size: int, offset: int) -> str:
+        if category and category not in self._categories:
+            return json.dumps({"error": "unknown category", "categories": self.categories})
+
+        if tag and not category:
+            positions = self._tags.get(tag, [])
+        elif tag:
+            tagged = set(self._tags.get(tag, ()))
+            positions = [p for p in self._positions[category] if p in tagged]
+        else:
+            positions = self._positions[category]
+
+        chunk = [self._rows[p] for p in positions[offset:offset + page_size]]
+        parts = []
+        if offset == 0 and not category and not tag:
+            parts.append(f'"categories":{self._overview}')
+        parts.append(f'"items":[{",".join(chunk)}]')
+        if offset + page_size < len(positions):
+            parts.append(f'"next_cursor":"{offset + page_size}"')
+        parts.append(f'"total":{len(positions)}')
+        return "{" + ",".join(parts) + "}"
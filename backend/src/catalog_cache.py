@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from catalog_browser import CatalogBrowser
+from catalog_index import CatalogIndex
+from fuzzy_match import FuzzyMatcher
+
+logger = logging.getLogger("catalog-cache")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class CatalogSnapshot:
+    """One parsed version of the catalog file plus its lookup structures.
+
+    Items are read-only mappings, so every session in the worker can share
+    the same snapshot safely.
+    """
+
+    def __init__(self, items: Tuple[Mapping, ...], mtime_ns: Optional[int] = None):
+        self.items = items
+        self.mtime_ns = mtime_ns
+        self.index = CatalogIndex(items)
+        self.matcher = FuzzyMatcher(items)
+        self.browser = CatalogBrowser(items)
+
+    @classmethod
+    def load(cls, path: str) -> "CatalogSnapshot":
+        if not os.path.exists(path):
+            return cls(())
+        mtime_ns = os.stat(path).st_mtime_ns
+        with open(path) as f:
+            return cls(_freeze(json.load(f)), mtime_ns)
+
+
+class SharedCatalog:
+    """Process-wide catalog that reloads itself when the file changes.
+
+    `get()` stats the file at most every `check_interval` seconds. When the
+    mtime moved it starts a background thread that builds a fresh snapshot
+    and swaps it in, so the session that noticed the change never rebuilds
+    the index on its event loop. Until the swap, and if the new file fails
+    to load, callers keep getting the last good snapshot.
+    """
+
+    def __init__(self, path: str, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = CatalogSnapshot.load(path)
+        self._checked_at = time.monotonic()
+        self._reloader: Optional[threading.Thread] = None
+
+    def get(self) -> CatalogSnapshot:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            snapshot = self._snapshot  # read before a reloader can swap it
+            if now - self._checked_at < self.check_interval or self._reloader is not None:
+                return snapshot
+            self._checked_at = now
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                return snapshot
+            if mtime_ns != snapshot.mtime_ns:
+                self._reloader = threading.Thread(target=self.reload, name="catalog-reload", daemon=True)
+                self._reloader.start()
+            return snapshot
+
+    def reload(self) -> CatalogSnapshot:
+        """Load the file on the calling thread and swap it in; the last good snapshot survives a failure."""
+        try:
+            snapshot = CatalogSnapshot.load(self.path)
+        except (OSError, json.JSONDecodeError) as e:
+            # Keep serving the last good snapshot while the file is mid-write.
+            logger.error(f"Failed to reload catalog: {e}")
+        else:
+            self._snapshot = snapshot
+            logger.info(f"Reloaded catalog from {self.path} ({len(snapshot.items)} items)")
+        finally:
+            with self._lock:
+                self._reloader = None
+        return self._snapshot
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a background reload in progress, if any, has finished."""
+        reloader = self._reloader
+        if reloader is not None:
+            reloader.join(timeout)
+
+
+_catalogs: Dict[str, SharedCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def shared_catalog(path: str) -> SharedCatalog:
+    """Shared catalog for `path`, loaded once per worker process."""
+    key = os.path.abspath(path)
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _catalogs[key] = SharedCatalog(key)
+        return catalog
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional
+
+# Substring lookups are answered from a character n-gram index. Grams up to
+# this length are indexed, so a query of length >= GRAM_SIZE only has to verify
+# the items listed under its rarest gram.
+GRAM_SIZE = 3
+
+
+def normalize_name(name: str) -> str:
+    return name.lower()
+
+
+def _grams(text: str, size: int):
+    for n in range(1, size + 1):
+        for i in range(len(text) - n + 1):
+            yield text[i:i + n]
+
+
+class CatalogIndex:
+    """Read-only lookup tables over a catalog list, built once at load.
+
+    Every lookup returns the same item a linear scan over the catalog would
+    return (the first match in catalog order).
+    """
+
+    def __init__(self, catalog: List[Dict]):
+        self.catalog = catalog
+        self._names: List[str] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+        self._tokens: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        for pos, item in enumerate(catalog):
+            name = normalize_name(item["name"])
+            self._names.append(name)
+            self._by_id.setdefault(item["id"], item)
+            self._by_name.setdefault(name, item)
+            for token in set(name.split()):
+                self._tokens.setdefault(token, []).append(pos)
+            for gram in set(_grams(name, GRAM_SIZE)):
+                self._postings.setdefault(gram, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def get_by_id(self, item_id: str) -> Optional[Dict]:
+        return self._by_id.get(item_id)
+
+    def get_by_exact_name(self, name: str) -> Optional[Dict]:
+        return self._by_name.get(normalize_name(name))
+
+    def items_with_token(self, token: str) -> List[Dict]:
+        """Items whose name contains `token` as a whole word, in catalog order."""
+        return [self.catalog[pos] for pos in self._tokens.get(normalize_name(token), [])]
+
+    def find_substring(self, query: str) -> Optional[Dict]:
+        """First item (catalog order) whose lowercased name contains `query`."""
+        query = normalize_name(query)
+        if not query:
+            return self.catalog[0] if self.catalog else None
+
+        if len(query) <= GRAM_SIZE:
+            candidates = self._postings.get(query, [])
+        else:
+            candidates = None
+            for i in range(len(query) - GRAM_SIZE + 1):
+                posting = self._postings.get(query[i:i + GRAM_SIZE])
+                if posting is None:
+                    return None
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+
+        # Postings are in catalog order, so the first verified hit is the
+        # same item the linear scan would stop at.
+        for pos in candidates:
+            if query in self._names[pos]:
+                return self.catalog[pos]
+        return None
+
+    def get_item_by_name(self, name_query: str) -> Optional[Dict]:
+        """Id match first, then substring match on the item name."""
+        name_query = name_query.lower()
+        item = self._by_id.get(name_query)
+        if item:
+            return item
+        return self.find_substring(name_query)
@@ -1,12 +1,10 @@
-import json
 import logging
 import traceback
 import time
-import asyncio
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import Annotated, List, Dict, Any, Optional
+from typing import Annotated, Dict, Any, Optional
 from livekit.agents import (
     Agent,
     AgentSession,
@@ -18,12 +16,21 @@ from livekit.agents import (
     cli,
     metrics,
     tokenize,
-    function_tool,
     RunContext,
     llm,
 )
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+from coach_prompts import PromptCompiler
+from concept_library import concept_library
+from instrumentation import instrument_session
+from latency_profiles import FirstAudioRecorder, latency_profile
+from learner_state import ConceptState, ReviewScheduler, learner_store
+from persistence import run_io
+from teach_back import teach_back_scorer
+from tool_timing import function_tool
+from tts_pool import PooledTTS
+from user_identity import DEFAULT_USER_ID, user_id
 
 logger = logging.getLogger("agent")
 
@@ -32,11 +39,15 @@ load_dotenv(dotenv_path=env_path)
 
 
 class ActiveRecallCoach(Agent):
-    def __init__(self) -> None:
-        # Load content
-        self.content = self._load_content()
+    def __init__(self, learner: str = DEFAULT_USER_ID, states: Optional[Dict[str, ConceptState]] = None) -> None:
+        # Concepts come from the process-wide indexed library; bodies load on demand
+        self.library = concept_library()
         self.current_mode = "learn"  # Start with learn mode so agent can speak immediately
         self.current_concept_id = None
+
+        # Spaced repetition: what this learner should review next, from their saved state
+        self.learner = learner
+        self.scheduler = ReviewScheduler(self.library.iter_ids(), states, exists=self.library.get)
         
         # Define voice IDs for each mode
         self.voice_ids = {
@@ -45,119 +56,24 @@ class ActiveRecallCoach(Agent):
             "teach_back": "en-US-ken",
         }
 
+        self.prompts = PromptCompiler(self.library)
+        self.scorer = teach_back_scorer()
+        # Set by switch_mode so the next LLM metrics can be logged as post-switch latency
+        self.switched_at: Optional[float] = None
+
         super().__init__(
-            instructions=self._get_instructions(),
+            instructions=self.prompts.instructions(self.current_mode, self.current_concept_id),
         )
 
-    def _load_content(self) -> List[Dict[str, Any]]:
-        try:
-            content_path = Path(__file__).resolve().parent.parent.parent / "shared-data" / "day4_tutor_content.json"
-            with open(content_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading content: {e}")
-            return []
-
-    def _get_instructions(self) -> str:
-        concepts_str = json.dumps(self.content, indent=2)
-        
-        base_instructions = f"""You are an Active Recall Coach designed to help users learn concepts effectively.
-        
-       
-        {concepts_str}
-        
-        **CURRENT MODE:** {self.current_mode.upper() if self.current_mode else 'NOT SET'}
-        
-        **YOUR PERSONA:**
-        - You are an energetic, motivating teacher like Alakh Pandey (Physics Wallah), but speaking in **ENGLISH ONLY**.
-        - **GREETING:** Always start with "Hello Future Achievers!" or "Welcome Students!".
-        - **TONE:** High energy, encouraging, professional, and relatable. 
-        - **CATCHPHRASES:**
-          * "Did that click?"
-          * "Let's master this!"
-          * "Keep pushing!"
-          * "Concept clear?"
-        - **GOAL:** Make learning fun but rigorous. Don't be boring.
-        
-        **YOUR BEHAVIOR:**
-        """
-        
-        if self.current_mode == "learn":
-            # Check if this is the first interaction (no concept selected)
-            if not self.current_concept_id:
-                mode_instructions = """
-                - **INITIAL GREETING** (First time users connect):
-                - Say "Hello Future Achievers!" warmly.
-                - Introduce yourself as their Physics Wallah AI Coach.
-                - List the available concepts (Variables, Loops, Agentic AI, MCP).
-                - Explain the three learning modes briefly:
-                  * **Learn** - "I will explain the concept to you."
-                  * **Quiz** - "I will test your knowledge."
-                  * **Teach-Back** - "You teach me to prove you know it."
-                - Ask: "Tell me, what shall we master today?"
-                - Once they choose, use the `switch_mode` tool.
-                """
-            else:
-                mode_instructions = """
-                - **LEARN Mode** (Voice: Matthew):
-                - Explain the chosen concept using the 'summary' from the content.
-                - Use simple analogies.
-                - Be engaging, clear, and concise.
-                - After explaining, ask: "Did that click? Shall we Quiz or do Teach-Back?"
-                """
-        elif self.current_mode == "quiz":
-            mode_instructions = """
-            - **QUIZ Mode** (Voice: Alicia):
-            - Ask the 'sample_question' or generate a similar simple question.
-            - Wait for their answer.
-            - If correct, say "Excellent!" or "Spot on!" and ask another.
-            - If incorrect, say "Not quite, but nice try!" and explain the right answer gently.
-            """
-        elif self.current_mode == "teach_back":
-            mode_instructions = """
-            - **TEACH-BACK Mode** (Voice: Ken):
-            - Ask the user to explain the concept to YOU.
-            - Listen carefully.
-            - After they explain, give them a **Score (0-10)** and brief feedback.
-            - Start your feedback with "Score: X/10".
-            - If score is high: "Outstanding work!"
-            - If score is low: "Let's review this part again."
-            """
-        else:
-            # Initial greeting when no mode is set
-            mode_instructions = """
-            - **INITIAL GREETING**:
-            - Say "Hello Future Achievers!" warmly.
-            - Introduce yourself as their AI Coach.
-            - List the available concepts.
-            - Explain the three learning modes:
-              * **Learn** - "I will explain the concept."
-              * **Quiz** - "I will test your knowledge."
-              * **Teach-Back** - "You teach me."
-            - Ask: "Which mode shall we start with?"
-            - Once they choose, use the `switch_mode` tool.
-            """
-
-        common_instructions = """
-        **CRITICAL MODE SWITCHING RULES:**
-        - You MUST call `switch_mode` when user says ANY of these:
-          * "quiz me", "test me", "ask me questions" → switch_mode(mode='quiz')
-          * "teach me", "explain", "let's learn" → switch_mode(mode='learn') 
-          * "I'll teach you", "let me explain", "teach back" → switch_mode(mode='teach_back')
-          * "let's do [concept]" → switch_mode(concept_id='concept')
-        - After switching, immediately start acting in that mode - don't ask for confirmation
-        - Keep all responses brief and conversational (voice interface)
-        - ALWAYS acknowledge the mode switch by starting your response with the new mode behavior
-        """
-        
-        return base_instructions + mode_instructions + common_instructions
+    def _concept(self, concept_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self.library.get(concept_id)
 
     @function_tool
     async def switch_mode(
         self,
         ctx: RunContext,
         mode: Annotated[str, "The mode to switch to: 'learn', 'quiz', or 'teach_back'"],
-        concept_id: Annotated[Optional[str], "The id of the concept to focus on (e.g., 'variables', 'loops'). If None, keep current or use first available."] = None,
+        concept_id: Annotated[Optional[str], "The id or name of the concept to focus on, as the user said it (e.g., 'variables', 'loops'). If None, keep current or use the next one due for review."] = None,
     ):
         """Switch the agent's learning mode and/or active concept.
         
@@ -181,16 +97,18 @@ class ActiveRecallCoach(Agent):
             self.current_mode = mode
             
             if concept_id:
-                # Validate concept_id
-                valid_ids = [c["id"] for c in self.content]
-                if concept_id in valid_ids:
-                    self.current_concept_id = concept_id
+                # Resolve ids, titles and misheard names through the library index
+                concept = self.library.resolve(concept_id)
+                if concept is not None:
+                    self.current_concept_id = concept["id"]
                 else:
-                    return f"Concept '{concept_id}' not found. Available: {', '.join(valid_ids)}"
-            elif not self.current_concept_id and self.content:
-                # Auto-select first concept if none is set
-                self.current_concept_id = self.content[0]["id"]
-                logger.info(f"Auto-selected first concept: {self.current_concept_id}")
+                    suggestions = self.library.suggestions(concept_id)
+                    hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+                    return f"Concept '{concept_id}' not found.{hint}"
+            elif not self.current_concept_id:
+                # Auto-select the concept that is most due for review
+                self.current_concept_id = self.scheduler.next()
+                logger.info(f"Auto-selected scheduled concept: {self.current_concept_id}")
             
             # Get the appropriate voice ID for the new mode
             new_voice_id = self.voice_ids.get(mode)
@@ -203,23 +121,21 @@ class ActiveRecallCoach(Agent):
                 logger.info(f"CONCEPT: {self.current_concept_id}")
                 logger.info(f"==========================================")
                 
-                # Update the session's TTS options
-                if self.current_session.tts:
+                # Point the session's TTS pool at the already-warm voice for this mode
+                if isinstance(self.current_session.tts, PooledTTS):
                     try:
-                        # Run update_options in a thread to avoid blocking the event loop
-                        await asyncio.to_thread(self.current_session.tts.update_options, voice=new_voice_id)
+                        self.current_session.tts.select(mode)
                         logger.info(f"Voice updated successfully to {new_voice_id}")
                     except Exception as e:
-                        logger.error(f"Failed to update voice options: {e}")
+                        logger.error(f"Failed to switch voice: {e}")
                         # Don't fail the whole switch if voice fails, but log it
             
-            # Update instructions to reflect new mode
-            self.instructions = self._get_instructions()
+            # Swap in the precompiled instructions for the new mode and concept
+            await self.update_instructions(self.prompts.instructions(self.current_mode, self.current_concept_id))
+            self.switched_at = time.perf_counter()
             
             # Get concept details
-            concept_obj = None
-            if self.current_concept_id:
-                concept_obj = next((c for c in self.content if c["id"] == self.current_concept_id), None)
+            concept_obj = self._concept(self.current_concept_id)
             
             concept_title = concept_obj["title"] if concept_obj else "Unknown Concept"
             
@@ -251,19 +167,43 @@ class ActiveRecallCoach(Agent):
         ctx: RunContext,
         user_explanation: str,
     ):
-        """Evaluate the user's explanation in Teach-Back mode.
+        """Score the user's explanation in Teach-Back mode and get the next concept to review.
         
         Args:
             user_explanation: The text of what the user said.
         """
-        # This is a placeholder for more advanced scoring. 
-        # For now, the LLM will generate the feedback naturally based on instructions.
-        # This tool exists to explicitly mark the "grading" event if we wanted to store scores later.
-        return "Explanation received. Please provide feedback to the user."
+        concept = self._concept(self.current_concept_id)
+        if concept is None:
+            return "No concept is active. Ask the user which concept to teach back first."
+
+        # Scored locally (key point coverage + TF-IDF similarity) so grades are consistent
+        result = self.scorer.score(concept["id"], user_explanation)
+        state = self.scheduler.record(concept["id"], result.score)
+        try:
+            await run_io(learner_store().save, self.learner, state)
+        except Exception as e:
+            logger.error(f"Failed to save learner state: {e}")
+
+        response = (
+            f"{result.describe()}\n"
+            f"Tell the user their score and briefly mention any missing points. "
+            f"Next review of {concept['title']} in {state.interval_days:g} day(s).\n"
+        )
+        upcoming = self._concept(self.scheduler.next(exclude=concept["id"]))
+        if upcoming is not None:
+            response += (
+                f"Then suggest '{upcoming['title']}' next "
+                f"(concept_id '{upcoming['id']}'), for example: '{upcoming['sample_question']}'"
+            )
+        return response
 
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    # Open the concept index (importing changed content) and build the scoring
+    # statistics before any session needs them
+    concept_library()
+    teach_back_scorer().idf()
 
 
 async def entrypoint(ctx: JobContext):
@@ -272,20 +212,34 @@ async def entrypoint(ctx: JobContext):
             "room": ctx.room.name,
         }
 
+        # Join first: review state is kept per stable user id (see user_identity)
+        await ctx.connect()
+        participant = await ctx.wait_for_participant()
+        learner = user_id(participant)
+        ctx.log_context_fields = {"room": ctx.room.name, "participant": participant.identity, "user_id": learner}
+        states = await run_io(learner_store().load, learner)
+
         # Initialize the agent
-        coach = ActiveRecallCoach()
+        coach = ActiveRecallCoach(learner, states)
 
+        profile = latency_profile("coach")
         session = AgentSession(
             stt=deepgram.STT(model="nova-3"),
             llm=google.LLM(
                 model="gemini-2.5-flash",
             ),
-            # Start with the learn voice
-            tts=murf.TTS(voice=coach.voice_ids["learn"], style="Conversation"),
-            turn_detection=MultilingualModel(),
-            vad=ctx.proc.userdata["vad"],
-            preemptive_generation=True,
+            # One ready TTS per mode voice, starting with the learn voice
+            tts=PooledTTS(
+                {
+                    mode: murf.TTS(voice=voice_id, style="Conversation", **profile.tts_options())
+                    for mode, voice_id in coach.voice_ids.items()
+                },
+                active="learn",
+            ),
+            **profile.session_options(ctx.proc.userdata["vad"]),
         )
+        FirstAudioRecorder("coach", profile).attach(session)
+        instrument_session(session, ctx, "coach")
         
         # Give the agent access to the session
         coach.current_session = session
@@ -296,6 +250,12 @@ async def entrypoint(ctx: JobContext):
         def _on_metrics_collected(ev: MetricsCollectedEvent):
             metrics.log_metrics(ev.metrics)
             usage_collector.collect(ev.metrics)
+            if isinstance(ev.metrics, metrics.LLMMetrics) and coach.switched_at is not None:
+                coach.switched_at = None
+                logger.info(
+                    f"Post-switch LLM call: prompt_tokens={ev.metrics.prompt_tokens} "
+                    f"cached={ev.metrics.prompt_cached_tokens} ttft={ev.metrics.ttft * 1000:.0f}ms"
+                )
 
         async def log_usage():
             summary = usage_collector.get_summary()
@@ -310,8 +270,6 @@ async def entrypoint(ctx: JobContext):
                 noise_cancellation=noise_cancellation.BVC(),
             ),
         )
-
-        await ctx.connect()
     
     except Exception as e:
         logger.error(f"Error in entrypoint: {e}")
@@ -0,0 +1,121 @@
+"""Compiled instructions for the Active Recall Coach.
+
+The coach used to rebuild its system prompt on every mode or concept switch,
+with the whole tutor content dumped into it as indented JSON. Each
+(mode, concept) variant is now compiled once, on first use, and kept in an
+LRU cache so memory stays flat however large the concept library is:
+
+- a shared prefix (persona, switching rules, a compact index of concept ids)
+  that is byte-identical across variants, so provider-side prompt caching
+  keeps hitting after a switch;
+- a short suffix with the mode's behaviour and only the active concept's
+  fields.
+
+    prompts = PromptCompiler(concept_library())
+    await agent.update_instructions(prompts.instructions("quiz", "loops"))
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from concept_library import ConceptLibrary
+
+MODES = ("learn", "quiz", "teach_back")
+# The prompt lists at most this many concepts; the rest are reached by name through switch_mode.
+CONCEPT_INDEX_LIMIT = 40
+CONCEPT_FIELDS = ("title", "summary", "sample_question", "teach_back_prompt")
+
+PERSONA = """You are an Active Recall Coach designed to help users learn concepts effectively.
+
+**YOUR PERSONA:**
+- You are an energetic, motivating teacher like Alakh Pandey (Physics Wallah), but speaking in **ENGLISH ONLY**.
+- **GREETING:** Always start with "Hello Future Achievers!" or "Welcome Students!".
+- **TONE:** High energy, encouraging, professional, and relatable.
+- **CATCHPHRASES:** "Did that click?", "Let's master this!", "Keep pushing!", "Concept clear?"
+- **GOAL:** Make learning fun but rigorous. Don't be boring.
+
+**CRITICAL MODE SWITCHING RULES:**
+- You MUST call `switch_mode` when user says ANY of these:
+  * "quiz me", "test me", "ask me questions" → switch_mode(mode='quiz')
+  * "teach me", "explain", "let's learn" → switch_mode(mode='learn')
+  * "I'll teach you", "let me explain", "teach back" → switch_mode(mode='teach_back')
+  * "let's do [concept]" → switch_mode(concept_id='concept')
+- After switching, immediately start acting in that mode - don't ask for confirmation
+- Keep all responses brief and conversational (voice interface)
+- ALWAYS acknowledge the mode switch by starting your response with the new mode behavior
+"""
+
+GREETING = """- **INITIAL GREETING** (First time users connect):
+- Say "Hello Future Achievers!" warmly.
+- Introduce yourself as their Physics Wallah AI Coach.
+- List the available concepts from the concept index.
+- Explain the three learning modes briefly:
+  * **Learn** - "I will explain the concept to you."
+  * **Quiz** - "I will test your knowledge."
+  * **Teach-Back** - "You teach me to prove you know it."
+- Ask: "Tell me, what shall we master today?"
+- Once they choose, use the `switch_mode` tool.
+"""
+
+MODE_INSTRUCTIONS = {
+    "learn": """- **LEARN Mode** (Voice: Matthew):
+- Explain the active concept using its summary.
+- Use simple analogies.
+- Be engaging, clear, and concise.
+- After explaining, ask: "Did that click? Shall we Quiz or do Teach-Back?"
+""",
+    "quiz": """- **QUIZ Mode** (Voice: Alicia):
+- Ask the active concept's sample question or generate a similar simple question.
+- Wait for their answer.
+- If correct, say "Excellent!" or "Spot on!" and ask another.
+- If incorrect, say "Not quite, but nice try!" and explain the right answer gently.
+""",
+    "teach_back": """- **TEACH-BACK Mode** (Voice: Ken):
+- Ask the user to explain the active concept to YOU.
+- Listen carefully.
+- After they explain, call `evaluate_teach_back` with their explanation; it returns their score and any missing key points.
+- Give brief feedback starting with "Score: X/10" using that score, and mention the missing points.
+- If score is high: "Outstanding work!"
+- If score is low: "Let's review this part again."
+""",
+}
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token count (words and punctuation), for comparing prompt sizes offline."""
+    return len(_TOKEN.findall(text))
+
+
+def concept_index(entries: List[Tuple[str, str]], total: int) -> str:
+    text = "**CONCEPT INDEX (id: title):** " + "; ".join(f"{cid}: {title}" for cid, title in entries)
+    if total > len(entries):
+        text += f"; and {total - len(entries)} more (pass the name the user says to switch_mode)"
+    return text
+
+
+def concept_section(concept: Dict) -> str:
+    lines = [f"**ACTIVE CONCEPT:** {concept['id']}"]
+    lines += [f"- {field}: {concept[field]}" for field in CONCEPT_FIELDS if concept.get(field)]
+    return "\n".join(lines) + "\n"
+
+
+class PromptCompiler:
+    """Instruction variants per (mode, concept), compiled on first use and LRU-cached."""
+
+    def __init__(self, library: ConceptLibrary, index_limit: int = CONCEPT_INDEX_LIMIT, cache_size: int = 64):
+        self.library = library
+        self.prefix = PERSONA + "\n" + concept_index(library.index(index_limit), len(library)) + "\n\n"
+        self.instructions = lru_cache(maxsize=cache_size)(self._instructions)
+
+    def _instructions(self, mode: str, concept_id: Optional[str] = None) -> str:
+        concept = self.library.get(concept_id)
+        if concept is None:
+            behavior = GREETING if mode == "learn" else MODE_INSTRUCTIONS[mode]
+            return f"{self.prefix}**CURRENT MODE:** {mode.upper()}\n\n**YOUR BEHAVIOR:**\n{behavior}"
+        return (
+            f"{self.prefix}**CURRENT MODE:** {mode.upper()}\n\n"
+            f"{concept_section(concept)}\n**YOUR BEHAVIOR:**\n{MODE_INSTRUCTIONS[mode]}"
+        )
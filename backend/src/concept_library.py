@@ -0,0 +1,278 @@
+"""Tutor concept library backed by a SQLite index.
+
+The coach used to load the whole tutor content file into every session and
+scan it for each lookup. The library keeps concepts in one SQLite file per
+worker process instead:
+
+- id lookups hit the primary key, title lookups an index on the normalized
+  title, and concept bodies are only read (and LRU-cached) when needed;
+- spoken concept names ("loop", "funktions", "agentic") are resolved with the
+  same `FuzzyMatcher` the grocery catalog uses, over titles and ids only.
+
+Content files (JSON arrays of {id, title, summary, ...}) are imported on
+first use and re-imported when they change; each concept remembers the file
+it came from, so concepts dropped from a file are dropped from the library
+on re-import. Larger course sets can be imported ahead of time:
+
+    uv run python src/concept_library.py import courses/*.json
+    uv run python src/concept_library.py stats
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fuzzy_match import FuzzyMatcher, normalize_query
+
+logger = logging.getLogger("concept-library")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CONTENT_PATH = os.path.join(BACKEND_DIR, "shared-data", "day4_tutor_content.json")
+DB_PATH = os.getenv("CONCEPT_DB", os.path.join(BACKEND_DIR, "concepts.db"))
+
+
+class ConceptLibrary:
+    """Concepts in SQLite (WAL mode): id/title index plus lazily loaded JSON bodies."""
+
+    def __init__(self, path: str = DB_PATH, body_cache_size: int = 256):
+        self.path = path
+        self._lock = threading.RLock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS concepts (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                title_norm TEXT NOT NULL,
+                body TEXT NOT NULL,
+                source TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_concepts_title_norm ON concepts (title_norm);
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL
+            );
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(concepts)")}
+        if "source" not in columns:  # libraries built before concepts recorded their source
+            self._conn.execute("ALTER TABLE concepts ADD COLUMN source TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_concepts_source ON concepts (source)")
+        self._matcher: Optional[FuzzyMatcher] = None
+        self._version = 0
+        # Changes when another connection (another worker process) commits to the file.
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        self._cached_get = lru_cache(maxsize=body_cache_size)(self._get)
+
+    @classmethod
+    def from_content(cls, content: Iterable[Dict]) -> "ConceptLibrary":
+        """An in-memory library holding `content`, for tests and benchmarks."""
+        library = cls(":memory:")
+        library.add(content)
+        return library
+
+    # --- Import ---
+
+    def add(self, content: Iterable[Dict], source: Optional[str] = None) -> int:
+        """Insert or replace concepts by id; returns how many were written.
+
+        With `source`, `content` is that source's full set: the concepts are
+        recorded as coming from it, and concepts it held before but no longer
+        lists are deleted in the same transaction.
+        """
+        rows = [
+            (c["id"], c.get("title") or c["id"], normalize_query(c.get("title") or c["id"]), json.dumps(c), source)
+            for c in content
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO concepts (id, title, title_norm, body, source) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET title=excluded.title, title_norm=excluded.title_norm, "
+                    "body=excluded.body, source=excluded.source",
+                    rows,
+                )
+                removed = []
+                if source is not None:
+                    listed = {row[0] for row in rows}
+                    owned = self._conn.execute("SELECT id FROM concepts WHERE source=?", (source,)).fetchall()
+                    removed = [(cid,) for (cid,) in owned if cid not in listed]
+                    self._conn.executemany("DELETE FROM concepts WHERE id=?", removed)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._invalidate()
+        if removed:
+            logger.info(f"Removed {len(removed)} concepts no longer in {source}")
+        return len(rows)
+
+    def import_file(self, path: str, force: bool = False) -> int:
+        """Import a content file unless it is unchanged since the last import."""
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM sources WHERE path=?", (path,)).fetchone()
+            if row and row[0] == mtime_ns and not force:
+                return 0
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)
+            added = self.add((c for c in content if isinstance(c, dict) and c.get("id")), source=path)
+            self._conn.execute("INSERT OR REPLACE INTO sources (path, mtime_ns) VALUES (?, ?)", (path, mtime_ns))
+        logger.info(f"Imported {added} concepts from {path}")
+        return added
+
+    # --- Cache invalidation ---
+
+    def _invalidate(self):
+        self._matcher = None
+        self._cached_get.cache_clear()
+        self._version += 1
+
+    def _refresh(self):
+        """Drop the matcher and body cache if another process changed the database since the last check."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._invalidate()
+
+    @property
+    def version(self) -> int:
+        """Bumped on every change to the library, from this process or another, so derived caches can rebuild."""
+        self._refresh()
+        return self._version
+
+    # --- Lookups ---
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM concepts").fetchone()[0]
+
+    def get(self, concept_id: Optional[str]) -> Optional[Dict]:
+        """The concept's JSON body, or None; LRU-cached until the library changes."""
+        self._refresh()
+        return self._cached_get(concept_id)
+
+    def _get(self, concept_id: Optional[str]) -> Optional[Dict]:
+        if not concept_id:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM concepts WHERE id=?", (concept_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def by_title(self, title: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM concepts WHERE title_norm=? ORDER BY position LIMIT 1", (normalize_query(title),)
+            ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def iter_ids(self, page_size: int = 256) -> Iterator[str]:
+        """Concept ids in library order, read a page at a time (keyset pagination)."""
+        after = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT position, id FROM concepts WHERE position > ? ORDER BY position LIMIT ?",
+                    (after, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            for _, concept_id in rows:
+                yield concept_id
+            after = rows[-1][0]
+
+    def index(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """(id, title) pairs in library order, without loading bodies."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, title FROM concepts ORDER BY position LIMIT ?", (-1 if limit is None else limit,)
+            ).fetchall()
+
+    def _fuzzy(self) -> FuzzyMatcher:
+        with self._lock:
+            self._refresh()
+            if self._matcher is None:
+                entries = self.index()
+                names = [{"id": cid, "name": title, "title": title} for cid, title in entries]
+                names += [
+                    {"id": cid, "name": cid.replace("_", " ").replace("-", " "), "title": title}
+                    for cid, title in entries
+                ]
+                self._matcher = FuzzyMatcher(names)
+            return self._matcher
+
+    def resolve(self, spoken: str) -> Optional[Dict]:
+        """The concept meant by an id, a title or a noisy spoken name, if any is close enough."""
+        if not spoken:
+            return None
+        concept = self.get(spoken) or self.get(spoken.strip().lower()) or self.by_title(spoken)
+        if concept is not None:
+            return concept
+        match = self._fuzzy().best(spoken)
+        return self.get(match["id"]) if match else None
+
+    def suggestions(self, spoken: str, k: int = 3) -> List[str]:
+        """Titles of the closest concepts, for a 'did you mean' reply."""
+        return list(dict.fromkeys(m.item["title"] for m in self._fuzzy().top_k(spoken, k)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_library: Optional[ConceptLibrary] = None
+_library_lock = threading.Lock()
+
+
+def concept_library() -> ConceptLibrary:
+    """The process-wide library, with the bundled tutor content re-imported whenever it changed.
+
+    Unchanged content costs one stat and one indexed read per call.
+    """
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = ConceptLibrary()
+            _library.import_file(DEFAULT_CONTENT_PATH)
+        else:
+            try:
+                _library.import_file(DEFAULT_CONTENT_PATH)
+            except (OSError, ValueError) as e:
+                # Mid-edit or briefly missing: keep serving what was imported last.
+                logger.error(f"Failed to re-import {DEFAULT_CONTENT_PATH}: {e}")
+        return _library
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tutor concept library maintenance")
+    parser.add_argument("--db", default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Import JSON content files into the library")
+    imp.add_argument("paths", nargs="+")
+    imp.add_argument("--force", action="store_true", help="Re-import files even if unchanged")
+    sub.add_parser("stats", help="Show how many concepts the library holds")
+    args = parser.parse_args()
+
+    library = ConceptLibrary(args.db)
+    if args.command == "import":
+        for path in args.paths:
+            print(f"{path}: {library.import_file(path, force=args.force)} concepts imported")
+    print(f"{len(library)} concepts in {args.db}")
+    library.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,102 @@
 import logging
+import os
+from typing import Dict, Optional
+
 from dotenv import load_dotenv
 
 from livekit.agents import (
-    Agent, AgentSession, JobContext,
-    RoomInputOptions, WorkerOptions, cli, tokenize
+    Agent, AgentSession, JobContext, JobProcess,
+    RoomInputOptions, WorkerOptions, cli
 )
 
-from livekit.plugins import murf, google, deepgram, noise_cancellation
+from livekit.plugins import murf, google, deepgram, silero, noise_cancellation
 
-from fraud_tools import load_case, verify_answer, update_case_status
+from fraud_campaign import staged_case
+from fraud_db import get_db
+from fraud_tools import FraudSession, load_case, verify_answer, update_case_status
+from fraud_updates import flush_status_updates
+from instrumentation import instrument_session
+from latency_profiles import FirstAudioRecorder, latency_profile
 
 logger = logging.getLogger("fraud-agent")
 load_dotenv(".env.local")
 
 
+# For calls placed by the fraud campaign runner: the case is already loaded.
+STAGED_CASE_INSTRUCTIONS = """
+This is an outbound call about case {id} for {user_name}. The case is already
+loaded, so do NOT call load_case; use case_id {id}. Start at step 3 of the FLOW.
+Card ending {card_ending}, {amount} at {merchant} on {timestamp} ({category}, via {source}).
+Verification question: {verification_question}
+"""
+
+
 class FraudAgent(Agent):
-    def __init__(self):
-        super().__init__(
-            instructions="""
+    def __init__(self, case: Optional[Dict] = None):
+        instructions = """
 You are a fraud-alert representative and your name is Alex from **SecureBank**.
 Be calm, professional, and concise.
 
 FLOW:
 1. Ask for customer's name.
 2. Call load_case(name). If not_found → politely end.
+   Remember the case "id" it returns and pass it as case_id below.
 3. Ask stored verification question.
-4. Call verify_answer(name, answer).
+4. Call verify_answer(name, answer, case_id).
    - If False → say cannot proceed → end call.
    - If True → continue.
 5. Read suspicious transaction details.
 6. Ask: “Did you make this transaction? Yes or No?”
-7. If YES → update_case_status(..., "confirmed_safe")
-8. If NO  → update_case_status(..., "confirmed_fraud")
+7. If YES → update_case_status(..., "confirmed_safe", case_id=case_id)
+8. If NO  → update_case_status(..., "confirmed_fraud", case_id=case_id)
 9. End call.
 
 RULES:
 - Never ask for PIN, password, or full card number.
 - Use only tool data.
-""",
+"""
+        if case is not None:
+            instructions += STAGED_CASE_INSTRUCTIONS.format(**case)
+        super().__init__(
+            instructions=instructions,
             tools=[load_case, verify_answer, update_case_status],
         )
 
 
+def prewarm(proc: JobProcess):
+    # Open and migrate the case DB up front so a bad path or schema fails the worker, not a call.
+    get_db().check()
+    # The default profile relies on STT endpointing; only load VAD when the
+    # configured profile asks for it.
+    if latency_profile("fraud").vad:
+        proc.userdata["vad"] = silero.VAD.load()
+
+
 async def entrypoint(ctx: JobContext):
     ctx.log_context_fields = {"room": ctx.room.name}
+    # Commit any queued status updates before the worker goes away.
+    ctx.add_shutdown_callback(flush_status_updates)
+    # Campaign calls carry their case in the job metadata; inbound calls
+    # look it up by name with load_case.
+    case = staged_case(ctx.job.metadata)
 
+    profile = latency_profile("fraud")
     session = AgentSession(
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-flash"),
         tts=murf.TTS(
             voice="en-US-matthew",
             style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(min_sentence_len=2),
+            **profile.tts_options(),
         ),
-        vad=None,
-        turn_detection=None,
-        preemptive_generation=True,
+        **profile.session_options(ctx.proc.userdata.get("vad")),
+        userdata=FraudSession(case=case),
     )
+    FirstAudioRecorder("fraud", profile).attach(session)
+    instrument_session(session, ctx, "fraud")
 
     await session.start(
-        agent=FraudAgent(),
+        agent=FraudAgent(case),
         room=ctx.room,
         room_input_options=RoomInputOptions(
             noise_cancellation=noise_cancellation.BVC()
@@ -68,6 +105,13 @@ async def entrypoint(ctx: JobContext):
 
     await ctx.connect()
 
+    if case is not None:
+        await session.generate_reply(
+            instructions=f"Introduce yourself and ask {case['user_name']} the verification question."
+        )
+
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    # An agent name turns off automatic dispatch; set FRAUD_AGENT_NAME only on
+    # workers that should take campaign calls.
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, agent_name=os.getenv("FRAUD_AGENT_NAME", "")))
\ No newline at end of file
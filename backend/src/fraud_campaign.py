@@ -0,0 +1,311 @@
+"""Outbound fraud alert campaigns.
+
+Pages through pending fraud cases and dispatches one fraud agent session per
+case. The case row is staged into the dispatch's job metadata, so the agent
+starts with the case already loaded instead of looking it up by name.
+
+    python src/fraud_campaign.py run --shards 4 --shard 0 --rate 20
+    python src/fraud_campaign.py stats
+
+Run one process per shard to split a campaign; each only pages through the
+cases whose id falls in its shard.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from fraud_db import FraudDB, get_db
+
+logger = logging.getLogger("fraud-campaign")
+
+PENDING_STATUSES = ("pending", "pending_review")
+DISPATCHED_STATUS = "dispatched"
+RESOLVED_STATUSES = ("confirmed_safe", "confirmed_fraud")
+DEFAULT_AGENT_NAME = "fraud-agent"
+
+# Everything the agent needs to run the call. Job metadata only reaches the
+# agent worker, never the room's other participants, so the expected
+# verification answer can travel with it.
+STAGED_FIELDS = (
+    "id", "user_name", "card_ending", "amount", "merchant", "timestamp",
+    "category", "source", "verification_question", "verification_answer",
+)
+
+Dispatcher = Callable[[str, str], Awaitable[None]]
+
+
+def stage_case(case: Dict) -> str:
+    """Job metadata for a case's session."""
+    return json.dumps({"case": {k: case.get(k) for k in STAGED_FIELDS}})
+
+
+def staged_case(metadata: Optional[str]) -> Optional[Dict]:
+    """The case a campaign staged into job metadata, if any."""
+    if not metadata:
+        return None
+    try:
+        return json.loads(metadata).get("case")
+    except (ValueError, AttributeError):
+        return None
+
+
+def room_for(case: Dict) -> str:
+    return f"fraud-case-{case['id']}"
+
+
+async def fetch_pending_page(db: FraudDB, after_id: int, limit: int, shard: int = 0, shards: int = 1) -> List[Dict]:
+    """One page of pending cases with id > after_id (keyset pagination)."""
+    marks = ",".join("?" for _ in PENDING_STATUSES)
+    return await db.read(
+        f"SELECT * FROM fraud_cases WHERE status IN ({marks}) AND id > ? AND id % ? = ? ORDER BY id LIMIT ?",
+        (*PENDING_STATUSES, after_id, shards, shard, limit),
+    )
+
+
+class LiveKitDispatcher:
+    """Explicit agent dispatch through the LiveKit server API.
+
+    Reads LIVEKIT_URL / LIVEKIT_API_KEY / LIVEKIT_API_SECRET. The fraud agent
+    worker must be started with the same FRAUD_AGENT_NAME to receive these jobs.
+    """
+
+    def __init__(self, agent_name: str):
+        from livekit import api
+
+        self._api = api
+        self.agent_name = agent_name
+        self._lkapi = None
+
+    async def __call__(self, room: str, metadata: str):
+        if self._lkapi is None:
+            self._lkapi = self._api.LiveKitAPI()
+        await self._lkapi.agent_dispatch.create_dispatch(
+            self._api.CreateAgentDispatchRequest(agent_name=self.agent_name, room=room, metadata=metadata)
+        )
+
+    async def aclose(self):
+        if self._lkapi is not None:
+            await self._lkapi.aclose()
+
+
+@dataclass
+class CampaignMetrics:
+    started: float = field(default_factory=time.monotonic)
+    queued: int = 0
+    dispatched: int = 0
+    failed: int = 0
+    write_failed: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+    @property
+    def dispatch_rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.dispatched / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"queued={self.queued} dispatched={self.dispatched} failed={self.failed} "
+            f"write_failed={self.write_failed} "
+            f"queue_depth={self.queue_depth} (max {self.max_queue_depth}) "
+            f"rate={self.dispatch_rate:.1f}/s"
+        )
+
+
+class CampaignRunner:
+    """Feed pending cases from the DB to a pool of dispatch workers.
+
+    A reader task pages cases into a bounded queue (so memory stays at a few
+    pages however large the backlog is) and `concurrency` workers dispatch
+    them, no faster than `rate` dispatches per second overall. A case is
+    marked `dispatched` with a timestamp before its call is placed (and put
+    back if the dispatch fails), so a rerun resumes where the last one
+    stopped without calling anyone twice, and `stats` can measure time to
+    resolution. A failed DB write skips that case instead of ending the run.
+    """
+
+    def __init__(
+        self,
+        dispatch: Dispatcher,
+        db: Optional[FraudDB] = None,
+        shard: int = 0,
+        shards: int = 1,
+        page_size: int = 200,
+        concurrency: int = 8,
+        rate: float = 20.0,
+        report_interval: float = 10.0,
+    ):
+        self.dispatch = dispatch
+        self.db = db or get_db()
+        self.shard = shard
+        self.shards = shards
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.rate = rate
+        self.report_interval = report_interval
+        self.metrics = CampaignMetrics()
+        self._next_slot = 0.0
+
+    async def _read_pages(self, queue: "asyncio.Queue[Optional[Dict]]"):
+        after_id = 0
+        while True:
+            page = await fetch_pending_page(self.db, after_id, self.page_size, self.shard, self.shards)
+            if not page:
+                break
+            for case in page:
+                await queue.put(case)
+                self.metrics.queued += 1
+                self.metrics.queue_depth = queue.qsize()
+                self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+            after_id = page[-1]["id"]
+        for _ in range(self.concurrency):
+            await queue.put(None)
+
+    async def _throttle(self):
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _claim(self, case: Dict) -> bool:
+        """Mark a still-pending case dispatched; False if it was resolved or claimed since it was read."""
+        marks = ",".join("?" for _ in PENDING_STATUSES)
+        changed = await self.db.write(
+            f"UPDATE fraud_cases SET status=?, dispatched_at=? WHERE id=? AND status IN ({marks})",
+            (DISPATCHED_STATUS, datetime.utcnow().isoformat(), case["id"], *PENDING_STATUSES),
+        )
+        return changed > 0
+
+    async def _release(self, case: Dict):
+        """Put a case whose dispatch failed back to its pending status."""
+        try:
+            await self.db.write(
+                "UPDATE fraud_cases SET status=?, dispatched_at=NULL WHERE id=?", (case["status"], case["id"])
+            )
+        except Exception as e:
+            self.metrics.write_failed += 1
+            logger.error(f"Case {case['id']} is marked dispatched but no call was placed: {e}")
+
+    async def _work(self, queue: "asyncio.Queue[Optional[Dict]]"):
+        while True:
+            case = await queue.get()
+            if case is None:
+                return
+            await self._throttle()
+            try:
+                if not await self._claim(case):
+                    continue
+            except Exception as e:
+                self.metrics.write_failed += 1
+                logger.warning(f"Could not mark case {case['id']} dispatched, skipping it: {e}")
+                continue
+            try:
+                await self.dispatch(room_for(case), stage_case(case))
+            except Exception as e:
+                self.metrics.failed += 1
+                logger.warning(f"Dispatch failed for case {case['id']}: {e}")
+                await self._release(case)
+                continue
+            self.metrics.dispatched += 1
+
+    async def _report(self, queue: "asyncio.Queue"):
+        while True:
+            self.metrics.queue_depth = queue.qsize()
+            logger.info(f"Campaign shard {self.shard}/{self.shards}: {self.metrics.summary()}")
+            await asyncio.sleep(self.report_interval)
+
+    async def run(self) -> CampaignMetrics:
+        queue: asyncio.Queue[Optional[Dict]] = asyncio.Queue(maxsize=self.page_size * 2)
+        reporter = asyncio.create_task(self._report(queue))
+        tasks = [asyncio.create_task(self._read_pages(queue))]
+        tasks += [asyncio.create_task(self._work(queue)) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # If the reader fails, stop the workers too instead of leaving them waiting on the queue.
+            for task in [reporter, *tasks]:
+                task.cancel()
+        self.metrics.queue_depth = 0
+        logger.info(f"Campaign shard {self.shard}/{self.shards} done: {self.metrics.summary()}")
+        return self.metrics
+
+
+async def campaign_stats(db: FraudDB) -> Dict:
+    """Backlog size and dispatch-to-resolution times across all shards."""
+    counts = {row["status"]: row["n"] for row in await db.read("SELECT status, COUNT(*) AS n FROM fraud_cases GROUP BY status")}
+    marks = ",".join("?" for _ in RESOLVED_STATUSES)
+    rows = await db.read(
+        f"SELECT dispatched_at, updated_at FROM fraud_cases "
+        f"WHERE dispatched_at IS NOT NULL AND updated_at IS NOT NULL AND status IN ({marks})",
+        RESOLVED_STATUSES,
+    )
+    durations = sorted(
+        (datetime.fromisoformat(r["updated_at"]) - datetime.fromisoformat(r["dispatched_at"])).total_seconds()
+        for r in rows
+    )
+
+    def pick(p: float) -> Optional[float]:
+        return durations[min(len(durations) - 1, int(p * len(durations)))] if durations else None
+
+    return {
+        "pending": sum(counts.get(s, 0) for s in PENDING_STATUSES),
+        "in_flight": counts.get(DISPATCHED_STATUS, 0),
+        "resolved": sum(counts.get(s, 0) for s in RESOLVED_STATUSES),
+        "resolved_after_dispatch": len(durations),
+        "seconds_to_resolve_p50": pick(0.5),
+        "seconds_to_resolve_p95": pick(0.95),
+    }
+
+
+def main():
+    load_dotenv(".env.local")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    parser = argparse.ArgumentParser(description="Outbound fraud alert campaigns")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Dispatch a fraud agent session for every pending case")
+    run.add_argument("--shard", type=int, default=0)
+    run.add_argument("--shards", type=int, default=1)
+    run.add_argument("--page-size", type=int, default=200)
+    run.add_argument("--concurrency", type=int, default=8)
+    run.add_argument("--rate", type=float, default=20.0, help="max dispatches per second (0 = unlimited)")
+    run.add_argument("--agent-name", default=os.getenv("FRAUD_AGENT_NAME") or DEFAULT_AGENT_NAME)
+    sub.add_parser("stats", help="Show campaign backlog and time to resolution")
+    args = parser.parse_args()
+
+    async def _main():
+        if args.command == "stats":
+            print(json.dumps(await campaign_stats(get_db()), indent=2))
+            return
+        dispatcher = LiveKitDispatcher(args.agent_name)
+        runner = CampaignRunner(
+            dispatcher,
+            shard=args.shard,
+            shards=args.shards,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+            rate=args.rate,
+        )
+        try:
+            await runner.run()
+        finally:
+            await dispatcher.aclose()
+
+    asyncio.run(_main())
+    get_db().close()
+
+
+if __name__ == "__main__":
+    main()
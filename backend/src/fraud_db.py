@@ -0,0 +1,217 @@
+import asyncio
+import contextlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("fraud-db")
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "shared-data", "fraud_cases.db")
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+MIGRATIONS = [
+    # Name lookups filter on LOWER(user_name); index that expression so they
+    # stop scanning the whole table.
+    "CREATE INDEX IF NOT EXISTS idx_fraud_cases_user_name_lower ON fraud_cases (LOWER(user_name))",
+    # The campaign runner pages through cases by status in id order.
+    "CREATE INDEX IF NOT EXISTS idx_fraud_cases_status_id ON fraud_cases (status, id)",
+    # When the campaign runner dispatched a call for the case.
+    "ALTER TABLE fraud_cases ADD COLUMN dispatched_at TEXT",
+]
+
+
+def migrate(conn: sqlite3.Connection):
+    """Apply pending migrations in one write transaction.
+
+    Worker processes may prewarm at the same time; the version is re-read
+    once the write lock is held, so only one of them applies each migration.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < len(MIGRATIONS) and not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='fraud_cases'"
+        ).fetchone():
+            raise sqlite3.OperationalError("fraud DB has no fraud_cases table to migrate")
+        for number, sql in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info(f"Applying fraud DB migration {number}")
+            conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {number}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+class _Request:
+    __slots__ = ("future", "loop", "many", "params", "sql", "write")
+
+    def __init__(self, sql: str, params: Sequence, write: bool, loop, future, many: bool = False):
+        self.sql = sql
+        self.params = params
+        self.write = write
+        self.many = many
+        self.loop = loop
+        self.future = future
+
+
+class FraudDB:
+    """One SQLite connection owned by a dedicated thread, fed by a request queue.
+
+    Every call from every session in the worker goes through the same
+    connection, so sqlite3's statement cache keeps each query prepared.
+    Whatever is queued when the thread wakes up (up to `max_batch` requests)
+    runs inside a single transaction, so a burst of concurrent tool calls
+    costs one commit instead of one connection + commit each.
+    """
+
+    def __init__(self, path: str = DB_PATH, max_batch: int = 256):
+        self.path = path
+        self.max_batch = max_batch
+        self._queue: queue.Queue[Optional[_Request]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.commits = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        try:
+            migrate(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def check(self):
+        """Open the database and apply migrations now, raising if it is unusable."""
+        self._connect().close()
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            logger.error(f"Fraud DB unavailable at {self.path}: {e}")
+            # Fail everything queued so far; the next request starts a fresh thread and retries.
+            with self._start_lock:
+                self._thread = None
+                while True:
+                    try:
+                        request = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if request is not None:
+                        _reply(request, None, e)
+            return
+        try:
+            while True:
+                request = self._queue.get()
+                if request is None:
+                    return
+                batch = [request]
+                while len(batch) < self.max_batch:
+                    try:
+                        request = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if request is None:
+                        self._execute(conn, batch)
+                        return
+                    batch.append(request)
+                self._execute(conn, batch)
+        finally:
+            conn.close()
+
+    def _execute(self, conn: sqlite3.Connection, batch: List[_Request]):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE" if any(r.write for r in batch) else "BEGIN")
+            for request in batch:
+                try:
+                    if request.many:
+                        # Per-row counts, so callers can tell which rows matched nothing.
+                        counts = [conn.execute(request.sql, params).rowcount for params in request.params]
+                        results.append((request, counts, None))
+                        continue
+                    cur = conn.execute(request.sql, request.params)
+                    if request.write:
+                        results.append((request, cur.rowcount, None))
+                    else:
+                        results.append((request, [dict(row) for row in cur.fetchall()], None))
+                except sqlite3.Error as e:
+                    results.append((request, None, e))
+            conn.execute("COMMIT")
+            self.commits += 1
+        except sqlite3.Error as e:
+            logger.error(f"Fraud DB batch failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            results = [(request, None, e) for request in batch]
+
+        for request, value, error in results:
+            _reply(request, value, error)
+
+    def _submit(self, sql: str, params: Sequence, write: bool, many: bool = False) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        params = [tuple(p) for p in params] if many else tuple(params)
+        # Enqueue under the start lock so a request can't slip in after a failed
+        # thread has drained the queue but before it cleared `_thread`.
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="fraud-db", daemon=True)
+                self._thread.start()
+            self._queue.put(_Request(sql, params, write, loop, future, many))
+        return future
+
+    async def read(self, sql: str, params: Sequence = ()) -> List[Dict[str, Any]]:
+        return await self._submit(sql, params, write=False)
+
+    async def write(self, sql: str, params: Sequence = ()) -> int:
+        """Run a write statement; returns the number of rows it changed."""
+        return await self._submit(sql, params, write=True)
+
+    async def write_many(self, sql: str, rows: Sequence[Sequence]) -> List[int]:
+        """Run one write statement for every params row, in a single transaction; returns each row's change count."""
+        return await self._submit(sql, rows, write=True, many=True)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def _reply(request: _Request, value, error):
+    with contextlib.suppress(RuntimeError):  # the session's loop is already closed
+        request.loop.call_soon_threadsafe(_resolve, request.future, value, error)
+
+
+def _resolve(future: "asyncio.Future", value, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+
+
+_db: Optional[FraudDB] = None
+_db_lock = threading.Lock()
+
+
+def get_db() -> FraudDB:
+    """Shared FraudDB for this worker process."""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = FraudDB()
+        return _db
@@ -1,63 +1,97 @@
-import sqlite3
-import os
-from datetime import datetime
-from livekit.agents import function_tool
-import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
 
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "shared-data", "fraud_cases.db")
+from livekit.agents import RunContext
 
+from fraud_db import get_db
+from fraud_updates import status_queue
+from tool_timing import function_tool
 
-def _db_read(query, params=()):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(query, params)
-    rows = cur.fetchall()
-    colnames = [c[0] for c in cur.description]
-    conn.close()
-    return [dict(zip(colnames, row)) for row in rows]
 
+def _normalize_name(user_name: Optional[str]) -> str:
+    return (user_name or "").strip().lower()
 
-def _db_write(query, params=()):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute(query, params)
-    conn.commit()
-    conn.close()
+
+@dataclass
+class FraudSession:
+    """Per-call state kept in session userdata: the case loaded for this caller."""
+    case: Optional[Dict] = None
+    user_name: Optional[str] = None  # normalized name the case was loaded for
+
+    def __post_init__(self):
+        if self.case is not None and self.user_name is None:
+            self.user_name = _normalize_name(self.case.get("user_name"))
 
 
 # ----------- ASYNC TOOLS (important!) -----------
+# All queries go through the shared FraudDB thread: one pooled WAL connection,
+# prepared statements, and concurrent calls batched into one transaction.
+# load_case caches the row in the session, so verification happens in memory
+# and the final update targets the row id: two DB round-trips per call.
+# Status updates go through a write-behind queue that commits them in batches;
+# the tool waits for the commit before reporting success.
+
+async def _fetch_case(session: FraudSession, user_name: str, case_id: Optional[int] = None) -> Optional[Dict]:
+    name = _normalize_name(user_name)
+    if case_id is not None:
+        rows = await get_db().read("SELECT * FROM fraud_cases WHERE id=?", (case_id,))
+        # A case id only counts for the customer it belongs to.
+        rows = [row for row in rows if _normalize_name(row["user_name"]) == name]
+    else:
+        rows = await get_db().read(
+            "SELECT * FROM fraud_cases WHERE LOWER(user_name)=LOWER(?) LIMIT 1",
+            (user_name.strip(),)
+        )
+    session.case = rows[0] if rows else None
+    session.user_name = name if rows else None
+    return session.case
+
+
+async def _session_case(session: FraudSession, user_name: str, case_id: Optional[int]) -> Optional[Dict]:
+    # Reuse the cached row only for the same customer and, if given, the same case.
+    case = session.case
+    if (
+        case is None
+        or session.user_name != _normalize_name(user_name)
+        or (case_id is not None and case["id"] != case_id)
+    ):
+        case = await _fetch_case(session, user_name, case_id)
+    return case
+
 
 @function_tool
-async def load_case(user_name: str):
-    return await asyncio.to_thread(
-        _db_read,
-        "SELECT * FROM fraud_cases WHERE LOWER(user_name)=LOWER(?) LIMIT 1",
-        (user_name,)
-    )
+async def load_case(ctx: RunContext[FraudSession], user_name: str):
+    case = await _fetch_case(ctx.userdata, user_name)
+    if case is None:
+        return []
+
+    # The expected answer stays server-side; the LLM only needs the question.
+    return [{k: v for k, v in case.items() if k != "verification_answer"}]
 
 
 @function_tool
-async def verify_answer(user_name: str, answer: str):
-    rows = await asyncio.to_thread(
-        _db_read,
-        "SELECT verification_answer FROM fraud_cases WHERE LOWER(user_name)=LOWER(?)",
-        (user_name,)
-    )
-    if not rows:
+async def verify_answer(ctx: RunContext[FraudSession], user_name: str, answer: str, case_id: Optional[int] = None):
+    case = await _session_case(ctx.userdata, user_name, case_id)
+    if case is None:
         return {"verified": False}
 
-    return {"verified": rows[0]["verification_answer"].lower() == answer.lower()}
+    return {"verified": (case["verification_answer"] or "").strip().lower() == answer.strip().lower()}
 
 
 @function_tool
-async def update_case_status(user_name: str, status: str, note: str):
-    await asyncio.to_thread(
-        _db_write,
-        """
-        UPDATE fraud_cases
-        SET status=?, notes=?, updated_at=?
-        WHERE LOWER(user_name)=LOWER(?)
-        """,
-        (status, note, datetime.utcnow().isoformat(), user_name)
-    )
-    return {"updated": True, "status": status, "note": note}
\ No newline at end of file
+async def update_case_status(
+    ctx: RunContext[FraudSession], user_name: str, status: str, note: str, case_id: Optional[int] = None
+):
+    case = await _session_case(ctx.userdata, user_name, case_id)
+    if case is None:
+        return {"updated": False, "error": "No matching case."}
+
+    try:
+        updated = await status_queue().submit(case["id"], status, note)
+    except Exception as e:
+        return {"updated": False, "error": f"Could not save the update: {e}"}
+    if not updated:
+        return {"updated": False, "error": f"Case {case['id']} no longer exists."}
+
+    case["status"] = status
+    return {"updated": True, "status": status, "note": note}
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fraud_db import FraudDB, get_db
+
+logger = logging.getLogger("fraud-updates")
+
+UPDATE_STATUS = "UPDATE fraud_cases SET status=?, notes=?, updated_at=? WHERE id=?"
+
+
+@dataclass
+class _PendingUpdate:
+    status: str
+    note: str
+    updated_at: str
+    waiters: List["asyncio.Future"] = field(default_factory=list)
+
+
+class StatusUpdateQueue:
+    """Write-behind queue for fraud case status updates.
+
+    Updates are held in memory and committed together, either `interval`
+    seconds after the first one arrives or as soon as `max_pending` cases are
+    waiting. Several updates to the same case before a flush collapse into
+    the last one. `submit` returns a future that resolves once the update is
+    committed: True if the case row was changed, False if no case has that id.
+    """
+
+    def __init__(self, db: Optional[FraudDB] = None, interval: float = 0.05, max_pending: int = 500):
+        self.db = db or get_db()
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[int, _PendingUpdate] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        self.flushed_batches = 0
+
+    def submit(self, case_id: int, status: str, note: str) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        update = self._pending.get(case_id)
+        if update is None:
+            update = self._pending[case_id] = _PendingUpdate(status, note, "")
+        update.status = status
+        update.note = note
+        update.updated_at = datetime.utcnow().isoformat()
+        update.waiters.append(waiter)
+
+        if len(self._pending) >= self.max_pending:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.interval, self._start_flush)
+        return waiter
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._commit(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _commit(self, batch: Dict[int, _PendingUpdate]):
+        rows = [(u.status, u.note, u.updated_at, case_id) for case_id, u in batch.items()]
+        try:
+            counts = await self.db.write_many(UPDATE_STATUS, rows)
+            error = None
+            self.flushed_batches += 1
+        except Exception as e:
+            logger.error(f"Failed to commit {len(rows)} fraud case updates: {e}")
+            counts, error = [0] * len(rows), e
+        for update, count in zip(batch.values(), counts):
+            for waiter in update.waiters:
+                if waiter.done():
+                    continue
+                if error is not None:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(count > 0)
+
+    async def flush(self):
+        """Commit everything queued so far and wait for flushes already in flight."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+
+# One queue per event loop: the timer and futures belong to the loop that
+# created them.
+_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, StatusUpdateQueue]" = weakref.WeakKeyDictionary()
+
+
+def status_queue() -> StatusUpdateQueue:
+    loop = asyncio.get_running_loop()
+    queue = _queues.get(loop)
+    if queue is None:
+        queue = _queues[loop] = StatusUpdateQueue()
+    return queue
+
+
+async def flush_status_updates():
+    """Shutdown hook: commit any status updates still waiting in the queue."""
+    queue = _queues.get(asyncio.get_running_loop())
+    if queue is not None:
+        await queue.flush()
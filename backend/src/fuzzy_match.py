@@ -0,0 +1,156 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+_STOP_WORDS = {"a", "an", "the", "of", "some", "and", "please"}
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def phonetic_key(token: str) -> str:
+    """Soundex code of `token`, ignoring a plural 's' so 'bananas' ~ 'banana'."""
+    if len(token) > 3 and token.endswith("s"):
+        token = token[:-1]
+    if not token.isalpha():
+        return token
+    key = token[0]
+    last = _SOUNDEX_CODES.get(token[0], "")
+    for ch in token[1:]:
+        code = _SOUNDEX_CODES.get(ch, "")
+        if code and code != last:
+            key += code
+        if ch not in "hw":
+            last = code
+    return (key + "000")[:4]
+
+
+def _trigrams(token: str) -> set:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class Match:
+    item: Dict
+    score: float
+
+
+class FuzzyMatcher:
+    """Ranks catalog items against noisy (speech-to-text) item names.
+
+    Each query word is compared to the catalog vocabulary through a character
+    trigram index and Soundex keys; short queries are also tried as the
+    initials of an item name ("pb" -> Peanut Butter). Work per lookup is
+    bounded by `max_candidates` words per query word and `max_items` scored
+    items, and ranked results are memoized per normalized query.
+    """
+
+    def __init__(
+        self,
+        catalog: List[Dict],
+        min_score: float = 0.6,
+        suggest_score: float = 0.35,
+        max_candidates: int = 32,
+        max_items: int = 2000,
+        cache_size: int = 1024,
+    ):
+        self.catalog = catalog
+        self.min_score = min_score
+        self.suggest_score = suggest_score
+        self.max_candidates = max_candidates
+        self.max_items = max_items
+
+        self._item_tokens: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, List[int]] = {}  # word -> item positions
+        self._grams: Dict[str, List[str]] = {}  # trigram -> words
+        self._phonetic: Dict[str, List[str]] = {}  # soundex key -> words
+        self._initials: Dict[str, List[int]] = {}  # initials -> item positions
+
+        for pos, item in enumerate(catalog):
+            tokens = tuple(normalize_query(item["name"]).split())
+            self._item_tokens.append(tokens)
+            for token in set(tokens):
+                if token not in self._postings:
+                    self._postings[token] = []
+                    for gram in _trigrams(token):
+                        self._grams.setdefault(gram, []).append(token)
+                    self._phonetic.setdefault(phonetic_key(token), []).append(token)
+                self._postings[token].append(pos)
+            words = [t for t in tokens if t.isalpha()]
+            if len(words) > 1:
+                self._initials.setdefault("".join(w[0] for w in words), []).append(pos)
+
+        self._ranked = lru_cache(maxsize=cache_size)(self._rank)
+
+    def _similar_words(self, word: str) -> Dict[str, float]:
+        grams = _trigrams(word)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for token in self._grams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+
+        best = sorted(shared.items(), key=lambda kv: -kv[1])[:self.max_candidates]
+        similar = {token: 2 * n / (len(grams) + len(_trigrams(token))) for token, n in best}
+        for token in self._phonetic.get(phonetic_key(word), ()):
+            similar[token] = max(similar.get(token, 0.0), 0.8)
+        if len(word) >= 3:
+            for token in list(similar):
+                if token.startswith(word):
+                    similar[token] = max(similar[token], 0.9)
+        if word in self._postings:
+            similar[word] = 1.0
+        return similar
+
+    def _rank(self, query: str) -> Tuple[Match, ...]:
+        words = [w for w in query.split() if w not in _STOP_WORDS] or query.split()
+        if not words:
+            return ()
+
+        # best[pos][i] = best similarity of query word i to any word of item pos
+        best: Dict[int, List[float]] = {}
+        for i, word in enumerate(words):
+            for token, sim in sorted(self._similar_words(word).items(), key=lambda kv: -kv[1]):
+                for pos in self._postings[token]:
+                    scores = best.get(pos)
+                    if scores is None:
+                        if len(best) >= self.max_items:
+                            continue
+                        scores = best[pos] = [0.0] * len(words)
+                    if sim > scores[i]:
+                        scores[i] = sim
+
+        ranked = {}
+        for pos, scores in best.items():
+            matched = sum(1 for s in scores if s >= 0.5)
+            coverage = min(matched / len(self._item_tokens[pos]), 1.0)
+            ranked[pos] = sum(scores) / len(words) * (0.85 + 0.15 * coverage)
+
+        if len(words) == 1 and 2 <= len(words[0]) <= 4:
+            for pos in self._initials.get(words[0], ()):
+                ranked[pos] = max(ranked.get(pos, 0.0), 0.9)
+
+        order = sorted(
+            (pos for pos, score in ranked.items() if score >= self.suggest_score),
+            key=lambda pos: (-ranked[pos], pos),
+        )
+        return tuple(Match(self.catalog[pos], round(ranked[pos], 3)) for pos in order[:10])
+
+    def top_k(self, query: str, k: int = 3) -> List[Match]:
+        return list(self._ranked(normalize_query(query))[:k])
+
+    def best(self, query: str) -> Optional[Dict]:
+        matches = self.top_k(query, 1)
+        if matches and matches[0].score >= self.min_score:
+            return matches[0].item
+        return None
@@ -1,33 +1,31 @@
-import json
 import os
-from datetime import datetime
 from typing import List, Dict, Optional
 
-CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "grocery_catalog.json")
-ORDERS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "orders.json")
+from catalog_cache import shared_catalog
+from order_store import new_order, open_order_store
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared-data", "grocery_catalog.json")
 
 def load_catalog() -> List[Dict]:
-    if not os.path.exists(CATALOG_PATH):
-        return []
-    with open(CATALOG_PATH, "r") as f:
-        return json.load(f)
+    return list(shared_catalog(CATALOG_PATH).get().items)
 
 class GroceryCart:
     def __init__(self):
         self.items: Dict[str, Dict] = {} # item_id -> {item_details, quantity}
-        self.catalog = load_catalog()
+        self.catalog_source = shared_catalog(CATALOG_PATH)
+
+    @property
+    def catalog(self):
+        return self.catalog_source.get().items
 
     def _find_item_by_name(self, name: str) -> Optional[Dict]:
-        name_lower = name.lower()
-        # Exact match first
-        for item in self.catalog:
-            if item["name"].lower() == name_lower:
-                return item
-        # Partial match
-        for item in self.catalog:
-            if name_lower in item["name"].lower():
-                return item
-        return None
+        snapshot = self.catalog_source.get()
+        # Exact match first, then partial match, then fuzzy match
+        return (
+            snapshot.index.get_by_exact_name(name)
+            or snapshot.index.find_substring(name)
+            or snapshot.matcher.best(name)
+        )
 
     def add_item(self, name: str, quantity: int = 1) -> str:
         item = self._find_item_by_name(name)
@@ -85,29 +83,14 @@ class GroceryCart:
 
 class OrderManager:
     def __init__(self):
-        self._ensure_orders_file()
-
-    def _ensure_orders_file(self):
-        if not os.path.exists(ORDERS_PATH):
-            with open(ORDERS_PATH, "w") as f:
-                json.dump([], f)
+        self.store = open_order_store()
 
     def place_order(self, cart: GroceryCart) -> str:
         if not cart.items:
             return "Cannot place an empty order."
 
-        orders = []
-        try:
-            with open(ORDERS_PATH, "r") as f:
-                orders = json.load(f)
-        except json.JSONDecodeError:
-            orders = []
-
-        new_order = {
-            "order_id": f"ord_{int(datetime.now().timestamp())}",
-            "timestamp": datetime.now().isoformat(),
-            "status": "received",
-            "items": [
+        order = new_order(
+            [
                 {
                     "id": entry["item"]["id"],
                     "name": entry["item"]["name"],
@@ -116,34 +99,25 @@ class OrderManager:
                 }
                 for entry in cart.items.values()
             ],
-            "total": cart.get_total()
-        }
-
-        orders.append(new_order)
+            cart.get_total(),
+        )
 
-        with open(ORDERS_PATH, "w") as f:
-            json.dump(orders, f, indent=2)
+        self.store.append(order)
 
         cart.clear()
-        return f"Order placed successfully! Your order ID is {new_order['order_id']}."
+        return f"Order placed successfully! Your order ID is {order['id']}."
 
     def get_order_status(self, order_id: str = None) -> str:
-        try:
-            with open(ORDERS_PATH, "r") as f:
-                orders = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return "No orders found."
-
-        if not orders:
-            return "No orders found."
-
         # If no ID provided, get the latest one
         if not order_id:
-            order = orders[-1]
-            return f"Your latest order ({order['order_id']}) is currently: {order['status']}."
-
-        for order in orders:
-            if order["order_id"] == order_id:
-                return f"Order {order_id} is currently: {order['status']}."
+            latest = self.store.recent(1)
+            if not latest:
+                return "No orders found."
+            order = latest[0]
+            return f"Your latest order ({order['id']}) is currently: {order['status']}."
+
+        order = self.store.get(order_id)
+        if order:
+            return f"Order {order_id} is currently: {order['status']}."
 
         return f"Order {order_id} not found."
\ No newline at end of file
@@ -5,8 +5,6 @@
 # ======================================================
 
 import logging
-import json
-import os
 import asyncio
 from datetime import datetime
 from typing import Annotated, Literal, List, Optional
@@ -29,11 +27,16 @@ from livekit.agents import (
     metrics,
     MetricsCollectedEvent,
     RunContext,
-    function_tool,
 )
 
 from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+from instrumentation import instrument_session
+from latency_profiles import FirstAudioRecorder, latency_profile
+from persistence import run_io
+from tool_timing import function_tool
+from user_identity import user_id
+from wellness_store import wellness_store
 
 logger = logging.getLogger("agent")
 load_dotenv(".env.local")
@@ -64,35 +67,33 @@ class Userdata:
     """👤 User session data passed to the agent"""
     current_checkin: CheckInState
     history_summary: str  # String containing info about previous sessions
+    user_id: str  # Stable user id (see user_identity); history is stored per user
     session_start: datetime = field(default_factory=datetime.now)
 
 # ======================================================
-# 💾 PERSISTENCE LAYERS (JSON LOGGING)
+# 💾 PERSISTENCE LAYERS (SQLITE HISTORY + DAILY ROLLUP)
 # ======================================================
-WELLNESS_LOG_FILE = "wellness_log.json"
-
-def get_log_path():
-    base_dir = os.path.dirname(__file__)
-    backend_dir = os.path.abspath(os.path.join(base_dir, ".."))
-    return os.path.join(backend_dir, WELLNESS_LOG_FILE)
 
-def load_history() -> list:
-    """📖 Read previous check-ins from JSON"""
-    path = get_log_path()
-    if not os.path.exists(path):
-        return []
+async def load_history_summary(user: str) -> str:
+    """📖 Summarize this user's last check-in and recent mood/energy trend"""
     try:
-        with open(path, "r", encoding='utf-8') as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
+        store = await run_io(wellness_store, user)
+        last_entry, trend = await run_io(store.session_context)
     except Exception as e:
         print(f"⚠️ Could not load history: {e}")
-        return []
+        return ""
+    if last_entry is None:
+        return ""
+    return (
+        f"Last check-in was on {last_entry.get('timestamp', 'unknown date')}. "
+        f"User felt {last_entry.get('mood')} with {last_entry.get('energy')} energy. "
+        f"Their goals were: {', '.join(last_entry.get('objectives', []))}. "
+        f"Recent trend: {trend.describe()}"
+    )
 
-def save_checkin_entry(entry: CheckInState) -> None:
-    """💾 Append new check-in to the JSON list"""
-    path = get_log_path()
-    history = load_history()
+async def save_checkin_entry(user: str, entry: CheckInState) -> None:
+    """💾 Append the new check-in to this user's history (on the I/O pool)"""
+    store = await run_io(wellness_store, user)
     
     # Create record
     record = {
@@ -103,13 +104,9 @@ def save_checkin_entry(entry: CheckInState) -> None:
         "summary": entry.advice_given
     }
     
-    history.append(record)
-    
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding='utf-8') as f:
-        json.dump(history, f, indent=4, ensure_ascii=False)
+    await run_io(store.append, record)
         
-    print(f"\n✅ CHECK-IN SAVED TO {path}")
+    print(f"\n✅ CHECK-IN SAVED TO {store.path}")
 
 # ======================================================
 # 🛠️ WELLNESS AGENT TOOLS
@@ -144,15 +141,15 @@ async def complete_checkin(
     ctx: RunContext[Userdata],
     final_advice_summary: Annotated[str, Field(description="A brief 1-sentence summary of the advice given")],
 ) -> str:
-    """💾 Finalize the session, provide a recap, and save to JSON. Call at the very end."""
+    """💾 Finalize the session, provide a recap, and save it to the wellness log. Call at the very end."""
     state = ctx.userdata.current_checkin
     state.advice_given = final_advice_summary
     
     if not state.is_complete():
         return "I can't finish yet. I still need to know your mood, energy, or at least one goal."
 
-    # Save to JSON
-    save_checkin_entry(state)
+    # Save to the history store
+    await save_checkin_entry(ctx.userdata.user_id, state)
     
     print("\n" + "⭐" * 60)
     print("🎉 WELLNESS CHECK-IN COMPLETED!")
@@ -219,28 +216,30 @@ async def entrypoint(ctx: JobContext):
     print("\n" + "🌿" * 25)
     print("🚀 STARTING WELLNESS SESSION")
     
-    # 1. Load History from JSON
-    history = load_history()
-    history_summary = "No previous history found. This is the first session."
+    # 1. Join the room and find out who we are talking to; history is per user
+    await ctx.connect()
+    participant = await ctx.wait_for_participant()
+    user = user_id(participant)
+    ctx.log_context_fields = {"room": ctx.room.name, "participant": participant.identity, "user_id": user}
+
+    # 2. Load this user's latest check-in and recent trend
+    history_summary = await load_history_summary(user)
     
-    if history:
-        last_entry = history[-1]
-        history_summary = (
-            f"Last check-in was on {last_entry.get('timestamp', 'unknown date')}. "
-            f"User felt {last_entry.get('mood')} with {last_entry.get('energy')} energy. "
-            f"Their goals were: {', '.join(last_entry.get('objectives', []))}."
-        )
+    if history_summary:
         print("📜 HISTORY LOADED:", history_summary)
     else:
+        history_summary = "No previous history found. This is the first session."
         print("📜 NO HISTORY FOUND.")
 
-    # 2. Initialize Session Data
+    # 3. Initialize Session Data
     userdata = Userdata(
         current_checkin=CheckInState(),
-        history_summary=history_summary
+        history_summary=history_summary,
+        user_id=user,
     )
 
-    # 3. Setup Agent
+    # 4. Setup Agent
+    profile = latency_profile("wellness")
     session = AgentSession(
         stt=deepgram.STT(model="nova-3"),
         llm=google.LLM(model="gemini-2.5-flash"),
@@ -248,13 +247,15 @@ async def entrypoint(ctx: JobContext):
             voice="en-US-natalie", # Using a softer, more caring voice
             style="Promo",         # Often sounds more enthusiastic/supportive
             text_pacing=True,
+            **profile.tts_options(),
         ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
+        **profile.session_options(ctx.proc.userdata["vad"]),
         userdata=userdata,
     )
+    FirstAudioRecorder("wellness", profile).attach(session)
+    instrument_session(session, ctx, "wellness")
     
-    # 4. Start
+    # 5. Start
     await session.start(
         agent=WellnessAgent(history_context=history_summary),
         room=ctx.room,
@@ -263,7 +264,5 @@ async def entrypoint(ctx: JobContext):
         ),
     )
 
-    await ctx.connect()
-
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
@@ -0,0 +1,405 @@
+"""Per-turn latency instrumentation shared by every agent entrypoint.
+
+`instrument_session(session, ctx, "grocery")` subscribes to the session's
+metrics and tool events and records, per turn:
+
+    eou_delay    end of user speech -> turn committed (EOUMetrics)
+    stt_latency  end of user speech -> final transcript (EOUMetrics), or the
+                 request duration for non-streaming STT
+    llm_ttft     LLM time to first token
+    tts_ttfb     TTS time to first audio byte
+    tool_time    per tool name, from the function call to its output
+
+Samples go into histograms labelled by agent type, room and stage, and each
+turn's breakdown is logged so a slow turn shows which stage was slow.
+Sinks are configured from the environment:
+
+    LATENCY_JSONL=metrics/latency.jsonl   one JSON line per sample
+    LATENCY_PROM_DIR=metrics/prom         Prometheus text file per worker process
+
+Job processes each write their own .prom file; serve them all from one
+local endpoint with:
+
+    python src/instrumentation.py serve --dir metrics/prom --port 9464
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from tool_timing import start_tool_report
+
+logger = logging.getLogger("latency")
+
+STAGES = ("eou_delay", "stt_latency", "llm_ttft", "tts_ttfb", "tool_time")
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0, math.inf)
+METRIC = "voice_agent_stage_latency_seconds"
+
+
+@dataclass
+class Sample:
+    agent: str
+    room: str
+    stage: str
+    value: float
+    tool: str = ""
+    speech_id: Optional[str] = None
+    timestamp: float = 0.0
+
+
+class Histogram:
+    __slots__ = ("count", "counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, other: "Histogram"):
+        self.counts = [x + y for x, y in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def observe(self, value: float):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th sample."""
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= target and n:
+                return bound
+        return BUCKETS[-1]
+
+
+# ---------- Sinks ----------
+
+class MetricsSink:
+    """Receives every sample as it is recorded, and the registry on flush."""
+
+    def record(self, sample: Sample):
+        pass
+
+    def flush(self, registry: "LatencyRegistry"):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonlSink(MetricsSink):
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115 - held for the sink's lifetime, closed in close()
+        self._lock = threading.Lock()
+
+    def record(self, sample: Sample):
+        with self._lock:
+            self._file.write(json.dumps(asdict(sample)) + "\n")
+
+    def flush(self, registry: "LatencyRegistry"):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class PrometheusTextSink(MetricsSink):
+    """Writes the registry in Prometheus text format to <dir>/<prefix>-<pid>.prom."""
+
+    def __init__(self, directory: str, prefix: str = "agent"):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{prefix}-{os.getpid()}.prom")
+
+    def flush(self, registry: "LatencyRegistry"):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(registry.to_prometheus())
+        os.replace(tmp, self.path)
+
+
+# ---------- Registry ----------
+
+HistogramKey = Tuple[str, str, str, str]  # agent, room, stage, tool
+
+
+class LatencyRegistry:
+    def __init__(self, sinks: Optional[List[MetricsSink]] = None):
+        self.sinks: List[MetricsSink] = list(sinks or [])
+        self.histograms: Dict[HistogramKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, sample: Sample):
+        key = (sample.agent, sample.room, sample.stage, sample.tool)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(sample.value)
+        for sink in self.sinks:
+            sink.record(sample)
+
+    def merged(self, agent: Optional[str] = None, room: Optional[str] = None) -> Dict[Tuple[str, str], Histogram]:
+        """Histograms per (stage, tool), summed over the matching agents/rooms."""
+        merged: Dict[Tuple[str, str], Histogram] = {}
+        with self._lock:
+            for (a, r, stage, tool), histogram in self.histograms.items():
+                if (agent is not None and a != agent) or (room is not None and r != room):
+                    continue
+                merged.setdefault((stage, tool), Histogram()).add(histogram)
+        return merged
+
+    def close_room(self, agent: str, room: str):
+        """Fold a finished session's histograms into the agent's room="" series.
+
+        Keeps the registry (and its Prometheus output) bounded by live rooms on
+        a long-lived worker, while per-agent totals stay monotonic.
+        """
+        if not room:
+            return
+        with self._lock:
+            for key in [k for k in self.histograms if k[0] == agent and k[1] == room]:
+                _, _, stage, tool = key
+                self.histograms.setdefault((agent, "", stage, tool), Histogram()).add(self.histograms.pop(key))
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {METRIC} Voice pipeline stage latency per turn.",
+            f"# TYPE {METRIC} histogram",
+        ]
+        with self._lock:
+            items = sorted(self.histograms.items())
+            for (agent, room, stage, tool), histogram in items:
+                labels = f'agent="{agent}",room="{room}",stage="{stage}",tool="{tool}"'
+                cumulative = 0
+                for bound, n in zip(BUCKETS, histogram.counts):
+                    cumulative += n
+                    le = "+Inf" if math.isinf(bound) else repr(bound)
+                    lines.append(f'{METRIC}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{METRIC}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{METRIC}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        for sink in self.sinks:
+            try:
+                sink.flush(self)
+            except OSError as e:
+                logger.warning(f"Failed to flush latency metrics to {type(sink).__name__}: {e}")
+
+
+def sinks_from_env(prefix: str) -> List[MetricsSink]:
+    sinks: List[MetricsSink] = []
+    if os.getenv("LATENCY_JSONL"):
+        sinks.append(JsonlSink(os.environ["LATENCY_JSONL"]))
+    if os.getenv("LATENCY_PROM_DIR"):
+        sinks.append(PrometheusTextSink(os.environ["LATENCY_PROM_DIR"], prefix))
+    return sinks
+
+
+_registry: Optional[LatencyRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def registry(prefix: str = "agent") -> LatencyRegistry:
+    """The process-wide registry, with sinks from the environment."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LatencyRegistry(sinks_from_env(prefix))
+        return _registry
+
+
+# ---------- Session wiring ----------
+
+class SessionInstrumentation:
+    """Feeds one AgentSession's metrics and tool events into the registry."""
+
+    MAX_OPEN_TURNS = 32
+
+    def __init__(self, agent: str, room: str, registry: LatencyRegistry):
+        self.agent = agent
+        self.room = room
+        self.registry = registry
+        self._turns: OrderedDict[str, Dict[str, float]] = OrderedDict()
+
+    def attach(self, session) -> "SessionInstrumentation":
+        session.on("metrics_collected", lambda ev: self.on_metrics(ev.metrics))
+        session.on("function_tools_executed", self.on_tools_executed)
+        session.on("close", lambda ev: self.close())
+        return self
+
+    def close(self):
+        """Log the session's summary, then fold its histograms out of the per-room series."""
+        self.log_summary()
+        self.registry.close_room(self.agent, self.room)
+
+    def _observe(self, stage: str, value: float, tool: str = "", speech_id: Optional[str] = None):
+        self.registry.observe(
+            Sample(self.agent, self.room, stage, value, tool, speech_id, time.time())
+        )
+        if speech_id and not tool:
+            turn = self._turns.setdefault(speech_id, {})
+            turn.setdefault(stage, value)
+            while len(self._turns) > self.MAX_OPEN_TURNS:
+                self._turns.popitem(last=False)
+
+    def on_metrics(self, m):
+        kind = getattr(m, "type", "")
+        speech_id = getattr(m, "speech_id", None)
+        if kind == "eou_metrics":
+            if m.end_of_utterance_delay > 0:
+                self._observe("eou_delay", m.end_of_utterance_delay, speech_id=speech_id)
+            if m.transcription_delay > 0:
+                self._observe("stt_latency", m.transcription_delay, speech_id=speech_id)
+        elif kind == "stt_metrics":
+            # Streaming STT reports a duration of 0; its latency comes from EOU metrics.
+            if not m.streamed and m.duration > 0:
+                self._observe("stt_latency", m.duration)
+        elif kind == "llm_metrics":
+            if not m.cancelled and m.ttft >= 0:
+                self._observe("llm_ttft", m.ttft, speech_id=speech_id)
+        elif kind == "tts_metrics":
+            if not m.cancelled and m.ttfb >= 0:
+                self._observe("tts_ttfb", m.ttfb, speech_id=speech_id)
+                self._log_turn(speech_id)
+
+    def on_tools_executed(self, ev):
+        for call, output in ev.zipped():
+            if output is None:
+                continue
+            self._observe("tool_time", max(0.0, output.created_at - call.created_at), tool=call.name)
+
+    def _log_turn(self, speech_id: Optional[str]):
+        turn = self._turns.pop(speech_id, None) if speech_id else None
+        if not turn:
+            return
+        parts = " ".join(f"{stage}={turn[stage] * 1000:.0f}ms" for stage in STAGES if stage in turn)
+        logger.info(f"{self.agent} turn {speech_id}: {parts}")
+
+    def log_summary(self):
+        merged = self.registry.merged(self.agent, self.room)
+        if not merged:
+            return
+        parts = []
+        for (stage, tool), histogram in sorted(merged.items()):
+            label = f"{stage}[{tool}]" if tool else stage
+            parts.append(
+                f"{label} n={histogram.count} avg={histogram.sum / histogram.count * 1000:.0f}ms "
+                f"p95<={histogram.quantile(0.95)}s"
+            )
+        logger.info(f"{self.agent} latency for room {self.room}: " + "; ".join(parts))
+
+
+FLUSH_INTERVAL = 15.0
+
+_flusher: Optional[asyncio.Task] = None
+_flusher_jobs = 0
+_flusher_lock = threading.Lock()
+
+
+def instrument_session(session, ctx, agent: str) -> SessionInstrumentation:
+    """Attach latency instrumentation to `session`; sinks flush periodically and on shutdown.
+
+    The registry is process-wide, so every job in the process shares one
+    periodic flush (and one slow-tool report from tool_timing); each session
+    only adds and folds away its own room's series.
+    """
+    global _flusher, _flusher_jobs
+    reg = registry(agent)
+    instrumentation = SessionInstrumentation(agent, ctx.room.name, reg).attach(session)
+
+    async def periodic_flush():
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await asyncio.to_thread(reg.flush)
+
+    with _flusher_lock:
+        _flusher_jobs += 1
+        if reg.sinks and (_flusher is None or _flusher.done()):
+            _flusher = asyncio.create_task(periodic_flush())
+
+    async def flush_latency_metrics():
+        global _flusher, _flusher_jobs
+        with _flusher_lock:
+            _flusher_jobs -= 1
+            if _flusher_jobs == 0 and _flusher is not None:
+                _flusher.cancel()
+                _flusher = None
+        reg.flush()
+
+    ctx.add_shutdown_callback(flush_latency_metrics)
+    start_tool_report(ctx)
+    return instrumentation
+
+
+# ---------- Local Prometheus endpoint ----------
+
+def merge_prometheus_files(directory: str, max_age: float = 3600.0) -> str:
+    """Concatenate recent .prom files, keeping each HELP/TYPE line once."""
+    seen = set()
+    out: List[str] = []
+    cutoff = time.time() - max_age
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not name.endswith(".prom") or os.path.getmtime(path) < cutoff:
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f.read().splitlines():
+                if line.startswith("#"):
+                    if line in seen:
+                        continue
+                    seen.add(line)
+                out.append(line)
+    return "\n".join(out) + "\n"
+
+
+def main():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    parser = argparse.ArgumentParser(description="Latency metrics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Serve the workers' .prom files at /metrics")
+    serve.add_argument("--dir", default=os.getenv("LATENCY_PROM_DIR", "metrics/prom"))
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9464)
+    serve.add_argument("--max-age", type=float, default=3600.0, help="ignore files older than this (seconds)")
+    args = parser.parse_args()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = merge_prometheus_files(args.dir, args.max_age).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    os.makedirs(args.dir, exist_ok=True)
+    print(f"Serving {args.dir} at http://{args.host}:{args.port}/metrics")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
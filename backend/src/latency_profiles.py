@@ -0,0 +1,220 @@
+"""Named latency profiles for agent sessions.
+
+A profile bundles the settings that decide how quickly an agent starts
+talking after the user stops: how LLM text is chunked before it goes to TTS
+(whole sentences or clauses), whether the reply is generated preemptively,
+and how the end of the user's turn is detected (VAD, the multilingual turn
+detector, or STT endpointing alone).
+
+Each agent has a default profile. Override it per agent with
+LATENCY_PROFILE_<AGENT>, e.g. LATENCY_PROFILE_FRAUD=clause_stt, and compare the
+time-to-first-audio that FirstAudioRecorder logs for each profile.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from livekit.agents import tokenize
+from livekit.agents.tokenize import (
+    BufferedSentenceStream,
+    SentenceStream,
+    SentenceTokenizer,
+)
+
+# Imported at module level so `download-files` fetches the turn detector model
+# for every agent that uses profiles.
+from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+logger = logging.getLogger("latency")
+
+
+# ---------- Chunking ----------
+
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:\u2014\u2013])\s+")  # em and en dashes
+_sentences = tokenize.basic.SentenceTokenizer(min_sentence_len=1)
+
+
+def split_clauses(text: str, min_clause_len: int = 12) -> List[Union[Tuple[str, int, int], str]]:
+    """Split text into sentences, then sentences into clauses at , ; : and dashes.
+
+    Clauses shorter than `min_clause_len` are merged into the next one so TTS
+    is not handed two-word fragments. Offsets index into `text`.
+    """
+    pieces: List[Tuple[str, int, int]] = []
+    cursor = 0
+    for sentence in _sentences.tokenize(text):
+        for clause in _CLAUSE_BREAK.split(sentence):
+            start = text.find(clause, cursor)
+            if start < 0:
+                # The sentence splitter rewrote whitespace; fall back to sentence-level chunks.
+                return tokenize.basic.SentenceTokenizer(min_sentence_len=min_clause_len).tokenize(text)
+            cursor = start + len(clause)
+            pieces.append((clause, start, cursor))
+
+    merged: List[Tuple[str, int, int]] = []
+    buffer: Optional[Tuple[str, int, int]] = None
+    for clause, start, end in pieces:
+        if buffer is not None:
+            clause, start = f"{buffer[0]} {clause}", buffer[1]
+        if len(clause) < min_clause_len:
+            buffer = (clause, start, end)
+            continue
+        merged.append((clause, start, end))
+        buffer = None
+    if buffer is not None:
+        merged.append(buffer)
+    return merged
+
+
+class ClauseTokenizer(SentenceTokenizer):
+    """Streams clause-sized chunks to TTS instead of whole sentences."""
+
+    def __init__(self, *, min_clause_len: int = 12, stream_context_len: int = 10):
+        self.min_clause_len = min_clause_len
+        self.stream_context_len = stream_context_len
+
+    def _split(self, text: str) -> List[Union[Tuple[str, int, int], str]]:
+        return split_clauses(text, self.min_clause_len)
+
+    def tokenize(self, text: str, *, language: Optional[str] = None) -> List[str]:
+        return [piece[0] if isinstance(piece, tuple) else piece for piece in self._split(text)]
+
+    def stream(self, *, language: Optional[str] = None) -> SentenceStream:
+        return BufferedSentenceStream(
+            tokenizer=self._split,
+            min_token_len=self.min_clause_len,
+            min_ctx_len=self.stream_context_len,
+        )
+
+
+# ---------- Profiles ----------
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    name: str
+    chunking: str = "default"  # default (the TTS plugin's own) | sentence | clause
+    min_chunk_len: int = 20
+    preemptive_generation: bool = False
+    vad: bool = True
+    turn_detection: str = "vad"  # vad | multilingual | stt
+
+    def tokenizer(self) -> Optional[SentenceTokenizer]:
+        if self.chunking == "sentence":
+            return tokenize.basic.SentenceTokenizer(min_sentence_len=self.min_chunk_len)
+        if self.chunking == "clause":
+            return ClauseTokenizer(min_clause_len=self.min_chunk_len)
+        return None
+
+    def tts_options(self) -> Dict:
+        """Keyword arguments for the TTS constructor."""
+        tokenizer = self.tokenizer()
+        return {"tokenizer": tokenizer} if tokenizer is not None else {}
+
+    def session_options(self, vad=None) -> Dict:
+        """Keyword arguments for AgentSession; `vad` is the prewarmed silero VAD."""
+        if self.turn_detection == "multilingual":
+            turn_detection = MultilingualModel()
+        else:
+            turn_detection = self.turn_detection
+        return {
+            "vad": vad if self.vad else None,
+            "turn_detection": turn_detection,
+            "preemptive_generation": self.preemptive_generation,
+        }
+
+
+PROFILES: Dict[str, LatencyProfile] = {
+    profile.name: profile
+    for profile in (
+        LatencyProfile("vad"),
+        LatencyProfile("multilingual", turn_detection="multilingual"),
+        LatencyProfile("multilingual_preemptive", turn_detection="multilingual", preemptive_generation=True),
+        LatencyProfile(
+            "clause_multilingual", chunking="clause", min_chunk_len=12,
+            turn_detection="multilingual", preemptive_generation=True,
+        ),
+        LatencyProfile(
+            "sentence_stt", chunking="sentence", min_chunk_len=2,
+            preemptive_generation=True, vad=False, turn_detection="stt",
+        ),
+        LatencyProfile(
+            "clause_stt", chunking="clause", min_chunk_len=12,
+            preemptive_generation=True, vad=False, turn_detection="stt",
+        ),
+    )
+}
+
+# What each agent ran with before profiles existed.
+AGENT_DEFAULTS = {
+    "fraud": "sentence_stt",
+    "grocery": "vad",
+    "wellness": "multilingual",
+    "coach": "multilingual_preemptive",
+}
+
+
+def latency_profile(agent: str) -> LatencyProfile:
+    name = os.getenv(f"LATENCY_PROFILE_{agent.upper()}") or AGENT_DEFAULTS.get(agent, "vad")
+    if name not in PROFILES:
+        logger.warning(f"Unknown latency profile {name!r} for {agent}; using {AGENT_DEFAULTS.get(agent, 'vad')}")
+        name = AGENT_DEFAULTS.get(agent, "vad")
+    return PROFILES[name]
+
+
+# ---------- Measurement ----------
+
+class FirstAudioRecorder:
+    """Time from the end of the user's turn to the agent's first audio, per turn.
+
+    The turn ends when the user stops speaking (VAD) or, for profiles without
+    VAD, when the final transcript arrives. The agent entering the "speaking"
+    state marks first audio.
+    """
+
+    def __init__(self, agent: str, profile: LatencyProfile):
+        self.agent = agent
+        self.profile = profile
+        self.samples: List[float] = []
+        self._turn_ended: Optional[float] = None
+
+    def attach(self, session) -> "FirstAudioRecorder":
+        session.on("user_state_changed", self._on_user_state)
+        session.on("user_input_transcribed", self._on_transcript)
+        session.on("agent_state_changed", self._on_agent_state)
+        session.on("close", lambda ev: self.log_summary())
+        return self
+
+    def _on_user_state(self, ev):
+        if ev.old_state == "speaking" and ev.new_state == "listening":
+            self._turn_ended = ev.created_at
+        elif ev.new_state == "speaking":
+            self._turn_ended = None
+
+    def _on_transcript(self, ev):
+        if ev.is_final and not self.profile.vad:
+            self._turn_ended = ev.created_at
+
+    def _on_agent_state(self, ev):
+        if ev.new_state != "speaking" or self._turn_ended is None:
+            return
+        ttfa = ev.created_at - self._turn_ended
+        self._turn_ended = None
+        self.samples.append(ttfa)
+        logger.info(f"{self.agent} [{self.profile.name}] time to first audio: {ttfa * 1000:.0f} ms")
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def log_summary(self):
+        if not self.samples:
+            return
+        logger.info(
+            f"{self.agent} [{self.profile.name}] time to first audio over {len(self.samples)} turns: "
+            f"p50 {self.percentile(0.5) * 1000:.0f} ms, p95 {self.percentile(0.95) * 1000:.0f} ms"
+        )
@@ -0,0 +1,200 @@
+"""Per-learner review state and an SM-2 spaced-repetition scheduler for the coach.
+
+Each (learner, concept) pair keeps SM-2 state: repetitions, interval, ease
+factor and when it is next due. Teach-back scores (0-10) are mapped to SM-2
+quality (0-5) and update that state. `ReviewScheduler` keeps reviewed
+concepts in a min-heap by due time and takes unseen ones lazily, in library
+order, so picking the next concept or recording a score is O(log n) with no
+LLM call, and a session holds only what the learner has reviewed, however
+large the library.
+
+    store = LearnerStore()
+    scheduler = ReviewScheduler(library.iter_ids(), store.load(user), exists=library.get)
+    concept_id = scheduler.next()
+    state = scheduler.record(concept_id, score=7)
+    store.save(user, state)
+"""
+
+import heapq
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DB_PATH = os.getenv("LEARNER_DB", os.path.join(BACKEND_DIR, "learners.db"))
+
+DAY = 86400.0
+MIN_EASE = 1.3
+
+
+@dataclass
+class ConceptState:
+    concept_id: str
+    repetitions: int = 0
+    interval_days: float = 0.0
+    ease: float = 2.5
+    due: float = 0.0  # epoch seconds; 0 means never reviewed, due now
+    last_score: Optional[int] = None
+    reviews: int = 0
+
+
+def quality(score: float) -> int:
+    """Map a 0-10 teach-back score to SM-2 quality 0-5."""
+    return max(0, min(5, int(score / 2 + 0.5)))
+
+
+def sm2(state: ConceptState, score: float, now: float) -> ConceptState:
+    """Apply one review to `state` (in place) using the SM-2 rules."""
+    q = quality(score)
+    if q < 3:
+        state.repetitions = 0
+        state.interval_days = 1.0
+    else:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval_days = 1.0
+        elif state.repetitions == 2:
+            state.interval_days = 6.0
+        else:
+            state.interval_days = round(state.interval_days * state.ease, 1)
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    state.due = now + state.interval_days * DAY
+    state.last_score = round(score)
+    state.reviews += 1
+    return state
+
+
+class ReviewScheduler:
+    """Due reviews first, then unseen concepts in library order, then the next review coming up.
+
+    Reviewed concepts sit in a heap of (due, concept_id); an entry superseded
+    by a later review is skipped lazily, and so is a concept `exists` no
+    longer finds (removed from the library since it was reviewed).
+    `concept_ids` is consumed only as far as unseen concepts are actually
+    needed.
+    """
+
+    def __init__(
+        self,
+        concept_ids: Iterable[str],
+        states: Optional[Dict[str, ConceptState]] = None,
+        exists: Optional[Callable[[str], object]] = None,
+    ):
+        self.states: Dict[str, ConceptState] = dict(states or {})
+        self._heap: List[Tuple[float, str]] = [(s.due, cid) for cid, s in self.states.items() if s.reviews]
+        heapq.heapify(self._heap)
+        self._ids = iter(concept_ids)
+        self._unseen: Deque[str] = deque()
+        self._exists = exists
+
+    def _peek_reviewed(self, count: int) -> List[Tuple[float, str]]:
+        """The `count` soonest-due reviewed concepts, leaving the heap as it was (minus stale entries)."""
+        taken: List[Tuple[float, str]] = []
+        while self._heap and len(taken) < count:
+            due, concept_id = heapq.heappop(self._heap)
+            if self.states[concept_id].due == due and (self._exists is None or self._exists(concept_id)):
+                taken.append((due, concept_id))
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return taken
+
+    def _peek_unseen(self, count: int) -> List[str]:
+        while self._unseen and self._unseen[0] in self.states:
+            self._unseen.popleft()
+        while len(self._unseen) < count:
+            concept_id = next(self._ids, None)
+            if concept_id is None:
+                break
+            if concept_id not in self.states:
+                self._unseen.append(concept_id)
+        return [cid for cid in list(self._unseen)[:count] if cid not in self.states]
+
+    def next(self, exclude: Optional[str] = None, now: Optional[float] = None) -> Optional[str]:
+        """The concept to study next, optionally skipping `exclude` (e.g. the one just reviewed)."""
+        now = time.time() if now is None else now
+        reviewed = self._peek_reviewed(2)
+        order = [cid for due, cid in reviewed if due <= now] + self._peek_unseen(2)
+        order += [cid for due, cid in reviewed if due > now]
+        return next((cid for cid in order if cid != exclude), None)
+
+    def due(self, now: Optional[float] = None) -> bool:
+        """Whether a review is due (unseen concepts do not count)."""
+        reviewed = self._peek_reviewed(1)
+        return bool(reviewed) and reviewed[0][0] <= (time.time() if now is None else now)
+
+    def record(self, concept_id: str, score: float, now: Optional[float] = None) -> ConceptState:
+        state = self.states.get(concept_id)
+        if state is None:
+            state = self.states[concept_id] = ConceptState(concept_id)
+        sm2(state, score, time.time() if now is None else now)
+        heapq.heappush(self._heap, (state.due, concept_id))
+        return state
+
+
+class LearnerStore:
+    """Review state for every learner, one row per (learner, concept), in SQLite (WAL mode)."""
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS concept_state (
+                learner TEXT NOT NULL,
+                concept_id TEXT NOT NULL,
+                repetitions INTEGER NOT NULL,
+                interval_days REAL NOT NULL,
+                ease REAL NOT NULL,
+                due REAL NOT NULL,
+                last_score INTEGER,
+                reviews INTEGER NOT NULL,
+                PRIMARY KEY (learner, concept_id)
+            )
+            """
+        )
+
+    def load(self, learner: str) -> Dict[str, ConceptState]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT concept_id, repetitions, interval_days, ease, due, last_score, reviews "
+                "FROM concept_state WHERE learner=?",
+                (learner,),
+            ).fetchall()
+        return {row[0]: ConceptState(*row) for row in rows}
+
+    def save(self, learner: str, state: ConceptState):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO concept_state "
+                "(learner, concept_id, repetitions, interval_days, ease, due, last_score, reviews) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    learner, state.concept_id, state.repetitions, state.interval_days,
+                    state.ease, state.due, state.last_score, state.reviews,
+                ),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[LearnerStore] = None
+_store_lock = threading.Lock()
+
+
+def learner_store() -> LearnerStore:
+    """The process-wide store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LearnerStore()
+        return _store
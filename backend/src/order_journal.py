@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from order_store import OrderStore, normalize_order
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger("order-journal")
+
+
+class OrderJournal(OrderStore):
+    """Append-only order log on top of a JSON snapshot.
+
+    The snapshot is the existing `orders.json` array; every change after it is
+    one line in `<snapshot>.jsonl`:
+
+        {"op": "add", "order": {...}}
+        {"op": "update", "id": "...", "fields": {...}}
+
+    Appends are a single write to the log, fsynced every `sync_every` records
+    or `sync_interval` seconds. Once the log holds `compact_every` records it is
+    folded back into the snapshot with an atomic rename.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        journal_path: Optional[str] = None,
+        sync_every: int = 32,
+        sync_interval: float = 1.0,
+        compact_every: int = 1000,
+    ):
+        super().__init__()
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".jsonl"
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+
+        self._lock = threading.RLock()
+        self._orders: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._offset = 0  # bytes of the journal already applied
+        self._snapshot_mtime = None
+        self._records = 0  # records currently in the journal
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file_locked = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        # Held for the store's lifetime (appends, fsync and flock go through it); released in close().
+        self._fh = open(self.journal_path, "a+", encoding="utf-8")  # noqa: SIM115
+        try:
+            with self._file_lock(exclusive=False):
+                self._reload()
+        except BaseException:
+            self._fh.close()
+            raise
+
+    # --- Loading ---
+
+    def _reload(self):
+        self._orders = []
+        self._by_id = {}
+        self._offset = 0
+        self._records = 0
+        self._snapshot_mtime = self._stat_snapshot()
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = []
+        for order in data if isinstance(data, list) else []:
+            self._add(order)
+        self._catch_up()
+
+    def _catch_up(self):
+        """Apply records appended since the last read, including other processes' writes.
+
+        Runs under a shared flock so it never reads a journal another process
+        is compacting; writers already hold the exclusive lock.
+        """
+        with self._file_lock(exclusive=False):
+            self._read_new()
+
+    def _read_new(self):
+        size = os.fstat(self._fh.fileno()).st_size
+        if size < self._offset or self._stat_snapshot() != self._snapshot_mtime:
+            # Another process compacted the journal underneath us.
+            self._reload()
+            return
+        if size == self._offset:
+            return
+
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        # Only consume complete lines; a torn tail is picked up on the next read.
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.warning(f"Skipping corrupt journal record: {e}")
+            self._records += 1
+        self._offset += end
+
+    def _add(self, order: Dict):
+        order = normalize_order(order)
+        self._orders.append(order)
+        self._by_id[order["id"]] = order
+        self._notify(order)
+
+    def _apply(self, record: Dict):
+        if record["op"] == "add":
+            self._add(record["order"])
+        elif record["op"] == "update":
+            order = self._by_id.get(record["id"])
+            if order is not None:
+                order.update(record["fields"])
+
+    # --- Reads ---
+
+    def orders(self) -> List[Dict]:
+        with self._lock:
+            self._catch_up()
+            return list(self._orders)
+
+    def recent(self, count: int) -> List[Dict]:
+        with self._lock:
+            self._catch_up()
+            return self._orders[-count:] if count > 0 else []
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._catch_up()
+            return self._by_id.get(order_id)
+
+    def subscribe(self, listener: Callable[[Dict], None]):
+        with self._lock:
+            self._catch_up()
+            super().subscribe(listener)
+
+    # --- Writes ---
+
+    def append(self, order: Dict):
+        self._write({"op": "add", "order": normalize_order(order)})
+
+    def update(self, order_id: str, **fields):
+        self._write({"op": "update", "id": order_id, "fields": fields})
+
+    def _write(self, record: Dict):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            with self._file_lock(exclusive=True):
+                self._catch_up()
+                os.write(self._fh.fileno(), line)
+                self._offset += len(line)
+                self._records += 1
+                self._apply(record)
+
+            self._unsynced += 1
+            if (
+                self._unsynced >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval
+            ):
+                self.flush()
+            if self._records >= self.compact_every:
+                self.compact()
+
+    def flush(self):
+        """fsync any appended records that are not yet durable."""
+        with self._lock:
+            if self._unsynced:
+                os.fsync(self._fh.fileno())
+                self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate the log."""
+        with self._lock:
+            with self._file_lock(exclusive=True):
+                self._catch_up()
+                tmp_path = f"{self.snapshot_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(self._orders, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+                os.ftruncate(self._fh.fileno(), 0)
+                os.fsync(self._fh.fileno())
+                self._snapshot_mtime = self._stat_snapshot()
+                self._offset = 0
+                self._records = 0
+                self._unsynced = 0
+            logger.info(f"Compacted {len(self._orders)} orders into {self.snapshot_path}")
+
+    def close(self):
+        with self._lock:
+            if self._fh.closed:
+                return
+            try:
+                self.flush()
+            finally:
+                self._fh.close()
+
+    def _stat_snapshot(self):
+        try:
+            return os.stat(self.snapshot_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """flock the journal against other processes; nested uses keep the lock already held."""
+        if fcntl is None or self._file_locked:
+            yield
+            return
+        fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._file_locked = True
+        try:
+            yield
+        finally:
+            self._file_locked = False
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+
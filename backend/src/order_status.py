@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from order_store import OrderStore
+
+# Seconds after placement at which an order moves to each status.
+STATUS_THRESHOLDS: List[Tuple[int, str]] = [
+    (30, "being_prepared"),
+    (60, "out_for_delivery"),
+    (90, "delivered"),
+]
+STATUS_RANK = {"received": 0, **{status: i + 1 for i, (_, status) in enumerate(STATUS_THRESHOLDS)}}
+FINAL_STATUS = STATUS_THRESHOLDS[-1][1]
+
+
+def status_for_elapsed(elapsed: float, current: str = "received") -> str:
+    status = current
+    for threshold, candidate in STATUS_THRESHOLDS:
+        if elapsed > threshold and STATUS_RANK[candidate] > STATUS_RANK.get(status, 0):
+            status = candidate
+    return status
+
+
+def _next_threshold(status: str) -> Optional[int]:
+    rank = STATUS_RANK.get(status, 0)
+    for threshold, candidate in STATUS_THRESHOLDS:
+        if STATUS_RANK[candidate] > rank:
+            return threshold
+    return None
+
+
+class OrderStatusEngine:
+    """Advances mock order statuses from a heap of upcoming transitions.
+
+    Each open order sits in the heap once, keyed by the time of its next
+    threshold. `advance` only pops orders whose threshold has passed, so its
+    cost is proportional to the number of transitions, not to the history.
+    Delivered orders are never scheduled again.
+    """
+
+    def __init__(self, store: OrderStore):
+        self.store = store
+        self._heap: List[Tuple[float, int, str, float]] = []  # (due, seq, order id, placed at)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._pending: List[Dict] = []  # orders seen by the store but not yet scheduled
+        self._scheduled: Dict[str, float] = {}  # order id -> due time in the heap
+        store.subscribe(self._pending.append)
+
+    def _schedule(self, order_id: str, placed_at: float, status: str):
+        threshold = _next_threshold(status)
+        if threshold is None:
+            self._scheduled.pop(order_id, None)
+            return
+        due = placed_at + threshold
+        if self._scheduled.get(order_id) == due:
+            return
+        self._scheduled[order_id] = due
+        heapq.heappush(self._heap, (due, next(self._seq), order_id, placed_at))
+
+    def _drain_pending(self):
+        while self._pending:
+            order = self._pending.pop()
+            if order.get("status") == FINAL_STATUS:
+                continue
+            placed_at = datetime.fromisoformat(order["timestamp"]).timestamp()
+            self._schedule(order["id"], placed_at, order.get("status", "received"))
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Apply every transition that is due; returns how many orders changed."""
+        now = time.time() if now is None else now
+        changed = 0
+        with self._lock:
+            self._drain_pending()
+            while self._heap and self._heap[0][0] < now:
+                due, _, order_id, placed_at = heapq.heappop(self._heap)
+                if self._scheduled.get(order_id) != due:
+                    continue  # superseded entry
+                del self._scheduled[order_id]
+
+                order = self.store.get(order_id)
+                if order is None:
+                    continue
+                status = status_for_elapsed(now - placed_at, order["status"])
+                if status != order["status"]:
+                    self.store.update(order_id, status=status)
+                    changed += 1
+                self._schedule(order_id, placed_at, status)
+                self._drain_pending()
+        return changed
+
+    def recent(self, count: int) -> List[Dict]:
+        self.advance()
+        return self.store.recent(count)
+
+
+_engines: "weakref.WeakKeyDictionary[OrderStore, OrderStatusEngine]" = weakref.WeakKeyDictionary()
+_engines_lock = threading.Lock()
+
+
+def status_engine(store: OrderStore) -> OrderStatusEngine:
+    """Shared status engine for `store`, so sessions don't rebuild the heap."""
+    with _engines_lock:
+        engine = _engines.get(store)
+        if engine is None:
+            engine = _engines[store] = OrderStatusEngine(store)
+        return engine
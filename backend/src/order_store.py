@@ -0,0 +1,347 @@
+"""Grocery order storage shared by agent.StoreManager and grocery_tools.OrderManager.
+
+The backend is picked by configuration, so agent code never changes when
+moving to a faster store:
+
+    ORDER_STORE_BACKEND = json | journal | sqlite   (default: journal)
+    ORDERS_PATH         = path of the orders.json snapshot
+
+Existing orders.json files can be imported into any backend with:
+
+    uv run python src/order_store.py migrate --backend sqlite
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger("order-store")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ORDERS_PATH = os.path.abspath(os.path.join(SCRIPT_DIR, "..", "shared-data", "orders.json"))
+BACKENDS = ("json", "journal", "sqlite")
+
+
+def normalize_order(order: Dict) -> Dict:
+    """Bring an order from either legacy schema into the shared one.
+
+    Orders are keyed by `id` (older grocery_tools orders used `order_id`), and
+    `items` is a list of {"id", "quantity", ...} lines (older agent orders used
+    an {item_id: quantity} map).
+    """
+    if "id" not in order and "order_id" in order:
+        order = {"id": order["order_id"], **{k: v for k, v in order.items() if k != "order_id"}}
+    if isinstance(order.get("items"), dict):
+        order = {**order, "items": [{"id": k, "quantity": v} for k, v in order["items"].items()]}
+    return order
+
+
+def new_order(items: List[Dict], total: float) -> Dict:
+    now = datetime.now()
+    return {
+        # The random suffix keeps ids unique when several orders land in the same second.
+        "id": f"ORD-{int(now.timestamp())}-{uuid.uuid4().hex[:8]}",
+        "timestamp": now.isoformat(),
+        "items": items,
+        "total": round(total, 2),
+        "status": "received",
+    }
+
+
+class OrderStore(ABC):
+    """Interface every order backend implements."""
+
+    def __init__(self):
+        self._listeners: List[Callable[[Dict], None]] = []
+
+    @abstractmethod
+    def append(self, order: Dict):
+        ...
+
+    @abstractmethod
+    def update(self, order_id: str, **fields):
+        """Change fields of a stored order. Listeners are not called; see `subscribe`."""
+
+    @abstractmethod
+    def get(self, order_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def recent(self, count: int) -> List[Dict]:
+        """The last `count` orders, oldest first."""
+
+    @abstractmethod
+    def orders(self) -> List[Dict]:
+        ...
+
+    def subscribe(self, listener: Callable[[Dict], None]):
+        """Call `listener` for every known order now and for every order added later.
+
+        Every backend reports additions only, including orders other processes
+        add; updates are never notified, so status watchers read the current
+        status with `get`. Listeners may run under the store's lock, so they
+        must not call back into it.
+        """
+        self._listeners.append(listener)
+        for order in self.orders():
+            listener(order)
+
+    def _notify(self, order: Dict):
+        for listener in self._listeners:
+            listener(order)
+
+    def flush(self):  # noqa: B027 - optional hook, a no-op for stores that write through
+        """Make every accepted write durable. Stores that sync on every write need not override it."""
+
+    def close(self):
+        self.flush()
+
+
+class JsonFileOrderStore(OrderStore):
+    """The original orders.json array, rewritten atomically on every change.
+
+    Simple and human-readable, but each write is O(total orders).
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.RLock()
+        self._orders: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._mtime_ns = None
+        self._refresh()
+
+    def _refresh(self):
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            data = []
+        known = self._by_id
+        self._orders = [normalize_order(o) for o in data] if isinstance(data, list) else []
+        self._by_id = {o["id"]: o for o in self._orders}
+        self._mtime_ns = mtime_ns
+        for order in self._orders:
+            if order["id"] not in known:
+                self._notify(order)
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._orders, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._mtime_ns = os.stat(self.path).st_mtime_ns
+
+    def append(self, order: Dict):
+        order = normalize_order(order)
+        with self._lock:
+            self._refresh()
+            self._orders.append(order)
+            self._by_id[order["id"]] = order
+            self._save()
+            self._notify(order)
+
+    def update(self, order_id: str, **fields):
+        with self._lock:
+            self._refresh()
+            order = self._by_id.get(order_id)
+            if order is not None:
+                order.update(fields)
+                self._save()
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(order_id)
+
+    def recent(self, count: int) -> List[Dict]:
+        with self._lock:
+            self._refresh()
+            return self._orders[-count:] if count > 0 else []
+
+    def orders(self) -> List[Dict]:
+        with self._lock:
+            self._refresh()
+            return list(self._orders)
+
+    def subscribe(self, listener: Callable[[Dict], None]):
+        with self._lock:
+            super().subscribe(listener)
+
+
+class SqliteOrderStore(OrderStore):
+    """Orders in a SQLite table (WAL mode), one row per order.
+
+    Appends and updates touch a single row; `recent` reads the tail of the
+    rowid index. Rows written by other processes are picked up on the next read.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                status TEXT,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        self._seen_seq = 0
+
+    def _row(self, data: str, status: str) -> Dict:
+        order = json.loads(data)
+        order["status"] = status
+        return order
+
+    def _catch_up(self):
+        if not self._listeners:
+            return
+        rows = self._conn.execute(
+            "SELECT seq, data, status FROM orders WHERE seq > ? ORDER BY seq", (self._seen_seq,)
+        ).fetchall()
+        for seq, data, status in rows:
+            self._seen_seq = seq
+            self._notify(self._row(data, status))
+
+    def append(self, order: Dict):
+        order = normalize_order(order)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO orders (id, status, data) VALUES (?, ?, ?)",
+                (order["id"], order.get("status"), json.dumps(order)),
+            )
+            self._catch_up()
+
+    def update(self, order_id: str, **fields):
+        with self._lock:
+            order = self.get(order_id)
+            if order is None:
+                return
+            order.update(fields)
+            self._conn.execute(
+                "UPDATE orders SET status=?, data=? WHERE id=?",
+                (order.get("status"), json.dumps(order), order_id),
+            )
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data, status FROM orders WHERE id=?", (order_id,)).fetchone()
+            return self._row(*row) if row else None
+
+    def recent(self, count: int) -> List[Dict]:
+        with self._lock:
+            self._catch_up()
+            rows = self._conn.execute(
+                "SELECT data, status FROM orders ORDER BY seq DESC LIMIT ?", (max(count, 0),)
+            ).fetchall()
+            return [self._row(*row) for row in reversed(rows)]
+
+    def orders(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data, status FROM orders ORDER BY seq").fetchall()
+            return [self._row(*row) for row in rows]
+
+    def subscribe(self, listener: Callable[[Dict], None]):
+        with self._lock:
+            self._listeners.append(listener)
+            self._catch_up()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def store_path(backend: str, path: str) -> str:
+    """The file a backend keeps its data in, given the orders.json path."""
+    if backend == "sqlite":
+        return os.path.splitext(path)[0] + ".db"
+    return path
+
+
+def create_order_store(backend: str, path: str) -> OrderStore:
+    if backend == "json":
+        return JsonFileOrderStore(path)
+    if backend == "journal":
+        from order_journal import OrderJournal
+        return OrderJournal(path)
+    if backend == "sqlite":
+        return SqliteOrderStore(store_path(backend, path))
+    raise ValueError(f"Unknown order store backend '{backend}', expected one of {BACKENDS}")
+
+
+_stores: Dict[tuple, OrderStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_order_store(path: Optional[str] = None, backend: Optional[str] = None) -> OrderStore:
+    """Shared order store for this worker process, configured from the environment."""
+    backend = backend or os.getenv("ORDER_STORE_BACKEND", "journal")
+    path = os.path.abspath(path or os.getenv("ORDERS_PATH", DEFAULT_ORDERS_PATH))
+    with _stores_lock:
+        store = _stores.get((backend, path))
+        if store is None:
+            store = _stores[(backend, path)] = create_order_store(backend, path)
+            if backend == "sqlite" and not store.recent(1) and os.path.exists(path):
+                logger.info(f"Importing {path} into {store_path(backend, path)}")
+                migrate_orders(path, store)
+        return store
+
+
+def migrate_orders(source_path: str, store: OrderStore) -> int:
+    """Copy orders from a legacy orders.json array into `store`; returns how many were added."""
+    with open(source_path) as f:
+        data = json.load(f)
+    added = 0
+    for order in data if isinstance(data, list) else []:
+        order = normalize_order(order)
+        if store.get(order["id"]) is None:
+            store.append(order)
+            added += 1
+    store.flush()
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order store maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Import an orders.json file into a backend")
+    migrate.add_argument("--backend", choices=BACKENDS, required=True)
+    migrate.add_argument("--source", default=DEFAULT_ORDERS_PATH)
+    migrate.add_argument("--path", default=None, help="orders.json path the backend is configured with")
+    args = parser.parse_args()
+
+    target = os.path.abspath(args.path or os.getenv("ORDERS_PATH", DEFAULT_ORDERS_PATH))
+    if args.backend != "sqlite" and os.path.abspath(args.source) == target:
+        print(f"{args.backend} backend already reads {target} directly; nothing to migrate.")
+        return
+    store = create_order_store(args.backend, target)
+    added = migrate_orders(args.source, store)
+    store.close()
+    print(f"Migrated {added} orders into {store_path(args.backend, target)} ({args.backend})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Async file persistence that keeps disk I/O off the event loop.
+
+Every room in a worker process shares one event loop, so a tool that does a
+blocking `json.dump` stalls audio for all of them. The helpers here run file
+work on a dedicated I/O thread pool, serialize writers to the same file with
+a per-path lock, and write through a temp file + rename so readers never see
+a half-written file.
+
+    await save_json(path, data, indent=2)
+    data = await load_json(path, default=[])
+    await update_json(path, lambda history: history + [entry], default=[])
+    await run_io(store.append, order)   # any other blocking call
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+IO_WORKERS = int(os.getenv("IO_WORKERS", "4"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_lock = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="agent-io")
+        return _executor
+
+
+def path_lock(path: str) -> threading.Lock:
+    """The lock serializing writers to `path` within this process."""
+    key = os.path.realpath(path)
+    with _path_locks_lock:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = _path_locks[key] = threading.Lock()
+        return lock
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs):
+    """Write `data` as JSON to a temp file in the same directory, fsync, then rename over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def _locked_write(path: str, data: Any, dump_kwargs: Dict):
+    with path_lock(path):
+        atomic_write_json(path, data, **dump_kwargs)
+
+
+def _locked_update(path: str, update: Callable[[Any], Any], default: Any, dump_kwargs: Dict) -> Any:
+    with path_lock(path):
+        data = update(read_json(path, default))
+        atomic_write_json(path, data, **dump_kwargs)
+        return data
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call on the I/O thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def load_json(path: str, default: Any = None) -> Any:
+    return await run_io(read_json, path, default)
+
+
+async def save_json(path: str, data: Any, **dump_kwargs):
+    await run_io(_locked_write, path, data, dump_kwargs)
+
+
+async def update_json(path: str, update: Callable[[Any], Any], default: Any = None, **dump_kwargs) -> Any:
+    """Read-modify-write `path` under its lock; `update` gets the current data and returns the new data."""
+    return await run_io(_locked_update, path, update, default, dump_kwargs)
@@ -0,0 +1,94 @@
+import json
+import logging
+import math
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger("recipes")
+
+
+@dataclass(frozen=True)
+class RecipeLine:
+    item: Mapping
+    quantity: float  # units for the recipe's base servings
+
+
+@dataclass(frozen=True)
+class CompiledRecipe:
+    """A recipe whose ingredients are already resolved to catalog items."""
+    name: str
+    servings: int
+    lines: Tuple[RecipeLine, ...]
+
+    def bundle(self, servings: Optional[int] = None) -> List[Tuple[Mapping, int]]:
+        """(item, quantity) pairs for `servings`, rounded up to whole units."""
+        scale = (servings or self.servings) / self.servings
+        return [(line.item, max(1, math.ceil(line.quantity * scale))) for line in self.lines]
+
+
+class RecipeBook:
+    def __init__(self, recipes: Dict[str, CompiledRecipe]):
+        # Longest names first so "fruit salad" wins over a shorter key it contains
+        self.recipes = dict(sorted(recipes.items(), key=lambda kv: -len(kv[0])))
+
+    @classmethod
+    def compile(cls, raw: Dict, snapshot) -> "RecipeBook":
+        """Resolve every ingredient against a catalog snapshot.
+
+        Recipes are curated data, so an ingredient must name a catalog id or an
+        item's exact name. Anything else is logged, with the closest catalog
+        item as a hint, and left out of the bundle rather than bound to
+        whatever happens to sound similar.
+        """
+        recipes = {}
+        for name, spec in raw.items():
+            lines = []
+            for ingredient in spec.get("ingredients", []):
+                query = ingredient["item"]
+                item = snapshot.index.get_by_id(query) or snapshot.index.get_by_exact_name(query)
+                if item is None:
+                    guess = snapshot.matcher.best(query)
+                    hint = f" (did you mean '{guess['name']}'?)" if guess else ""
+                    logger.warning(f"Recipe '{name}': no catalog item named '{query}'{hint}")
+                    continue
+                lines.append(RecipeLine(item, ingredient.get("quantity", 1)))
+            recipes[name.lower()] = CompiledRecipe(name, spec.get("servings", 1), tuple(lines))
+        return cls(recipes)
+
+    def find(self, text: str) -> Optional[CompiledRecipe]:
+        text = text.lower()
+        return next((r for key, r in self.recipes.items() if key in text), None)
+
+    @property
+    def names(self) -> List[str]:
+        return [r.name for r in self.recipes.values()]
+
+
+def load_recipes(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+_books: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_raw: Dict[str, Tuple[int, Dict]] = {}
+_lock = threading.Lock()
+
+
+def recipe_book(snapshot, path: str) -> RecipeBook:
+    """Recipe book compiled against `snapshot`, built once per catalog version."""
+    with _lock:
+        mtime_ns = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        cached = _raw.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            cached = _raw[path] = (mtime_ns, load_recipes(path))
+            _books.clear()
+
+        book = _books.get(snapshot)
+        if book is None:
+            book = _books[snapshot] = RecipeBook.compile(cached[1], snapshot)
+        return book
@@ -0,0 +1,207 @@
+"""Local teach-back scoring for the Active Recall Coach.
+
+Grading used to be left to the LLM ("Start your feedback with Score: X/10"),
+so scores drifted between turns and every grade cost a longer response. The
+scorer compares the learner's explanation with the concept's reference text
+(summary and teach-back prompt) using two signals:
+
+- key point coverage: each summary sentence is a key point, covered when
+  enough of its keywords appear in the explanation; if the teach-back prompt
+  asks for an example, giving one is a key point too;
+- TF-IDF cosine similarity against the concept's reference vector, scaled
+  by coverage so repeating the concept's keywords earns nothing without the
+  key points. Document frequencies come from the whole library and are
+  recomputed only when it changes; concept vectors are built on first use
+  and LRU-cached.
+
+    scorer = TeachBackScorer(concept_library())
+    result = scorer.score("loops", "A for loop repeats over a list ...")
+    result.score, result.missing
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from concept_library import ConceptLibrary, concept_library
+
+# How much each signal contributes to the 0-10 score.
+COVERAGE_WEIGHT = 0.6
+SIMILARITY_WEIGHT = 0.4
+# Cosine similarity at which a paraphrase counts as fully similar.
+SIMILARITY_FULL = 0.45
+# Fraction of a key point's keywords that must appear for it to be covered.
+POINT_THRESHOLD = 0.4
+
+_WORD = re.compile(r"[a-z][a-z0-9]*")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+# An example cue ("for example", "e.g.", "such as") or code like `total = 0`.
+_EXAMPLE = re.compile(r"\b(?:for example|for instance|such as)\b|\be\.g\.|\b[a-z_]\w*\s*=\s*[^\s=]")
+STOP_WORDS = frozenset(
+    """a an the and or but if so then than that this these those it its they them their there is are was were be
+    been being to of in on at by for with from as into about over under can could would should will may might must
+    do does did done have has had you your we our i me my he she his her not no yes just also more most other some
+    any each which who whom what when where why how all both one two very much many such only own same too often
+    let lets get gets make makes like up out way thing things""".split()
+)
+
+
+def stem(word: str) -> str:
+    """A light suffix stripper: 'loops' ~ 'loop', 'repeating' ~ 'repeat', 'stored' ~ 'store'."""
+    if len(word) > 4 and word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif len(word) > 5 and word.endswith("ing"):
+        word = word[:-3]
+    elif len(word) > 4 and word.endswith("ed"):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word[:-1] if len(word) > 4 and word.endswith("e") else word
+
+
+def terms(text: str) -> List[str]:
+    return [stem(w) for w in _WORD.findall(text.lower()) if w not in STOP_WORDS]
+
+
+@dataclass
+class KeyPoint:
+    text: str
+    keywords: frozenset
+    example: bool = False
+
+
+@dataclass
+class TeachBackResult:
+    concept_id: str
+    score: int  # 0-10
+    coverage: float
+    similarity: float
+    covered: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        text = f"Score: {self.score}/10."
+        if self.missing:
+            text += " Missing key points: " + " | ".join(self.missing)
+        else:
+            text += " All key points covered."
+        return text
+
+
+@dataclass
+class _Reference:
+    vector: Dict[str, float]
+    points: List[KeyPoint]
+
+
+class TeachBackScorer:
+    """Scores explanations against a library's concepts without an LLM call."""
+
+    def __init__(self, library: ConceptLibrary, cache_size: int = 256):
+        self.library = library
+        self._idf: Optional[Dict[str, float]] = None
+        self._default_idf = 1.0  # idf of a term no concept uses
+        self._idf_lock = threading.Lock()
+        self._version = library.version
+        self._reference = lru_cache(maxsize=cache_size)(self._build_reference)
+
+    def _sync(self):
+        """Drop the IDF and cached references if the library changed since they were built."""
+        version = self.library.version
+        if version != self._version:
+            with self._idf_lock:
+                if version != self._version:
+                    self._idf = None
+                    self._reference.cache_clear()
+                    self._version = version
+
+    def idf(self) -> Dict[str, float]:
+        """Inverse document frequency over every concept's reference text, computed once per library version."""
+        self._sync()
+        with self._idf_lock:
+            if self._idf is None:
+                df: Dict[str, int] = {}
+                docs = 0
+                for concept_id in self.library.iter_ids():
+                    concept = self.library.get(concept_id)
+                    docs += 1
+                    for term in set(terms(_reference_text(concept))):
+                        df[term] = df.get(term, 0) + 1
+                self._idf = {term: math.log((1 + docs) / (1 + n)) + 1 for term, n in df.items()}
+                self._default_idf = math.log(1 + docs) + 1
+            return self._idf
+
+    def _vector(self, words: List[str]) -> Dict[str, float]:
+        idf = self.idf()
+        counts: Dict[str, int] = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        vector = {w: (1 + math.log(n)) * idf.get(w, self._default_idf) for w, n in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {w: v / norm for w, v in vector.items()}
+
+    def _build_reference(self, concept_id: str) -> Optional[_Reference]:
+        concept = self.library.get(concept_id)
+        if concept is None:
+            return None
+        points = [
+            KeyPoint(sentence, frozenset(terms(sentence)))
+            for sentence in _SENTENCE.split(concept.get("summary", "").strip())
+            if terms(sentence)
+        ]
+        if "example" in concept.get("teach_back_prompt", "").lower():
+            points.append(KeyPoint("Give a concrete example.", frozenset(), example=True))
+        return _Reference(self._vector(terms(_reference_text(concept))), points)
+
+    def score(self, concept_id: str, explanation: str) -> Optional[TeachBackResult]:
+        """Score `explanation` for `concept_id`, or None if the concept is unknown."""
+        self._sync()
+        reference = self._reference(concept_id)
+        if reference is None:
+            return None
+        words = terms(explanation)
+        present = set(words)
+
+        covered, missing = [], []
+        for point in reference.points:
+            if point.example:
+                hit = bool(_EXAMPLE.search(explanation.lower()))
+            else:
+                hit = len(point.keywords & present) / len(point.keywords) >= POINT_THRESHOLD
+            (covered if hit else missing).append(point.text)
+        coverage = len(covered) / len(reference.points) if reference.points else 0.0
+
+        vector = self._vector(words) if words else {}
+        similarity = sum((weight * reference.vector.get(w, 0.0) for w, weight in vector.items()), 0.0)
+        # Similarity only backs up covered key points; keyword stuffing alone scores 0.
+        combined = coverage * (COVERAGE_WEIGHT + SIMILARITY_WEIGHT * min(similarity / SIMILARITY_FULL, 1.0))
+        return TeachBackResult(
+            concept_id=concept_id,
+            score=round(10 * combined),
+            coverage=round(coverage, 3),
+            similarity=round(similarity, 3),
+            covered=covered,
+            missing=missing,
+        )
+
+
+def _reference_text(concept: Dict) -> str:
+    return f"{concept.get('title', '')}. {concept.get('summary', '')} {concept.get('teach_back_prompt', '')}"
+
+
+_scorer: Optional[TeachBackScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def teach_back_scorer() -> TeachBackScorer:
+    """The process-wide scorer over the process-wide concept library."""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = TeachBackScorer(concept_library())
+        return _scorer
@@ -0,0 +1,231 @@
+"""Timing for function tools: wall time, event-loop blocking time and payload size.
+
+Use `function_tool` from this module instead of livekit's; it registers the
+same tool, wrapped so every call is measured:
+
+    from tool_timing import function_tool
+
+Blocking time is the time the tool's coroutine spends actually running on
+the event loop (each step between awaits), as opposed to waiting on I/O or a
+thread. While a step runs, no room in the worker gets audio processed, so a
+step longer than TOOL_BLOCK_WARN_MS (default 50) logs a warning naming the
+tool. `start_tool_report` logs the slowest tools periodically.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from livekit.agents import function_tool as livekit_function_tool
+
+logger = logging.getLogger("tool-timing")
+
+BLOCK_WARN_SECONDS = float(os.getenv("TOOL_BLOCK_WARN_MS", "50")) / 1000
+RECENT_CALLS = 256
+
+
+class _StepTimer:
+    """Awaitable that drives a coroutine and times each step it runs on the loop."""
+
+    __slots__ = ("blocked", "coro", "max_step")
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.blocked = 0.0
+        self.max_step = 0.0
+
+    def _step(self, started: float):
+        elapsed = time.perf_counter() - started
+        self.blocked += elapsed
+        if elapsed > self.max_step:
+            self.max_step = elapsed
+
+    def __await__(self):
+        send, throw = self.coro.send, self.coro.throw
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            started = time.perf_counter()
+            try:
+                yielded = throw(error) if error is not None else send(value)
+            except StopIteration as stop:
+                self._step(started)
+                return stop.value
+            except BaseException:
+                self._step(started)
+                raise
+            self._step(started)
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class ToolTiming:
+    __slots__ = (
+        "blocked_max",
+        "blocked_total",
+        "calls",
+        "payload_max",
+        "payload_total",
+        "recent",
+        "wall_max",
+        "wall_total",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_total = 0.0
+        self.wall_max = 0.0
+        self.blocked_total = 0.0
+        self.blocked_max = 0.0
+        self.payload_total = 0
+        self.payload_max = 0
+        self.recent: Deque[float] = deque(maxlen=RECENT_CALLS)
+
+    def record(self, wall: float, blocked: float, payload: int):
+        self.calls += 1
+        self.wall_total += wall
+        self.wall_max = max(self.wall_max, wall)
+        self.blocked_total += blocked
+        self.blocked_max = max(self.blocked_max, blocked)
+        self.payload_total += payload
+        self.payload_max = max(self.payload_max, payload)
+        self.recent.append(wall)
+
+    def wall_p95(self) -> float:
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0
+
+
+class ToolTimings:
+    """Per-tool timings for every session in this process."""
+
+    def __init__(self):
+        self.tools: Dict[str, ToolTiming] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, wall: float, blocked: float, payload: int):
+        with self._lock:
+            timing = self.tools.get(name)
+            if timing is None:
+                timing = self.tools[name] = ToolTiming()
+            timing.record(wall, blocked, payload)
+
+    def report(self, top: int = 10) -> List[str]:
+        """One line per tool, slowest p95 wall time first."""
+        with self._lock:
+            ranked = sorted(self.tools.items(), key=lambda item: item[1].wall_p95(), reverse=True)[:top]
+            return [
+                f"{name}: calls={t.calls} wall avg={t.wall_total / t.calls * 1000:.1f}ms "
+                f"p95={t.wall_p95() * 1000:.1f}ms max={t.wall_max * 1000:.1f}ms "
+                f"loop-blocked avg={t.blocked_total / t.calls * 1000:.1f}ms max={t.blocked_max * 1000:.1f}ms "
+                f"payload avg={t.payload_total // t.calls}B max={t.payload_max}B"
+                for name, t in ranked
+            ]
+
+
+timings = ToolTimings()
+
+
+def payload_size(result: Any) -> int:
+    """Size in bytes of the tool output the LLM will receive."""
+    if result is None:
+        return 0
+    if isinstance(result, str):
+        return len(result.encode())
+    try:
+        return len(json.dumps(result, default=str).encode())
+    except (TypeError, ValueError):
+        return len(str(result).encode())
+
+
+async def _run_timed(name: str, func: Callable, args, kwargs):
+    started = time.perf_counter()
+    call = func(*args, **kwargs)
+    if not asyncio.iscoroutine(call):
+        # A sync tool runs entirely on the loop.
+        blocked = time.perf_counter() - started
+        _finish(name, started, blocked, blocked, call)
+        return call
+
+    timer = _StepTimer(call)
+    result = None
+    try:
+        result = await timer
+    finally:
+        _finish(name, started, timer.blocked, timer.max_step, result)
+    return result
+
+
+def _finish(name: str, started: float, blocked: float, max_step: float, result: Any):
+    wall = time.perf_counter() - started
+    timings.record(name, wall, blocked, payload_size(result))
+    if max_step > BLOCK_WARN_SECONDS:
+        logger.warning(
+            f"Tool {name} blocked the event loop for {max_step * 1000:.0f} ms in one step "
+            f"({blocked * 1000:.0f} ms of {wall * 1000:.0f} ms total)"
+        )
+
+
+def function_tool(f: Optional[Callable] = None, **kwargs):
+    """Drop-in for livekit's `function_tool` that times every call."""
+
+    def decorate(func: Callable):
+        name = kwargs.get("name") or func.__name__
+
+        @functools.wraps(func)
+        async def timed(*args, **kw):
+            return await _run_timed(name, func, args, kw)
+
+        return livekit_function_tool(timed, **kwargs)
+
+    return decorate(f) if f is not None else decorate
+
+
+_report_task: Optional[asyncio.Task] = None
+_report_jobs = 0
+_report_lock = threading.Lock()
+
+
+def log_tool_report(top: int = 5):
+    lines = timings.report(top)
+    if lines:
+        logger.info("Slowest tools:\n  " + "\n  ".join(lines))
+
+
+def start_tool_report(ctx, interval: float = 60.0, top: int = 5):
+    """Log the slowest tools every `interval` seconds while any job runs, and once more when the last one ends.
+
+    Timings are process-wide, so every job in the process shares one report;
+    a call while the report is already running only registers the job.
+    """
+    global _report_task, _report_jobs
+
+    async def periodic():
+        while True:
+            await asyncio.sleep(interval)
+            log_tool_report(top)
+
+    with _report_lock:
+        _report_jobs += 1
+        if _report_task is None or _report_task.done():
+            _report_task = asyncio.create_task(periodic())
+
+    async def final_report():
+        global _report_task, _report_jobs
+        with _report_lock:
+            _report_jobs -= 1
+            if _report_jobs or _report_task is None:
+                return
+            _report_task.cancel()
+            _report_task = None
+        log_tool_report(top)
+
+    ctx.add_shutdown_callback(final_report)
@@ -0,0 +1,106 @@
+"""A TTS that holds one ready instance per voice and switches between them.
+
+The coach changes voice on every mode switch. Mutating a single TTS's
+options mid-turn means the next utterance runs on whatever connection state
+that instance has. `PooledTTS` instead keeps one TTS per voice, prewarms all
+of them when the session starts, and `select()` just moves a pointer; the
+next utterance streams from the already-warm instance.
+
+    pool = PooledTTS({mode: murf.TTS(voice=v) for mode, v in voices.items()}, active="learn")
+    session = AgentSession(tts=pool, ...)
+    pool.select("quiz")
+"""
+
+import logging
+from typing import Dict
+
+from livekit.agents import tts
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+logger = logging.getLogger("tts-pool")
+
+
+class PooledTTS(tts.TTS):
+    """Delegates to the selected voice's TTS; every voice is prewarmed together."""
+
+    def __init__(self, voices: Dict[str, tts.TTS], active: str):
+        if not voices:
+            raise ValueError("at least one voice is required")
+        if active not in voices:
+            raise ValueError(f"unknown voice {active!r}")
+        instances = list(voices.values())
+        if len({(t.sample_rate, t.num_channels) for t in instances}) != 1:
+            raise ValueError("all voices must share sample rate and channel count")
+
+        super().__init__(
+            capabilities=tts.TTSCapabilities(
+                streaming=all(t.capabilities.streaming for t in instances),
+                aligned_transcript=all(t.capabilities.aligned_transcript for t in instances),
+            ),
+            sample_rate=instances[0].sample_rate,
+            num_channels=instances[0].num_channels,
+        )
+        self._voices = dict(voices)
+        self._active = active
+        for instance in instances:
+            instance.on("metrics_collected", self._forward_metrics)
+            instance.on("error", self._forward_error)
+
+    @property
+    def active(self) -> str:
+        return self._active
+
+    @property
+    def current(self) -> tts.TTS:
+        return self._voices[self._active]
+
+    @property
+    def voices(self) -> Dict[str, tts.TTS]:
+        return dict(self._voices)
+
+    @property
+    def model(self) -> str:
+        return self.current.model
+
+    @property
+    def provider(self) -> str:
+        return self.current.provider
+
+    def select(self, key: str) -> tts.TTS:
+        """Make `key` the voice for the next utterance. No I/O; utterances in flight keep their voice."""
+        if key not in self._voices:
+            raise ValueError(f"unknown voice {key!r}; available: {', '.join(self._voices)}")
+        self._active = key
+        return self._voices[key]
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> tts.ChunkedStream:
+        return self.current.synthesize(text, conn_options=conn_options)
+
+    def stream(self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.SynthesizeStream:
+        return self.current.stream(conn_options=conn_options)
+
+    def prewarm(self) -> None:
+        for instance in self._voices.values():
+            instance.prewarm()
+
+    async def aclose(self) -> None:
+        """Close every voice, even if one fails; the first failure is raised afterwards."""
+        failures = []
+        for mode, instance in self._voices.items():
+            instance.off("metrics_collected", self._forward_metrics)
+            instance.off("error", self._forward_error)
+            try:
+                await instance.aclose()
+            except Exception as e:
+                logger.error(f"Failed to close the {mode!r} voice: {e}")
+                failures.append(e)
+        if failures:
+            raise failures[0]
+
+    def _forward_metrics(self, metrics) -> None:
+        self.emit("metrics_collected", metrics)
+
+    def _forward_error(self, error) -> None:
+        self.emit("error", error)
@@ -0,0 +1,32 @@
+"""Stable user keys for agents that remember people between sessions.
+
+The frontend mints a fresh participant identity for every connection
+(`voice_assistant_user_<n>`), so identities can't key history: returning
+users would never be recognized, and two users who draw the same number
+would share it. The frontend also sends a browser-scoped `user_id`
+participant attribute; a `user_id` in the participant metadata works too.
+
+Participants without either (other clients, console mode) share
+DEFAULT_USER_ID, which is how every session behaved before history was kept
+per user.
+"""
+
+import json
+import os
+
+USER_ID_ATTRIBUTE = "user_id"
+DEFAULT_USER_ID = os.getenv("DEFAULT_USER_ID", "default")
+
+
+def user_id(participant) -> str:
+    """The participant's stable user id, or DEFAULT_USER_ID when the client sent none."""
+    value = (getattr(participant, "attributes", None) or {}).get(USER_ID_ATTRIBUTE)
+    if not value:
+        try:
+            metadata = json.loads(getattr(participant, "metadata", "") or "{}")
+        except ValueError:
+            metadata = None
+        if isinstance(metadata, dict):
+            value = metadata.get(USER_ID_ATTRIBUTE)
+    value = str(value).strip() if value else ""
+    return value or DEFAULT_USER_ID
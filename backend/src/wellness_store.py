@@ -0,0 +1,274 @@
+"""Wellness check-in history in SQLite, with a per-day mood/energy rollup.
+
+Session start only needs the latest check-in and a short trend, so neither
+should cost more as history grows:
+
+- `checkins` is append-only; the latest entry is the tail of the rowid index.
+- `daily_rollup` holds one row per day with running mood/energy score sums,
+  updated in the same transaction as the insert. A trend over the last N days
+  reads at most N rows.
+
+History is partitioned by stable user id (see user_identity): each user gets
+their own database file under WELLNESS_DIR, with its own connection and
+lock, so concurrent sessions for different users never contend. Stores idle
+for WELLNESS_IDLE_SECONDS are closed. The old shared `wellness_log.json` is
+imported into WELLNESS_LEGACY_USER's history on first open, which defaults
+to the user every session without a user id shares.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from user_identity import DEFAULT_USER_ID
+
+logger = logging.getLogger("wellness-store")
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WELLNESS_DIR = os.getenv("WELLNESS_DIR", os.path.join(BACKEND_DIR, "wellness"))
+LEGACY_LOG_PATH = os.path.join(BACKEND_DIR, "wellness_log.json")
+LEGACY_USER = os.getenv("WELLNESS_LEGACY_USER", DEFAULT_USER_ID)
+TREND_DAYS = int(os.getenv("WELLNESS_TREND_DAYS", "7"))
+IDLE_SECONDS = float(os.getenv("WELLNESS_IDLE_SECONDS", "600"))
+
+# Rough valence of the words people use for mood and energy, -2..2.
+MOOD_SCORES = {
+    "great": 2, "happy": 2, "excited": 2, "joyful": 2,
+    "good": 1, "calm": 1, "relaxed": 1, "content": 1, "positive": 1,
+    "okay": 0, "ok": 0, "fine": 0, "neutral": 0, "meh": 0,
+    "low": -1, "sad": -1, "tired": -1, "stressed": -1, "anxious": -1, "worried": -1, "frustrated": -1,
+    "overwhelmed": -2, "depressed": -2, "miserable": -2, "hopeless": -2,
+}
+ENERGY_SCORES = {
+    "high": 2, "energetic": 2, "energized": 2,
+    "good": 1, "rested": 1, "decent": 1,
+    "medium": 0, "moderate": 0, "okay": 0, "ok": 0, "average": 0,
+    "low": -1, "tired": -1, "sluggish": -1,
+    "drained": -2, "exhausted": -2, "empty": -2,
+}
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def score(text: Optional[str], scale: Dict[str, int]) -> Optional[float]:
+    """Average score of the known words in `text`, or None if none are known."""
+    if not text:
+        return None
+    hits = [scale[word] for word in _WORD.findall(text.lower()) if word in scale]
+    return sum(hits) / len(hits) if hits else None
+
+
+@dataclass
+class Trend:
+    days: int
+    checkins: int
+    mood_avg: Optional[float]
+    energy_avg: Optional[float]
+    mood_change: Optional[float]  # latest day's average minus the earliest day's in the window
+
+    def describe(self) -> str:
+        if not self.checkins:
+            return f"No check-ins in the last {self.days} days."
+        parts = [f"{self.checkins} check-ins in the last {self.days} days"]
+        if self.mood_avg is not None:
+            parts.append(f"average mood {_label(self.mood_avg)}")
+        if self.energy_avg is not None:
+            parts.append(f"average energy {_label(self.energy_avg)}")
+        if self.mood_change is not None and abs(self.mood_change) >= 0.5:
+            parts.append("mood improving" if self.mood_change > 0 else "mood declining")
+        return ", ".join(parts) + "."
+
+
+def _label(value: float) -> str:
+    if value >= 1:
+        return "high"
+    if value > 0.25:
+        return "fairly good"
+    if value >= -0.25:
+        return "neutral"
+    if value > -1:
+        return "somewhat low"
+    return "low"
+
+
+class WellnessStore:
+    """One user's check-ins and their daily rollup in one SQLite file (WAL mode)."""
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._create(legacy_path)
+
+    def _create(self, legacy_path: Optional[str]):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkins (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    mood TEXT,
+                    energy TEXT,
+                    objectives TEXT NOT NULL,
+                    summary TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS daily_rollup (
+                    day TEXT PRIMARY KEY,
+                    checkins INTEGER NOT NULL,
+                    mood_sum REAL NOT NULL,
+                    mood_count INTEGER NOT NULL,
+                    energy_sum REAL NOT NULL,
+                    energy_count INTEGER NOT NULL
+                )
+                """
+            )
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                imported = self._import_legacy(legacy_path)
+                if imported:
+                    logger.info(f"Imported {imported} check-ins from {legacy_path}")
+                self._conn.execute("PRAGMA user_version = 1")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _import_legacy(self, legacy_path: Optional[str]) -> int:
+        if not legacy_path:
+            return 0
+        try:
+            with open(legacy_path, encoding="utf-8") as f:
+                history = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        records = [r for r in history if isinstance(r, dict)] if isinstance(history, list) else []
+        for record in records:
+            self._insert(record)
+        return len(records)
+
+    def _insert(self, record: Dict) -> Dict:
+        timestamp = record.get("timestamp") or datetime.now().isoformat()
+        day = timestamp[:10]
+        mood, energy = record.get("mood"), record.get("energy")
+        self._conn.execute(
+            "INSERT INTO checkins (timestamp, day, mood, energy, objectives, summary) VALUES (?, ?, ?, ?, ?, ?)",
+            (timestamp, day, mood, energy, json.dumps(record.get("objectives") or []), record.get("summary")),
+        )
+        mood_score, energy_score = score(mood, MOOD_SCORES), score(energy, ENERGY_SCORES)
+        self._conn.execute(
+            """
+            INSERT INTO daily_rollup (day, checkins, mood_sum, mood_count, energy_sum, energy_count)
+            VALUES (?, 1, ?, ?, ?, ?)
+            ON CONFLICT(day) DO UPDATE SET
+                checkins = checkins + 1,
+                mood_sum = mood_sum + excluded.mood_sum,
+                mood_count = mood_count + excluded.mood_count,
+                energy_sum = energy_sum + excluded.energy_sum,
+                energy_count = energy_count + excluded.energy_count
+            """,
+            (day, mood_score or 0.0, int(mood_score is not None), energy_score or 0.0, int(energy_score is not None)),
+        )
+        return dict(record, timestamp=timestamp)
+
+    # --- Writes ---
+
+    def append(self, record: Dict) -> Dict:
+        """Store one check-in ({timestamp, mood, energy, objectives, summary}) and roll it up."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = self._insert(record)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return stored
+
+    # --- Reads ---
+
+    def latest(self) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT timestamp, mood, energy, objectives, summary FROM checkins ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return None
+        timestamp, mood, energy, objectives, summary = row
+        return {
+            "timestamp": timestamp, "mood": mood, "energy": energy,
+            "objectives": json.loads(objectives), "summary": summary,
+        }
+
+    def trend(self, days: int = TREND_DAYS, today: Optional[date] = None) -> Trend:
+        """Mood/energy over the last `days` days, from the rollup alone."""
+        since = ((today or date.today()) - timedelta(days=max(days, 1) - 1)).isoformat()
+        with self._lock:
+            rows: List[Tuple] = self._conn.execute(
+                "SELECT checkins, mood_sum, mood_count, energy_sum, energy_count FROM daily_rollup "
+                "WHERE day >= ? ORDER BY day",
+                (since,),
+            ).fetchall()
+        checkins = sum(r[0] for r in rows)
+        mood_sum, mood_count = sum(r[1] for r in rows), sum(r[2] for r in rows)
+        energy_sum, energy_count = sum(r[3] for r in rows), sum(r[4] for r in rows)
+        scored = [r[1] / r[2] for r in rows if r[2]]
+        return Trend(
+            days=days,
+            checkins=checkins,
+            mood_avg=mood_sum / mood_count if mood_count else None,
+            energy_avg=energy_sum / energy_count if energy_count else None,
+            mood_change=scored[-1] - scored[0] if len(scored) > 1 else None,
+        )
+
+    def session_context(self, days: int = TREND_DAYS) -> Tuple[Optional[Dict], Trend]:
+        """Everything session start needs: the latest check-in and the recent trend."""
+        with self._lock:
+            return self.latest(), self.trend(days)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def shard_path(user_id: str, directory: Optional[str] = None) -> str:
+    """The database file for `user_id`: a readable prefix plus a hash, so distinct ids never collide."""
+    readable = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)[:48] or "anonymous"
+    digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directory or WELLNESS_DIR, f"{readable}-{digest}.db")
+
+
+_stores: Dict[str, Tuple[WellnessStore, float]] = {}  # user id -> (store, last used)
+_stores_lock = threading.Lock()
+
+
+def wellness_store(user_id: str) -> WellnessStore:
+    """The store for one user, opened on first use; stores idle for IDLE_SECONDS are closed."""
+    now = time.monotonic()
+    with _stores_lock:
+        for key in [k for k, (_, used) in _stores.items() if k != user_id and now - used > IDLE_SECONDS]:
+            _stores.pop(key)[0].close()
+        entry = _stores.get(user_id)
+        if entry is None:
+            legacy = LEGACY_LOG_PATH if LEGACY_USER and user_id == LEGACY_USER else None
+            store = WellnessStore(shard_path(user_id), legacy_path=legacy)
+        else:
+            store = entry[0]
+        _stores[user_id] = (store, now)
+        return store
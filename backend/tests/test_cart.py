@@ -0,0 +1,80 @@
+import pytest
+
+from cart import Cart
+
+BANANAS = {"id": "prod_001", "name": "Organic Bananas", "price": 0.69}
+MILK = {"id": "dair_001", "name": "Whole Milk", "price": 3.99}
+GUM = {"id": "snck_009", "name": "Gum", "price": 0.1}
+
+
+def test_subtotal_is_kept_in_cents() -> None:
+    cart = Cart()
+    for _ in range(3):
+        cart.add(GUM)
+    cart.add(BANANAS, 3)
+
+    # 0.1 + 0.1 + 0.1 + 3 * 0.69 drifts in float; cents do not.
+    assert cart.total == 2.37
+    assert cart.get("prod_001").cost == 2.07
+
+
+def test_rejects_non_positive_quantities() -> None:
+    cart = Cart()
+    cart.add(MILK)
+    for quantity in (0, -2):
+        with pytest.raises(ValueError):
+            cart.add(MILK, quantity)
+        with pytest.raises(ValueError):
+            cart.add(BANANAS, quantity)
+
+    assert len(cart) == 1 and "prod_001" not in cart
+    assert cart.get("dair_001").quantity == 1 and cart.total == 3.99
+
+
+def test_adding_an_item_again_updates_its_quantity() -> None:
+    cart = Cart()
+    cart.add(MILK)
+    cart.add(MILK, 2)
+
+    assert len(cart) == 1
+    assert cart.get("dair_001").quantity == 3
+    assert cart.total == 11.97
+
+
+def test_price_is_fixed_when_the_item_is_added() -> None:
+    cart = Cart()
+    cart.add(MILK)
+    cart.add({**MILK, "price": 9.99})
+
+    assert cart.get("dair_001").unit_price == 3.99
+    assert cart.total == 7.98
+
+
+def test_remove_some_or_all_units() -> None:
+    cart = Cart()
+    cart.add(BANANAS, 5)
+    cart.add(MILK)
+
+    assert cart.remove("prod_001", 2) == 3
+    assert cart.total == 6.06
+    assert cart.remove("prod_001") == 0
+    assert "prod_001" not in cart
+    assert cart.total == 3.99
+    assert cart.remove("dair_001", 10) == 0
+    assert len(cart) == 0 and cart.total == 0
+
+    with pytest.raises(KeyError):
+        cart.remove("dair_001")
+
+
+def test_order_items_match_the_order_schema() -> None:
+    cart = Cart()
+    cart.add(BANANAS, 3)
+    cart.add(MILK)
+
+    assert cart.order_items() == [
+        {"id": "prod_001", "name": "Organic Bananas", "price": 0.69, "quantity": 3},
+        {"id": "dair_001", "name": "Whole Milk", "price": 3.99, "quantity": 1},
+    ]
+    cart.clear()
+    assert cart.order_items() == [] and cart.total == 0
@@ -0,0 +1,57 @@
+import json
+
+from catalog_browser import MAX_PAGE_SIZE, CatalogBrowser
+
+
+def _item(i: int, category: str = "Pantry", tags=(), name=None, price=1.0) -> dict:
+    return {"id": f"sku_{i}", "name": name or f"Product {i}", "category": category, "price": price, "tags": list(tags)}
+
+
+def _names(page: str):
+    return [name for name, _ in json.loads(page)["items"]]
+
+
+def test_pages_follow_the_cursor_to_the_end() -> None:
+    browser = CatalogBrowser([_item(i) for i in range(5)])
+
+    first = json.loads(browser.page(page_size=2))
+    assert first["categories"] == [["Pantry", 5]]
+    assert first["items"] == [["Product 0", 1.0], ["Product 1", 1.0]]
+    assert first["total"] == 5 and first["next_cursor"] == "2"
+
+    last = json.loads(browser.page(page_size=2, cursor="4"))
+    assert last["items"] == [["Product 4", 1.0]]
+    assert "next_cursor" not in last and "categories" not in last
+
+
+def test_bad_cursor_and_page_size_are_clamped() -> None:
+    browser = CatalogBrowser([_item(i) for i in range(MAX_PAGE_SIZE + 5)])
+
+    assert _names(browser.page(cursor="nonsense", page_size=1)) == ["Product 0"]
+    assert len(_names(browser.page(page_size=1000))) == MAX_PAGE_SIZE
+    assert _names(browser.page(cursor="-3", page_size=0)) == ["Product 0"]
+
+
+def test_filters_by_category_and_tag() -> None:
+    browser = CatalogBrowser([
+        _item(0, "Produce", ["organic"]),
+        _item(1, "Dairy", ["organic"]),
+        _item(2, "Produce"),
+    ])
+
+    assert _names(browser.page(category="produce")) == ["Product 0", "Product 2"]
+    assert _names(browser.page(tag="Organic")) == ["Product 0", "Product 1"]
+    assert _names(browser.page(category="Produce", tag="organic")) == ["Product 0"]
+    assert json.loads(browser.page(category="Toys"))["error"] == "unknown category"
+
+
+def test_items_with_the_same_name_and_price_stay_distinct() -> None:
+    browser = CatalogBrowser([
+        _item(0, "Produce", ["organic"], name="Apple"),
+        _item(1, "Produce", name="Apple"),
+        _item(2, "Produce", ["organic"], name="Apple"),
+    ])
+
+    # Only the two tagged apples are listed, even though the untagged one has an identical row.
+    page = json.loads(browser.page(category="Produce", tag="organic"))
+    assert page["total"] == 2 and len(page["items"]) == 2
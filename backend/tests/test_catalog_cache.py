@@ -0,0 +1,55 @@
+import json
+import os
+
+from catalog_cache import SharedCatalog, shared_catalog
+
+ITEMS = [{"id": "prod_001", "name": "Organic Bananas", "category": "Produce", "price": 0.69, "tags": ["fruit"]}]
+MORE_ITEMS = [*ITEMS, {"id": "dair_001", "name": "Whole Milk", "category": "Dairy", "price": 3.99, "tags": []}]
+
+
+def _write(path, content, bump: int) -> None:
+    path.write_text(content if isinstance(content, str) else json.dumps(content))
+    stat = os.stat(path)
+    # Same-second writes can share an mtime; move it so the change is always visible.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+
+def test_reloads_in_the_background_and_swaps_the_snapshot(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, ITEMS, 0)
+    catalog = SharedCatalog(str(path), check_interval=0)
+    first = catalog.get()
+
+    _write(path, MORE_ITEMS, 1)
+    assert catalog.get() is first  # the caller that notices the change is not blocked on the rebuild
+    catalog.wait(5)
+
+    second = catalog.get()
+    assert [item["id"] for item in second.items] == ["prod_001", "dair_001"]
+    assert second.index.get_item_by_name("whole milk")["id"] == "dair_001"
+    assert [item["id"] for item in first.items] == ["prod_001"]  # old holders keep a consistent view
+
+
+def test_keeps_the_last_good_snapshot_when_a_reload_fails(tmp_path) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, ITEMS, 0)
+    catalog = SharedCatalog(str(path), check_interval=0)
+    good = catalog.get()
+
+    _write(path, '[{"id": "prod_0', 1)  # mid-write
+    assert catalog.reload() is good
+    catalog.get()
+    catalog.wait(5)
+    assert catalog.get() is good
+
+    _write(path, MORE_ITEMS, 2)
+    assert len(catalog.reload().items) == 2
+
+
+def test_one_catalog_per_path_per_process(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "catalog.json"
+    _write(path, ITEMS, 0)
+    monkeypatch.chdir(tmp_path)
+
+    assert shared_catalog("catalog.json") is shared_catalog(str(path))
+    assert shared_catalog(str(path)).get().items[0]["name"] == "Organic Bananas"
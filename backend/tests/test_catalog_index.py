@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from catalog_index import CatalogIndex
+
+CATALOG_FILE = Path(__file__).resolve().parent.parent / "shared-data" / "grocery_catalog.json"
+
+
+def _linear_get_item_by_name(catalog, name_query):
+    name_query = name_query.lower()
+    for item in catalog:
+        if item["id"] == name_query:
+            return item
+    for item in catalog:
+        if name_query in item["name"].lower():
+            return item
+    return None
+
+
+@pytest.fixture
+def catalog():
+    with open(CATALOG_FILE) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["prod_001", "bread", "Whole", "an", "e", "nut butt", "WHOLE MILK", "", "kiwi", "pb"],
+)
+def test_matches_linear_scan(catalog, query) -> None:
+    index = CatalogIndex(catalog)
+    assert index.get_item_by_name(query) is _linear_get_item_by_name(catalog, query)
+
+
+def test_first_match_wins_on_duplicates() -> None:
+    catalog = [
+        {"id": "a", "name": "Green Apples"},
+        {"id": "b", "name": "Apple Juice"},
+        {"id": "a", "name": "Duplicate Id"},
+    ]
+    index = CatalogIndex(catalog)
+    assert index.get_item_by_name("apple") is catalog[0]
+    assert index.get_item_by_name("juice") is catalog[1]
+    assert index.get_by_id("a") is catalog[0]
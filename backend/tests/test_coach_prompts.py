@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from coach_prompts import PromptCompiler
+from concept_library import ConceptLibrary
+
+CONTENT = json.loads((Path(__file__).parent.parent / "shared-data" / "day4_tutor_content.json").read_text())
+LIBRARY = ConceptLibrary.from_content(CONTENT)
+
+
+def test_variants_share_a_prefix_and_carry_only_the_active_concept() -> None:
+    prompts = PromptCompiler(LIBRARY)
+    variants = [prompts.instructions(mode, c["id"]) for mode in ("learn", "quiz") for c in CONTENT]
+    assert all(text.startswith(prompts.prefix) for text in variants)
+    assert "variables: Variables; loops: Loops; functions: Functions" in prompts.prefix
+
+    quiz_loops = prompts.instructions("quiz", "loops")
+    assert "**CURRENT MODE:** QUIZ" in quiz_loops
+    assert CONTENT[1]["sample_question"] in quiz_loops
+    assert CONTENT[0]["summary"] not in quiz_loops
+    assert prompts.instructions("quiz", "loops") is quiz_loops
+    assert prompts.instructions.cache_info().currsize == len(variants)
+
+
+def test_unknown_or_missing_concept_falls_back_to_the_mode_variant() -> None:
+    prompts = PromptCompiler(LIBRARY)
+    assert "INITIAL GREETING" in prompts.instructions("learn")
+    assert prompts.instructions("quiz", "recursion") == prompts.instructions("quiz", None)
+
+
+def test_large_library_lists_only_the_first_concepts() -> None:
+    library = ConceptLibrary.from_content({"id": f"c{i}", "title": f"Concept {i}"} for i in range(500))
+    prompts = PromptCompiler(library, index_limit=10)
+    assert "c9: Concept 9; and 490 more" in prompts.prefix
+    assert "**ACTIVE CONCEPT:** c321" in prompts.instructions("learn", "c321")
@@ -0,0 +1,110 @@
+import json
+import os
+import sqlite3
+
+import concept_library
+from concept_library import ConceptLibrary
+
+CONTENT = [
+    {"id": "variables", "title": "Variables", "summary": "Named storage."},
+    {"id": "loops", "title": "Loops", "summary": "Repeat actions."},
+    {"id": "functions", "title": "Functions", "summary": "Reusable blocks."},
+    {"id": "agentic_ai", "title": "Agentic AI", "summary": "Agents that act."},
+]
+
+
+def test_lookup_by_id_title_and_spoken_name(tmp_path) -> None:
+    source = tmp_path / "content.json"
+    source.write_text(json.dumps(CONTENT))
+    library = ConceptLibrary(str(tmp_path / "concepts.db"))
+    assert library.import_file(str(source)) == 4
+    assert library.import_file(str(source)) == 0  # unchanged, skipped
+
+    assert library.get("loops")["summary"] == "Repeat actions."
+    assert library.get("recursion") is None
+    assert library.by_title("agentic ai")["id"] == "agentic_ai"
+    assert library.resolve("Functions")["id"] == "functions"
+    assert library.resolve("funktions")["id"] == "functions"
+    assert library.resolve("loop")["id"] == "loops"
+    assert library.resolve("agentic")["id"] == "agentic_ai"
+    assert library.resolve("quantum chromodynamics") is None
+    assert list(library.iter_ids(page_size=3)) == ["variables", "loops", "functions", "agentic_ai"]
+
+
+def test_reimport_updates_bodies_in_place() -> None:
+    library = ConceptLibrary.from_content(CONTENT)
+    assert library.get("loops")["summary"] == "Repeat actions."
+    library.add([dict(CONTENT[1], summary="Repeat until done.")])
+    assert len(library) == 4
+    assert library.get("loops")["summary"] == "Repeat until done."
+    assert library.index(2) == [("variables", "Variables"), ("loops", "Loops")]
+
+
+def test_reimport_drops_concepts_removed_from_the_file(tmp_path) -> None:
+    source, other = tmp_path / "content.json", tmp_path / "extra.json"
+    source.write_text(json.dumps(CONTENT))
+    other.write_text(json.dumps([{"id": "recursion", "title": "Recursion"}]))
+    library = ConceptLibrary(str(tmp_path / "concepts.db"))
+    library.import_file(str(source))
+    library.import_file(str(other))
+    assert library.resolve("loop")["id"] == "loops"
+
+    source.write_text(json.dumps([c for c in CONTENT if c["id"] != "loops"]))
+    assert library.import_file(str(source), force=True) == 3
+    assert library.get("loops") is None
+    assert "Loops" not in library.suggestions("loops")
+    assert list(library.iter_ids()) == ["variables", "functions", "agentic_ai", "recursion"]
+
+
+def test_opens_a_library_built_before_sources_were_recorded(tmp_path) -> None:
+    path = str(tmp_path / "concepts.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE concepts (position INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+        "title TEXT NOT NULL, title_norm TEXT NOT NULL, body TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO concepts (id, title, title_norm, body) VALUES ('loops', 'Loops', 'loops', '{}')")
+    conn.commit()
+    conn.close()
+
+    source = tmp_path / "content.json"
+    source.write_text(json.dumps(CONTENT[:1]))
+    library = ConceptLibrary(path)
+    library.import_file(str(source))
+    assert list(library.iter_ids()) == ["loops", "variables"]  # unowned rows are left alone
+
+
+def test_changes_from_another_process_drop_cached_lookups(tmp_path) -> None:
+    source = tmp_path / "content.json"
+    source.write_text(json.dumps(CONTENT))
+    path = str(tmp_path / "concepts.db")
+    writer, reader = ConceptLibrary(path), ConceptLibrary(path)
+    writer.import_file(str(source))
+    assert reader.get("loops")["title"] == "Loops"
+    assert "Loops" in reader.suggestions("loop")  # builds the reader's matcher
+    version = reader.version
+
+    source.write_text(json.dumps([c for c in CONTENT if c["id"] != "loops"]))
+    writer.import_file(str(source), force=True)
+
+    assert reader.get("loops") is None
+    assert "Loops" not in reader.suggestions("loop")
+    assert reader.version > version
+
+
+def test_process_library_picks_up_content_edits(tmp_path, monkeypatch) -> None:
+    source = tmp_path / "content.json"
+    source.write_text(json.dumps(CONTENT))
+    monkeypatch.setattr(concept_library, "DEFAULT_CONTENT_PATH", str(source))
+    monkeypatch.setattr(concept_library, "_library", None)
+    monkeypatch.setattr(concept_library, "ConceptLibrary", lambda: ConceptLibrary(str(tmp_path / "concepts.db")))
+    assert concept_library.concept_library().get("recursion") is None
+
+    source.write_text(json.dumps([*CONTENT, {"id": "recursion", "title": "Recursion"}]))
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert concept_library.concept_library().get("recursion")["title"] == "Recursion"
+
+    source.write_text('[{"id": "rec')  # mid-edit
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    assert concept_library.concept_library().get("recursion")["title"] == "Recursion"
@@ -0,0 +1,95 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from fraud_campaign import CampaignRunner, campaign_stats, staged_case
+from fraud_db import FraudDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "fraud_cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE fraud_cases (id INTEGER PRIMARY KEY, user_name TEXT, verification_question TEXT, "
+        "verification_answer TEXT, status TEXT, notes TEXT, updated_at TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fraud_cases (user_name, verification_question, verification_answer, status) VALUES (?, 'Pet?', 'rex', ?)",
+        [(f"User {i}", "confirmed_safe" if i % 10 == 0 else "pending_review") for i in range(1, 101)],
+    )
+    conn.commit()
+    conn.close()
+    db = FraudDB(path)
+    yield db
+    db.close()
+
+
+async def test_shards_split_pending_cases_and_rerun_resumes(db) -> None:
+    calls = []
+
+    async def dispatch(room, metadata):
+        calls.append((room, staged_case(metadata)))
+
+    for shard in range(3):
+        metrics = await CampaignRunner(dispatch, db, shard=shard, shards=3, page_size=7, concurrency=4, rate=0).run()
+        assert metrics.failed == 0
+
+    assert len(calls) == 90
+    assert len({room for room, _ in calls}) == 90
+    room, case = calls[0]
+    assert room == f"fraud-case-{case['id']}"
+    assert case["verification_question"] == "Pet?" and case["user_name"]
+
+    rerun = await CampaignRunner(dispatch, db, rate=0).run()
+    assert rerun.queued == 0
+
+    stats = await campaign_stats(db)
+    assert (stats["pending"], stats["in_flight"], stats["resolved"]) == (0, 90, 10)
+
+
+async def test_failed_dispatch_leaves_case_pending(db) -> None:
+    async def dispatch(room, metadata):
+        if room == "fraud-case-1":
+            raise RuntimeError("no worker")
+
+    metrics = await CampaignRunner(dispatch, db, rate=0).run()
+    assert (metrics.dispatched, metrics.failed) == (89, 1)
+    assert (await campaign_stats(db))["pending"] == 1
+
+
+async def test_failed_write_skips_the_case_without_calling(db) -> None:
+    calls = []
+
+    async def dispatch(room, metadata):
+        calls.append(room)
+
+    write = db.write
+
+    async def flaky_write(sql, params=()):
+        if params[2] == 2:  # (status, dispatched_at, id, ...)
+            raise sqlite3.OperationalError("database is locked")
+        return await write(sql, params)
+
+    db.write = flaky_write
+    metrics = await CampaignRunner(dispatch, db, concurrency=4, rate=0).run()
+
+    assert (metrics.dispatched, metrics.write_failed) == (89, 1)
+    assert "fraud-case-2" not in calls and len(calls) == 89
+    assert (await campaign_stats(db))["pending"] == 1
+
+
+async def test_reader_failure_stops_the_workers(db) -> None:
+    async def dispatch(room, metadata):
+        pass
+
+    async def broken_read(sql, params=()):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    db.read = broken_read
+    runner = CampaignRunner(dispatch, db, concurrency=4, rate=0)
+    with pytest.raises(sqlite3.OperationalError):
+        await runner.run()
+    await asyncio.sleep(0)
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
@@ -0,0 +1,63 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from fraud_db import MIGRATIONS, FraudDB
+
+
+def _create_cases(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE fraud_cases (id INTEGER PRIMARY KEY, user_name TEXT, status TEXT)")
+    conn.execute("INSERT INTO fraud_cases (user_name, status) VALUES ('John', 'pending')")
+    conn.commit()
+    conn.close()
+
+
+async def test_failed_connect_fails_queued_requests_and_retries(tmp_path) -> None:
+    path = str(tmp_path / "fraud_cases.db")
+    sqlite3.connect(path).close()  # exists, but has no fraud_cases table to migrate
+    db = FraudDB(path)
+
+    reads = [db.read("SELECT * FROM fraud_cases") for _ in range(3)]
+    results = await asyncio.wait_for(asyncio.gather(*reads, return_exceptions=True), timeout=5)
+    assert all(isinstance(r, sqlite3.OperationalError) for r in results)
+    with pytest.raises(sqlite3.OperationalError, match="no fraud_cases table"):
+        db.check()
+
+    _create_cases(path)
+    rows = await asyncio.wait_for(db.read("SELECT user_name FROM fraud_cases"), timeout=5)
+    assert rows == [{"user_name": "John"}]
+    db.close()
+
+
+async def test_unopenable_path_does_not_hang(tmp_path) -> None:
+    db = FraudDB(str(tmp_path / "missing" / "fraud_cases.db"))
+    with pytest.raises(sqlite3.OperationalError):
+        await asyncio.wait_for(db.write("UPDATE fraud_cases SET status='x'"), timeout=5)
+    assert db._thread is None
+
+
+def test_concurrent_prewarms_migrate_once(tmp_path) -> None:
+    path = str(tmp_path / "fraud_cases.db")
+    _create_cases(path)
+    barrier, errors = threading.Barrier(4), []
+
+    def prewarm():
+        barrier.wait()
+        try:
+            FraudDB(path).check()
+        except sqlite3.Error as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=prewarm) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    conn.close()
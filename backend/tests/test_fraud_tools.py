@@ -0,0 +1,58 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import fraud_tools
+from fraud_db import FraudDB
+from fraud_tools import FraudSession, load_case, update_case_status, verify_answer
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / "fraud_cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE fraud_cases (id INTEGER PRIMARY KEY, user_name TEXT, verification_question TEXT, "
+        "verification_answer TEXT, status TEXT, notes TEXT, updated_at TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fraud_cases (user_name, verification_question, verification_answer, status) "
+        "VALUES (?, 'Pet?', ?, 'pending_review')",
+        [("John Smith", "rex"), ("Jane Doe", "milo")],
+    )
+    conn.commit()
+    conn.close()
+    db = FraudDB(path)
+    monkeypatch.setattr(fraud_tools, "get_db", lambda: db)
+    yield db
+    db.close()
+
+
+async def test_cached_case_is_only_reused_for_the_same_customer(db) -> None:
+    ctx = SimpleNamespace(userdata=FraudSession())
+    assert (await load_case(ctx, "John Smith"))[0]["id"] == 1
+
+    assert await verify_answer(ctx, " john smith ", "REX") == {"verified": True}
+    assert await verify_answer(ctx, "Jane Doe", "rex") == {"verified": False}  # checked against Jane's case
+    assert await verify_answer(ctx, "Jane Doe", "milo") == {"verified": True}
+    assert ctx.userdata.case["id"] == 2
+
+
+async def test_case_id_must_belong_to_the_named_customer(db) -> None:
+    ctx = SimpleNamespace(userdata=FraudSession())
+    await load_case(ctx, "John Smith")
+
+    assert await verify_answer(ctx, "John Smith", "milo", case_id=2) == {"verified": False}
+    result = await update_case_status(ctx, "John Smith", "confirmed_fraud", "mismatch", case_id=2)
+    assert result == {"updated": False, "error": "No matching case."}
+    rows = await db.read("SELECT status FROM fraud_cases WHERE id=2")
+    assert rows[0]["status"] == "pending_review"
+
+
+async def test_staged_case_is_reused_for_its_customer(db) -> None:
+    staged = {"id": 1, "user_name": "John Smith", "verification_answer": "rex"}
+    ctx = SimpleNamespace(userdata=FraudSession(case=staged))
+    await db.write("UPDATE fraud_cases SET verification_answer='changed' WHERE id=1")
+
+    assert await verify_answer(ctx, "John Smith", "rex", case_id=1) == {"verified": True}  # no refetch
@@ -0,0 +1,58 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from fraud_db import FraudDB
+from fraud_updates import StatusUpdateQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "fraud_cases.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE fraud_cases (id INTEGER PRIMARY KEY, user_name TEXT, status TEXT, notes TEXT, updated_at TEXT)"
+    )
+    conn.executemany("INSERT INTO fraud_cases (user_name, status) VALUES (?, 'pending')", [(f"User {i}",) for i in range(50)])
+    conn.commit()
+    conn.close()
+    db = FraudDB(path)
+    yield db
+    db.close()
+
+
+async def test_burst_is_committed_in_one_batch(db) -> None:
+    queue = StatusUpdateQueue(db, interval=0.01)
+    acks = [queue.submit(case_id, "confirmed_safe", "ok") for case_id in range(1, 41)]
+    # Same case again before the flush: the last update wins.
+    acks.append(queue.submit(1, "confirmed_fraud", "changed mind"))
+    assert queue.pending == 40
+
+    assert await asyncio.gather(*acks) == [True] * 41
+    assert queue.flushed_batches == 1
+    rows = await db.read("SELECT status, COUNT(*) AS n FROM fraud_cases GROUP BY status ORDER BY status")
+    assert rows == [
+        {"status": "confirmed_fraud", "n": 1},
+        {"status": "confirmed_safe", "n": 39},
+        {"status": "pending", "n": 10},
+    ]
+
+
+async def test_size_threshold_and_explicit_flush(db) -> None:
+    queue = StatusUpdateQueue(db, interval=60, max_pending=5)
+    first = [queue.submit(case_id, "confirmed_safe", "") for case_id in range(1, 6)]
+    await asyncio.gather(*first)
+
+    late = queue.submit(6, "confirmed_safe", "")
+    await queue.flush()
+    assert late.done() and queue.pending == 0
+    assert queue.flushed_batches == 2
+
+
+async def test_update_to_a_missing_case_reports_false(db) -> None:
+    queue = StatusUpdateQueue(db, interval=0.01)
+    acks = [queue.submit(1, "confirmed_safe", ""), queue.submit(999, "confirmed_safe", "")]
+
+    assert await asyncio.gather(*acks) == [True, False]
+    assert await db.write_many("UPDATE fraud_cases SET notes='x' WHERE id=?", [(2,), (998,), (3,)]) == [1, 0, 1]
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from fuzzy_match import FuzzyMatcher, phonetic_key
+
+CATALOG_FILE = Path(__file__).resolve().parent.parent / "shared-data" / "grocery_catalog.json"
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    with open(CATALOG_FILE) as f:
+        return FuzzyMatcher(json.load(f))
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("bananna", "Organic Bananas"),
+        ("whole weat bread", "Whole Wheat Bread"),
+        ("pb", "Peanut Butter"),
+        ("choclate", "Chocolate Bar"),
+        ("strawbery jam", "Strawberry Jam"),
+        ("Potato chip", "Potato Chips"),
+    ],
+)
+def test_resolves_noisy_voice_input(matcher, query, expected) -> None:
+    assert matcher.best(query)["name"] == expected
+
+
+def test_unknown_item_has_no_best_match(matcher) -> None:
+    assert matcher.best("kiwi") is None
+
+
+def test_results_are_memoized_per_normalized_query(matcher) -> None:
+    matcher.top_k("Whole  Weat, Bread")
+    hits = matcher._ranked.cache_info().hits
+    matcher.top_k("whole weat bread")
+    assert matcher._ranked.cache_info().hits == hits + 1
+
+
+def test_phonetic_key_ignores_plural() -> None:
+    assert phonetic_key("bananas") == phonetic_key("bananna")
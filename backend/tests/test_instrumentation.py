@@ -0,0 +1,113 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from livekit.agents import FunctionToolsExecutedEvent
+from livekit.agents.llm import FunctionCall, FunctionCallOutput
+from livekit.agents.metrics import EOUMetrics, LLMMetrics, TTSMetrics
+
+import instrumentation
+from instrumentation import (
+    JsonlSink,
+    LatencyRegistry,
+    MetricsSink,
+    PrometheusTextSink,
+    SessionInstrumentation,
+    instrument_session,
+)
+
+
+def _turn(instr: SessionInstrumentation, speech_id: str):
+    instr.on_metrics(EOUMetrics(
+        timestamp=0, end_of_utterance_delay=0.4, transcription_delay=0.2,
+        on_user_turn_completed_delay=0.0, speech_id=speech_id,
+    ))
+    instr.on_metrics(LLMMetrics(
+        label="llm", request_id="r", timestamp=0, duration=1.0, ttft=0.7, cancelled=False,
+        completion_tokens=1, prompt_tokens=1, prompt_cached_tokens=0, total_tokens=2,
+        tokens_per_second=1.0, speech_id=speech_id,
+    ))
+    instr.on_metrics(TTSMetrics(
+        label="tts", request_id="r", timestamp=0, ttfb=0.3, duration=1.0, audio_duration=1.0,
+        cancelled=False, characters_count=10, streamed=True, speech_id=speech_id,
+    ))
+
+
+def test_records_stages_and_tools_per_room(tmp_path) -> None:
+    jsonl = tmp_path / "latency.jsonl"
+    prom = PrometheusTextSink(str(tmp_path / "prom"), "grocery")
+    registry = LatencyRegistry([JsonlSink(str(jsonl)), prom])
+    instr = SessionInstrumentation("grocery", "room-1", registry)
+
+    _turn(instr, "speech-1")
+    _turn(instr, "speech-2")
+    call = FunctionCall(call_id="c1", name="place_order", arguments="{}", created_at=100.0)
+    output = FunctionCallOutput(call_id="c1", name="place_order", output="ok", is_error=False, created_at=100.25)
+    instr.on_tools_executed(FunctionToolsExecutedEvent(function_calls=[call], function_call_outputs=[output]))
+    registry.flush()
+
+    merged = registry.merged("grocery", "room-1")
+    assert {key: h.count for key, h in merged.items()} == {
+        ("eou_delay", ""): 2, ("stt_latency", ""): 2, ("llm_ttft", ""): 2,
+        ("tts_ttfb", ""): 2, ("tool_time", "place_order"): 1,
+    }
+    assert merged[("tool_time", "place_order")].sum == 0.25
+    assert not instr._turns  # each turn was logged and dropped once TTS started
+
+    lines = [json.loads(line) for line in jsonl.read_text().splitlines()]
+    assert len(lines) == 9 and lines[-1]["tool"] == "place_order"
+    with open(prom.path) as f:
+        text = f.read()
+    assert 'stage="llm_ttft",tool="",le="0.75"} 2' in text
+    assert 'voice_agent_stage_latency_seconds_count{agent="grocery",room="room-1",stage="tool_time",tool="place_order"} 1' in text
+
+
+def test_closed_rooms_fold_into_the_agent_series() -> None:
+    registry = LatencyRegistry()
+    for room in ("room-1", "room-2", "room-3"):
+        instr = SessionInstrumentation("grocery", room, registry)
+        _turn(instr, f"{room}-speech")
+        instr.close()
+
+    assert {key[1] for key in registry.histograms} == {""}
+    assert registry.merged("grocery")[("llm_ttft", "")].count == 3
+    assert 'room="room-' not in registry.to_prometheus()
+
+
+class _CountingSink(MetricsSink):
+    def __init__(self):
+        self.flushes = 0
+
+    def flush(self, registry):
+        self.flushes += 1
+
+
+class _Job:
+    def __init__(self, room: str):
+        self.room = SimpleNamespace(name=room)
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, callback):
+        self.shutdown_callbacks.append(callback)
+
+    async def shutdown(self):
+        for callback in self.shutdown_callbacks:
+            await callback()
+
+
+async def test_concurrent_sessions_share_one_periodic_flush(monkeypatch) -> None:
+    sink = _CountingSink()
+    monkeypatch.setattr(instrumentation, "_registry", LatencyRegistry([sink]))
+    monkeypatch.setattr(instrumentation, "FLUSH_INTERVAL", 0.1)
+    session = SimpleNamespace(on=lambda event, callback: None)
+    jobs = [_Job("room-1"), _Job("room-2")]
+    for job in jobs:
+        instrument_session(session, job, "grocery")
+
+    await asyncio.sleep(0.15)
+    assert sink.flushes == 1
+
+    for job in jobs:
+        await job.shutdown()
+    assert instrumentation._flusher is None
+    assert sink.flushes == 3  # plus one final flush per job
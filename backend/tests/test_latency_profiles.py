@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from latency_profiles import (
+    PROFILES,
+    ClauseTokenizer,
+    FirstAudioRecorder,
+    latency_profile,
+)
+
+
+def test_clause_tokenizer_merges_short_fragments() -> None:
+    text = "Hi, this is Alex from SecureBank, calling about a charge. Did you make it? Yes; fine."
+    assert ClauseTokenizer(min_clause_len=12).tokenize(text) == [
+        "Hi, this is Alex from SecureBank,",
+        "calling about a charge.",
+        "Did you make it?",
+        "Yes; fine.",
+    ]
+
+
+def test_profile_override_from_env(monkeypatch) -> None:
+    assert latency_profile("fraud").name == "sentence_stt"
+    monkeypatch.setenv("LATENCY_PROFILE_FRAUD", "clause_stt")
+    assert latency_profile("fraud") is PROFILES["clause_stt"]
+    monkeypatch.setenv("LATENCY_PROFILE_FRAUD", "nope")
+    assert latency_profile("fraud").name == "sentence_stt"
+
+
+def test_first_audio_recorder_measures_from_end_of_turn() -> None:
+    recorder = FirstAudioRecorder("grocery", PROFILES["vad"])
+
+    def user(old, new, at):
+        return SimpleNamespace(old_state=old, new_state=new, created_at=at)
+
+    def agent(new, at):
+        return SimpleNamespace(new_state=new, created_at=at)
+
+    recorder._on_user_state(user("listening", "speaking", 10.0))
+    recorder._on_user_state(user("speaking", "listening", 12.0))
+    recorder._on_agent_state(agent("thinking", 12.3))
+    recorder._on_agent_state(agent("speaking", 12.9))
+    # The agent greeting on its own (no user turn) is not a sample.
+    recorder._on_agent_state(agent("speaking", 20.0))
+
+    assert [round(s, 3) for s in recorder.samples] == [0.9]
@@ -0,0 +1,66 @@
+from learner_state import DAY, ConceptState, LearnerStore, ReviewScheduler, quality, sm2
+
+
+def test_sm2_intervals_grow_with_good_scores_and_reset_on_bad_ones() -> None:
+    state = ConceptState("loops")
+    assert [sm2(state, 9, 0).interval_days for _ in range(3)] == [1.0, 6.0, 16.2]
+    assert round(state.ease, 2) == 2.8 and state.repetitions == 3
+    sm2(state, 3, 0)
+    assert state.repetitions == 0 and state.interval_days == 1.0 and state.ease < 2.8
+    assert [quality(s) for s in (0, 4, 5, 9, 12)] == [0, 2, 3, 5, 5]
+
+
+def test_scheduler_serves_unseen_then_most_overdue_concepts() -> None:
+    now = 1_000_000.0
+    scheduler = ReviewScheduler(["variables", "loops", "functions"])
+    assert scheduler.next() == "variables"
+
+    scheduler.record("variables", 10, now)
+    scheduler.record("loops", 2, now - 60)
+    assert scheduler.next(now=now) == "functions"  # nothing due yet
+    scheduler.record("functions", 8, now + 10)
+
+    later = now + DAY
+    assert scheduler.next(now=later) == "loops"  # failed, due first
+    assert scheduler.next(exclude="loops", now=later) == "variables"
+    assert not scheduler.due(now) and scheduler.due(later)
+
+
+def test_scheduler_skips_reviewed_concepts_removed_from_the_library() -> None:
+    library = {"variables", "functions"}
+    states = {
+        "loops": ConceptState("loops", due=10.0, reviews=1),
+        "variables": ConceptState("variables", due=20.0, reviews=1),
+    }
+    scheduler = ReviewScheduler(sorted(library), states, exists=library.__contains__)
+    assert scheduler.next(now=DAY) == "variables"
+    assert scheduler.next(exclude="variables", now=DAY) == "functions"
+    assert scheduler.due(now=15.0) is False
+
+
+def test_due_reviews_come_before_unseen_concepts_which_are_read_lazily() -> None:
+    read = []
+
+    def ids():
+        for i in range(100_000):
+            read.append(i)
+            yield f"c{i}"
+
+    scheduler = ReviewScheduler(ids())
+    scheduler.record("c0", 4, 0.0)
+    assert scheduler.next(now=0.0) == "c1"
+    assert scheduler.next(now=DAY) == "c0"
+    assert len(read) < 10
+
+
+def test_state_persists_per_learner(tmp_path) -> None:
+    store = LearnerStore(str(tmp_path / "learners.db"))
+    scheduler = ReviewScheduler(["variables", "loops"], store.load("alice"))
+    store.save("alice", scheduler.record("variables", 10, 0.0))
+    store.close()
+
+    store = LearnerStore(str(tmp_path / "learners.db"))
+    assert store.load("bob") == {}
+    resumed = ReviewScheduler(["variables", "loops"], store.load("alice"))
+    assert resumed.states["variables"].reviews == 1
+    assert resumed.next(now=0.0) == "loops"
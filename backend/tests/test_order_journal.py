@@ -0,0 +1,83 @@
+import json
+import threading
+
+import pytest
+
+from order_journal import OrderJournal
+
+
+def _order(order_id: str, total: float = 1.0) -> dict:
+    return {
+        "id": order_id,
+        "timestamp": "2025-11-28T19:32:15.173680",
+        "items": {"pant_001": 1},
+        "total": total,
+        "status": "received",
+    }
+
+
+def test_loads_legacy_orders_json(tmp_path) -> None:
+    snapshot = tmp_path / "orders.json"
+    snapshot.write_text(json.dumps([_order("ORD-1")], indent=2))
+
+    journal = OrderJournal(str(snapshot))
+    journal.append(_order("ORD-2"))
+
+    assert [o["id"] for o in journal.orders()] == ["ORD-1", "ORD-2"]
+    # The snapshot is untouched until compaction; the new order lives in the log.
+    assert len(json.loads(snapshot.read_text())) == 1
+    assert (tmp_path / "orders.jsonl").read_text().count("\n") == 1
+
+
+def test_replays_updates_after_reopen(tmp_path) -> None:
+    snapshot = tmp_path / "orders.json"
+    journal = OrderJournal(str(snapshot))
+    journal.append(_order("ORD-1"))
+    journal.update("ORD-1", status="delivered")
+    journal.close()
+
+    reopened = OrderJournal(str(snapshot))
+    assert reopened.get("ORD-1")["status"] == "delivered"
+
+
+def test_compaction_writes_snapshot_and_truncates_log(tmp_path) -> None:
+    snapshot = tmp_path / "orders.json"
+    journal = OrderJournal(str(snapshot), compact_every=3)
+    for i in range(4):
+        journal.append(_order(f"ORD-{i}"))
+
+    assert [o["id"] for o in json.loads(snapshot.read_text())] == ["ORD-0", "ORD-1", "ORD-2"]
+    assert (tmp_path / "orders.jsonl").read_text().count("\n") == 1
+    assert len(OrderJournal(str(snapshot)).orders()) == 4
+
+
+def test_sees_appends_from_another_handle(tmp_path) -> None:
+    snapshot = tmp_path / "orders.json"
+    first = OrderJournal(str(snapshot))
+    second = OrderJournal(str(snapshot), compact_every=1)
+
+    first.append(_order("ORD-1"))
+    assert second.get("ORD-1") is not None
+
+    second.append(_order("ORD-2"))  # compacts
+    assert [o["id"] for o in first.recent(2)] == ["ORD-1", "ORD-2"]
+
+
+def test_reads_wait_for_a_compaction_in_another_process(tmp_path) -> None:
+    fcntl = pytest.importorskip("fcntl")
+    snapshot = tmp_path / "orders.json"
+    writer = OrderJournal(str(snapshot))
+    writer.append(_order("ORD-1"))
+    reader = OrderJournal(str(snapshot))
+
+    # Stand in for another process holding the exclusive lock mid-compaction.
+    with open(tmp_path / "orders.jsonl", "a") as other:
+        fcntl.flock(other.fileno(), fcntl.LOCK_EX)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(reader.orders()))
+        thread.start()
+        thread.join(0.2)
+        assert thread.is_alive() and not result
+        fcntl.flock(other.fileno(), fcntl.LOCK_UN)
+    thread.join(5)
+    assert [o["id"] for o in result[0]] == ["ORD-1"]
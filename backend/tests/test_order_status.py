@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from order_journal import OrderJournal
+from order_status import OrderStatusEngine
+from order_store import new_order
+
+PLACED = datetime(2025, 11, 28, 19, 30, 0)
+T0 = PLACED.timestamp()
+
+
+def _order(order_id: str, status: str = "received") -> dict:
+    return {"id": order_id, "timestamp": PLACED.isoformat(), "items": {}, "total": 1.0, "status": status}
+
+
+def test_advances_through_thresholds(tmp_path) -> None:
+    journal = OrderJournal(str(tmp_path / "orders.json"))
+    journal.append(_order("ORD-1"))
+    engine = OrderStatusEngine(journal)
+
+    assert engine.advance(T0 + 10) == 0
+    assert engine.advance(T0 + 31) == 1
+    assert journal.get("ORD-1")["status"] == "being_prepared"
+    assert engine.advance(T0 + 95) == 1
+    assert journal.get("ORD-1")["status"] == "delivered"
+    assert engine.advance(T0 + 1000) == 0
+
+
+def test_delivered_orders_are_not_scheduled(tmp_path) -> None:
+    journal = OrderJournal(str(tmp_path / "orders.json"))
+    for i in range(100):
+        journal.append(_order(f"OLD-{i}", status="delivered"))
+    engine = OrderStatusEngine(journal)
+    journal.append(_order("NEW"))
+
+    engine.advance(T0)
+    assert [entry[2] for entry in engine._heap] == ["NEW"]
+
+
+def test_orders_placed_in_the_same_second_both_advance(tmp_path) -> None:
+    journal = OrderJournal(str(tmp_path / "orders.json"))
+    orders = [new_order([], 1.0) for _ in range(2)]
+    for order in orders:
+        journal.append(order)
+    engine = OrderStatusEngine(journal)
+
+    placed = datetime.fromisoformat(orders[-1]["timestamp"]).timestamp()
+    assert engine.advance(placed + 95) == 2
+    assert [journal.get(o["id"])["status"] for o in orders] == ["delivered", "delivered"]
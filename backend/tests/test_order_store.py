@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+import pytest
+
+from order_store import create_order_store, migrate_orders, new_order, normalize_order
+
+LEGACY_ORDERS = [
+    {"id": "ORD-1", "timestamp": "2025-11-28T19:32:15", "items": {"pant_001": 1}, "total": 4.5, "status": "received"},
+    {
+        "order_id": "ord_2",
+        "timestamp": "2025-11-28T19:40:00",
+        "status": "delivered",
+        "items": [{"id": "dair_001", "name": "Whole Milk", "price": 3.99, "quantity": 2}],
+        "total": 7.98,
+    },
+]
+
+
+def test_normalize_order_handles_both_legacy_schemas() -> None:
+    agent_order, tools_order = (normalize_order(o) for o in LEGACY_ORDERS)
+    assert agent_order["items"] == [{"id": "pant_001", "quantity": 1}]
+    assert tools_order["id"] == "ord_2"
+    assert "order_id" not in tools_order
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_backends_share_one_interface(tmp_path, backend) -> None:
+    store = create_order_store(backend, str(tmp_path / "orders.json"))
+    first = new_order([{"id": "prod_001", "name": "Organic Bananas", "price": 0.69, "quantity": 3}], 2.07)
+    second = {**first, "id": "ORD-2"}
+    store.append(first)
+    store.append(second)
+    store.update(first["id"], status="delivered")
+
+    assert store.get(first["id"])["status"] == "delivered"
+    assert [o["id"] for o in store.recent(1)] == ["ORD-2"]
+    assert [o["id"] for o in store.orders()] == [first["id"], "ORD-2"]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_migrate_legacy_orders_json(tmp_path, backend) -> None:
+    source = tmp_path / "legacy.json"
+    source.write_text(json.dumps(LEGACY_ORDERS))
+    store = create_order_store(backend, str(tmp_path / "orders.json"))
+
+    assert migrate_orders(str(source), store) == 2
+    assert migrate_orders(str(source), store) == 0
+    assert store.get("ord_2")["status"] == "delivered"
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_orders_placed_in_the_same_second_are_kept(tmp_path, backend) -> None:
+    store = create_order_store(backend, str(tmp_path / "orders.json"))
+    orders = [new_order([], 1.0) for _ in range(2)]
+    for order in orders:
+        store.append(order)
+
+    assert orders[0]["id"] != orders[1]["id"]
+    assert [o["id"] for o in store.orders()] == [o["id"] for o in orders]
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_listeners_see_additions_but_not_updates(tmp_path, backend) -> None:
+    store = create_order_store(backend, str(tmp_path / "orders.json"))
+    store.append(LEGACY_ORDERS[0])
+    seen = []
+    store.subscribe(lambda order: seen.append((order["id"], order["status"])))
+
+    store.update("ORD-1", status="delivered")
+    store.append({**LEGACY_ORDERS[0], "id": "ORD-2"})
+    store.recent(1)
+    assert seen == [("ORD-1", "received"), ("ORD-2", "received")]
+
+
+def test_sqlite_refuses_to_overwrite_an_order(tmp_path) -> None:
+    store = create_order_store("sqlite", str(tmp_path / "orders.json"))
+    store.append(LEGACY_ORDERS[0])
+    with pytest.raises(sqlite3.IntegrityError):
+        store.append({**LEGACY_ORDERS[0], "total": 0.0})
+    assert store.get("ORD-1")["total"] == 4.5
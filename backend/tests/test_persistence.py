@@ -0,0 +1,45 @@
+import asyncio
+import gc
+import json
+import time
+
+from persistence import load_json, save_json, update_json
+
+
+async def _max_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def test_concurrent_sessions_keep_the_loop_responsive(tmp_path) -> None:
+    shared = str(tmp_path / "log" / "history.json")
+    payload = {"items": [{"name": f"item-{i}", "notes": "x" * 200} for i in range(500)]}
+
+    async def session(n: int):
+        await save_json(str(tmp_path / "orders" / f"{n}.json"), payload, indent=4)
+        await update_json(shared, lambda history: [*history, n], default=[], indent=4)
+
+    # Measure the writes, not a full collection of whatever earlier tests left on the heap.
+    gc.collect()
+    gc.freeze()
+    try:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_max_loop_lag(stop))
+        await asyncio.gather(*(session(n) for n in range(50)))
+        stop.set()
+        lag = await probe
+    finally:
+        gc.unfreeze()
+
+    assert lag < 0.1
+    assert sorted(await load_json(shared)) == list(range(50))
+    assert json.loads((tmp_path / "orders" / "7.json").read_text()) == payload
+    assert not [p for p in (tmp_path / "orders").iterdir() if p.suffix == ".tmp"]
+
+
+async def test_load_json_returns_default_for_missing_file(tmp_path) -> None:
+    assert await load_json(str(tmp_path / "missing.json"), default=[]) == []
@@ -0,0 +1,57 @@
+import logging
+
+from catalog_cache import CatalogSnapshot
+from recipes import RecipeBook
+
+CATALOG = (
+    {"id": "bake_001", "name": "Whole Wheat Bread", "category": "Bakery", "price": 3.49},
+    {"id": "pant_001", "name": "Peanut Butter", "category": "Pantry", "price": 4.99},
+    {"id": "pant_002", "name": "Strawberry Jam", "category": "Pantry", "price": 3.79},
+    {"id": "prod_001", "name": "Organic Bananas", "category": "Produce", "price": 0.69},
+)
+RAW = {
+    "sandwich": {
+        "servings": 2,
+        "ingredients": [
+            {"item": "Whole Wheat Bread", "quantity": 1},
+            {"item": "pant_001", "quantity": 1},
+            {"item": "strawberry jam", "quantity": 0.5},
+        ],
+    },
+    "peanut butter sandwich": {"servings": 1, "ingredients": [{"item": "Peanut Butter"}]},
+}
+
+
+def _book(raw=RAW) -> RecipeBook:
+    return RecipeBook.compile(raw, CatalogSnapshot(CATALOG))
+
+
+def test_compile_resolves_ids_and_exact_names() -> None:
+    sandwich = _book().find("make me a sandwich")
+    assert [line.item["id"] for line in sandwich.lines] == ["bake_001", "pant_001", "pant_002"]
+
+
+def test_bundle_scales_and_rounds_up() -> None:
+    sandwich = _book().find("sandwich")
+    assert [(item["id"], qty) for item, qty in sandwich.bundle(5)] == [
+        ("bake_001", 3),
+        ("pant_001", 3),
+        ("pant_002", 2),
+    ]
+    assert [qty for _, qty in sandwich.bundle()] == [1, 1, 1]
+
+
+def test_find_prefers_the_longest_recipe_name() -> None:
+    book = _book()
+    assert book.find("a Peanut Butter Sandwich please").name == "peanut butter sandwich"
+    assert book.find("just a sandwich").name == "sandwich"
+    assert book.find("soup") is None
+
+
+def test_misspelled_ingredient_is_skipped_not_guessed(caplog) -> None:
+    raw = {"smoothie": {"ingredients": [{"item": "Organic Banana"}, {"item": "Peanut Butter"}]}}
+    with caplog.at_level(logging.WARNING, logger="recipes"):
+        smoothie = _book(raw).find("smoothie")
+
+    assert [line.item["id"] for line in smoothie.lines] == ["pant_001"]
+    assert "no catalog item named 'Organic Banana' (did you mean 'Organic Bananas'?)" in caplog.text
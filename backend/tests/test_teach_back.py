@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+from concept_library import ConceptLibrary
+from teach_back import TeachBackScorer, stem
+
+CONTENT = json.loads((Path(__file__).parent.parent / "shared-data" / "day4_tutor_content.json").read_text())
+SCORER = TeachBackScorer(ConceptLibrary.from_content(CONTENT))
+
+
+def test_complete_explanation_scores_high_with_nothing_missing() -> None:
+    result = SCORER.score(
+        "loops",
+        "Loops let you repeat an action many times until a condition is met. A for loop iterates over a "
+        "sequence, for example every item in a list, while a while loop keeps repeating while a condition is true.",
+    )
+    assert result.score >= 9 and result.missing == []
+
+
+def test_partial_and_off_topic_explanations_list_missing_points() -> None:
+    partial = SCORER.score("variables", "A variable is a named storage location that holds data like text.")
+    off_topic = SCORER.score("variables", "Loops repeat things until a condition is met.")
+
+    assert 3 <= partial.score < 9
+    assert partial.missing == [
+        "Variables store values so you can reuse and manipulate them later in a program.",
+        "Give a concrete example.",
+    ]
+    assert off_topic.score < partial.score and len(off_topic.missing) == 3
+    assert SCORER.score("variables", "").score == 0
+    assert SCORER.score("recursion", "anything") is None
+    assert partial.describe().startswith(f"Score: {partial.score}/10. Missing key points: ")
+
+
+def test_repeating_keywords_without_key_points_scores_zero() -> None:
+    stuffed = SCORER.score("loops", "loops loops loops")
+    assert stuffed.covered == [] and stuffed.similarity > 0
+    assert stuffed.score == 0
+
+
+def test_example_needs_a_real_cue_or_code() -> None:
+    def gave_example(explanation: str) -> bool:
+        return "Give a concrete example." in SCORER.score("variables", explanation).covered
+
+    assert gave_example("You name a value, e.g. a user's age.")
+    assert gave_example("A variable holds data such as a name.")
+    assert gave_example("Like count = 3, then count is reused later.")
+    assert not gave_example("I have no example, I do not know")
+    assert not gave_example("I have 2 ideas (maybe)")
+    assert not gave_example("If count == 3 nothing was assigned")
+
+
+def test_library_changes_refresh_the_idf_and_references() -> None:
+    library = ConceptLibrary.from_content(CONTENT)
+    scorer = TeachBackScorer(library)
+    assert scorer.score("recursion", "a function calling itself") is None
+    before = scorer.idf()["loop"]
+
+    library.add([{"id": "recursion", "title": "Recursion", "summary": "A function that calls itself until a base case."}])
+    assert scorer.score("recursion", "A function calls itself until it reaches a base case.").score >= 8
+    assert scorer.idf()["loop"] > before  # one more document without the term
+
+
+def test_stem_folds_common_suffixes() -> None:
+    assert [stem(w) for w in ("loops", "repeating", "classes", "libraries")] == ["loop", "repeat", "class", "library"]
+    assert stem("stored") == stem("stores") == stem("storing") == stem("store")
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+import time
+
+import tool_timing
+from tool_timing import function_tool, start_tool_report, timings
+
+
+@function_tool
+async def slow_io_tool(delay: float) -> str:
+    """Waits without blocking the loop."""
+    await asyncio.sleep(delay)
+    return "done"
+
+
+@function_tool
+async def blocking_tool(delay: float) -> dict:
+    """Blocks the loop."""
+    await asyncio.sleep(0)
+    time.sleep(delay)
+    return {"items": ["x" * 10]}
+
+
+async def test_separates_waiting_from_blocking(caplog) -> None:
+    with caplog.at_level(logging.WARNING, logger="tool-timing"):
+        assert await slow_io_tool(0.08) == "done"
+        assert await blocking_tool(0.08) == {"items": ["x" * 10]}
+
+    io, blocking = timings.tools["slow_io_tool"], timings.tools["blocking_tool"]
+    assert io.wall_max >= 0.08 and io.blocked_max < 0.02
+    assert blocking.blocked_max >= 0.08
+    assert blocking.payload_max == len('{"items": ["xxxxxxxxxx"]}')
+    assert [r.getMessage().split()[1] for r in caplog.records] == ["blocking_tool"]
+    assert {line.split(":")[0] for line in timings.report()} >= {"slow_io_tool", "blocking_tool"}
+
+
+async def test_exceptions_propagate_and_are_timed() -> None:
+    @function_tool
+    async def failing_tool() -> None:
+        raise ValueError("boom")
+
+    before = timings.tools["failing_tool"].calls if "failing_tool" in timings.tools else 0
+    try:
+        await failing_tool()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    assert timings.tools["failing_tool"].calls == before + 1
+
+
+class _Job:
+    def __init__(self):
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, callback):
+        self.shutdown_callbacks.append(callback)
+
+    async def shutdown(self):
+        for callback in self.shutdown_callbacks:
+            await callback()
+
+
+async def test_concurrent_jobs_share_one_report(caplog) -> None:
+    await blocking_tool(0)
+    first, second = _Job(), _Job()
+    with caplog.at_level(logging.INFO, logger="tool-timing"):
+        start_tool_report(first, interval=0.1)
+        start_tool_report(second, interval=0.1)
+        await asyncio.sleep(0.15)
+        assert len([r for r in caplog.records if r.getMessage().startswith("Slowest tools")]) == 1
+
+        await first.shutdown()  # the other job is still running
+        assert tool_timing._report_task is not None and not tool_timing._report_task.done()
+        await second.shutdown()
+
+    assert tool_timing._report_task is None
+    assert len([r for r in caplog.records if r.getMessage().startswith("Slowest tools")]) == 2
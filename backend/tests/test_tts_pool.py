@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from livekit.agents import tts
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+
+from tts_pool import PooledTTS
+
+
+class FakeTTS(tts.TTS):
+    """Offline TTS; the first synthesis of an instance that was not prewarmed pays `warmup`."""
+
+    def __init__(self, voice: str, warmup: float = 0.2, sample_rate: int = 24000):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=sample_rate, num_channels=1)
+        self.voice = voice
+        self.warmup = warmup
+        self.warm = False
+
+    def prewarm(self):
+        self.warm = True
+
+    def synthesize(self, text, *, conn_options=DEFAULT_API_CONNECT_OPTIONS):
+        return FakeStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class FakeStream(tts.ChunkedStream):
+    async def _run(self, output_emitter):
+        if not self._tts.warm:
+            await asyncio.sleep(self._tts.warmup)
+            self._tts.warm = True
+        output_emitter.initialize(request_id=self._tts.voice, sample_rate=24000, num_channels=1, mime_type="audio/pcm")
+        output_emitter.push(b"\0\0" * 2400)
+        output_emitter.flush()
+
+
+async def test_switch_is_a_pointer_swap_to_a_warm_voice() -> None:
+    pool = PooledTTS({mode: FakeTTS(mode) for mode in ("learn", "quiz", "teach_back")}, active="learn")
+    pool.prewarm()
+    collected = []
+    pool.on("metrics_collected", collected.append)
+
+    pool.select("quiz")
+    async with pool.synthesize("Quiz time!") as stream:
+        first = await stream.__anext__()
+        assert first.request_id == "quiz"
+        async for _ in stream:
+            pass
+    await asyncio.sleep(0)
+
+    assert pool.active == "quiz" and pool.current is pool.voices["quiz"]
+    assert len(collected) == 1 and collected[0].ttfb < 0.1
+    await pool.aclose()
+
+
+class ClosingTTS(FakeTTS):
+    """Records its close; `fail` makes it raise after doing so."""
+
+    def __init__(self, voice: str, closed: list, fail: bool = False):
+        super().__init__(voice)
+        self.closed, self.fail = closed, fail
+
+    async def aclose(self) -> None:
+        self.closed.append(self.voice)
+        if self.fail:
+            raise RuntimeError("socket already gone")
+
+
+async def test_aclose_closes_every_voice_when_one_fails() -> None:
+    closed = []
+    voices = {mode: ClosingTTS(mode, closed, fail=mode == "learn") for mode in ("learn", "quiz", "teach_back")}
+    pool = PooledTTS(voices, active="learn")
+
+    with pytest.raises(RuntimeError, match="socket already gone"):
+        await pool.aclose()
+    assert closed == ["learn", "quiz", "teach_back"]
+
+
+def test_rejects_unknown_or_mismatched_voices() -> None:
+    pool = PooledTTS({"learn": FakeTTS("learn")}, active="learn")
+    with pytest.raises(ValueError):
+        pool.select("quiz")
+    with pytest.raises(ValueError):
+        PooledTTS({"learn": FakeTTS("learn"), "quiz": FakeTTS("quiz", sample_rate=16000)}, active="learn")
@@ -0,0 +1,11 @@
+import json
+from types import SimpleNamespace
+
+from user_identity import DEFAULT_USER_ID, user_id
+
+
+def test_prefers_the_attribute_then_metadata_then_the_shared_default() -> None:
+    assert user_id(SimpleNamespace(attributes={"user_id": "browser-1"}, metadata=json.dumps({"user_id": "m"}))) == "browser-1"
+    assert user_id(SimpleNamespace(attributes={}, metadata=json.dumps({"user_id": "browser-2"}))) == "browser-2"
+    assert user_id(SimpleNamespace(attributes={"user_id": "  "}, metadata="not json")) == DEFAULT_USER_ID
+    assert user_id(SimpleNamespace(attributes={}, metadata="")) == DEFAULT_USER_ID
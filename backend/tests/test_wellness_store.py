@@ -0,0 +1,94 @@
+import json
+import sqlite3
+import threading
+from datetime import date
+
+import pytest
+
+import wellness_store
+from user_identity import DEFAULT_USER_ID
+from wellness_store import ENERGY_SCORES, MOOD_SCORES, WellnessStore, score, shard_path
+
+
+def _checkin(day: str, mood: str, energy: str) -> dict:
+    return {"timestamp": f"{day}T09:00:00", "mood": mood, "energy": energy, "objectives": ["walk"], "summary": "rest"}
+
+
+def test_imports_legacy_log_once_and_keeps_rollup_current(tmp_path) -> None:
+    legacy = tmp_path / "wellness_log.json"
+    legacy.write_text(json.dumps([_checkin("2025-11-01", "low", "drained"), _checkin("2025-11-02", "okay", "low")]))
+    path = str(tmp_path / "wellness.db")
+
+    store = WellnessStore(path, legacy_path=str(legacy))
+    store.append(_checkin("2025-11-03", "really happy", "high"))
+    store.close()
+    store = WellnessStore(path, legacy_path=str(legacy))  # reopening does not import again
+
+    latest, _ = store.session_context()
+    assert latest["mood"] == "really happy" and latest["objectives"] == ["walk"]
+
+    trend = store.trend(days=2, today=date(2025, 11, 3))
+    assert trend.checkins == 2
+    assert trend.mood_avg == 1.0 and trend.energy_avg == 0.5
+    assert trend.mood_change == 2.0
+    assert "mood improving" in trend.describe()
+
+    assert store.trend(days=7, today=date(2025, 11, 3)).checkins == 3
+    assert store.trend(days=7, today=date(2026, 1, 1)).describe() == "No check-ins in the last 7 days."
+
+
+def test_score_ignores_unknown_words() -> None:
+    assert score("stressed but calm", MOOD_SCORES) == 0.0
+    assert score("purple", ENERGY_SCORES) is None
+    assert score(None, MOOD_SCORES) is None
+
+
+def test_history_is_partitioned_by_user(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(wellness_store, "WELLNESS_DIR", str(tmp_path))
+    monkeypatch.setattr(wellness_store, "_stores", {})
+    users = ["alice", "bob", "user/with spaces"]
+
+    def check_in(user: str):
+        store = wellness_store.wellness_store(user)
+        for day in range(1, 21):
+            store.append(_checkin(f"2025-11-{day:02d}", user, "high"))
+
+    threads = [threading.Thread(target=check_in, args=(u,)) for u in users]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for user in users:
+        store = wellness_store.wellness_store(user)
+        assert store.path == shard_path(user, str(tmp_path))
+        assert store.latest()["mood"] == user
+        assert store.trend(days=30, today=date(2025, 11, 20)).checkins == 20
+    assert len({shard_path(u, str(tmp_path)) for u in users}) == 3
+    assert shard_path("a/b") != shard_path("a_b")
+
+
+def test_idle_stores_are_closed_and_reopened(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(wellness_store, "WELLNESS_DIR", str(tmp_path))
+    monkeypatch.setattr(wellness_store, "_stores", {})
+    monkeypatch.setattr(wellness_store, "IDLE_SECONDS", 0)
+
+    alice = wellness_store.wellness_store("alice")
+    alice.append(_checkin("2025-11-01", "good", "high"))
+    wellness_store.wellness_store("bob")
+
+    assert set(wellness_store._stores) == {"bob"}
+    with pytest.raises(sqlite3.ProgrammingError):
+        alice.latest()
+    assert wellness_store.wellness_store("alice").latest()["mood"] == "good"
+
+
+def test_legacy_log_goes_to_the_shared_default_user(tmp_path, monkeypatch) -> None:
+    legacy = tmp_path / "wellness_log.json"
+    legacy.write_text(json.dumps([_checkin("2025-11-01", "low", "drained")]))
+    monkeypatch.setattr(wellness_store, "WELLNESS_DIR", str(tmp_path))
+    monkeypatch.setattr(wellness_store, "LEGACY_LOG_PATH", str(legacy))
+    monkeypatch.setattr(wellness_store, "_stores", {})
+
+    assert wellness_store.wellness_store("browser-1").latest() is None
+    assert wellness_store.wellness_store(DEFAULT_USER_ID).latest()["mood"] == "low"
@@ -1,3 +1,4 @@
+import { cookies } from 'next/headers';
 import { NextResponse } from 'next/server';
 import { AccessToken, type AccessTokenOptions, type VideoGrant } from 'livekit-server-sdk';
 import { RoomConfiguration } from '@livekit/protocol';
@@ -14,6 +15,11 @@ const API_KEY = process.env.LIVEKIT_API_KEY;
 const API_SECRET = process.env.LIVEKIT_API_SECRET;
 const LIVEKIT_URL = process.env.LIVEKIT_URL;
 
+// Identities are minted per connection, so agents key returning users on this
+// browser-scoped id instead. It reaches them as the `user_id` participant attribute.
+const USER_ID_COOKIE = 'voice_assistant_user_id';
+const USER_ID_MAX_AGE = 60 * 60 * 24 * 365;
+
 // don't cache the results
 export const revalidate = 0;
 
@@ -37,9 +43,11 @@ export async function POST(req: Request) {
     const participantName = 'user';
     const participantIdentity = `voice_assistant_user_${Math.floor(Math.random() * 10_000)}`;
     const roomName = `voice_assistant_room_${Math.floor(Math.random() * 10_000)}`;
+    const cookieStore = await cookies();
+    const userId = cookieStore.get(USER_ID_COOKIE)?.value ?? crypto.randomUUID();
 
     const participantToken = await createParticipantToken(
-      { identity: participantIdentity, name: participantName },
+      { identity: participantIdentity, name: participantName, attributes: { user_id: userId } },
       roomName,
       agentName
     );
@@ -54,7 +62,14 @@ export async function POST(req: Request) {
     const headers = new Headers({
       'Cache-Control': 'no-store',
     });
-    return NextResponse.json(data, { headers });
+    const response = NextResponse.json(data, { headers });
+    response.cookies.set(USER_ID_COOKIE, userId, {
+      httpOnly: true,
+      sameSite: 'lax',
+      maxAge: USER_ID_MAX_AGE,
+      path: '/',
+    });
+    return response;
   } catch (error) {
     if (error instanceof Error) {
       console.error(error);